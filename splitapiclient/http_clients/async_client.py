@@ -0,0 +1,83 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import asyncio
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from splitapiclient.http_clients import base_client
+from splitapiclient.http_clients.session import DEFAULT_POOL_MAXSIZE
+
+
+class AsyncHttpClient(base_client.BaseHttpClient):
+    '''
+    Asynchronous API client.
+    Wraps a blocking http client (SyncHttpClient or HarnessHttpClient) and
+    exposes `make_request` as a coroutine. Blocking calls are dispatched to a
+    bounded thread pool so that the event loop is never blocked and many
+    requests can be in flight at the same time over the pooled session.
+    '''
+
+    def __init__(self, http_client, max_workers=DEFAULT_POOL_MAXSIZE, executor=None):
+        '''
+        Class constructor.
+
+        :param http_client: BaseHttpClient. Blocking http client used to
+            perform the actual calls.
+        :param max_workers: int. Maximum number of concurrent requests
+            (optional, defaults to the default session pool size, so
+            threads don't outnumber the pooled connections).
+        :param executor: concurrent.futures.Executor. Executor to share with
+            other async clients (optional, a new one is created if omitted).
+        '''
+        self._http_client = http_client
+        self.config = http_client.config
+        self._owns_executor = executor is None
+        self._executor = executor if executor is not None else \
+            ThreadPoolExecutor(max_workers=max_workers)
+
+    @property
+    def http_client(self):
+        return self._http_client
+
+    @property
+    def executor(self):
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        '''
+        Runs a blocking callable on the executor and awaits its result.
+        The callable runs in a copy of the current context, so
+        `request_options` blocks wrapping the await apply to it.
+
+        :param func: callable. Blocking function to run.
+
+        :rtype: object
+        '''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, copy_context().run, partial(func, *args, **kwargs)
+        )
+
+    async def make_request(self, endpoint, body=None, **kwargs):
+        '''
+        Awaitable version of the wrapped client's `make_request`.
+
+        :param endpoint: dict. Endpoint description (url, headers, qs, etc).
+        :param body: list/dict. Body used for POST/PATCH/PUT requests
+        :param kwargs: dict. Extra arguments (values).
+
+        :rtype: dict/list/None
+        '''
+        return await self.run(
+            self._http_client.make_request, endpoint, body, **kwargs
+        )
+
+    def close(self):
+        '''
+        Shuts down the executor (if owned by this client) and closes the
+        wrapped client's pooled connections.
+        '''
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        if hasattr(self._http_client, 'close'):
+            self._http_client.close()
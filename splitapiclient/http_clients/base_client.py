@@ -1,8 +1,8 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
 import abc
-import re
 import six
+from splitapiclient.util.endpoints import compile_template
 from splitapiclient.util.exceptions import MissingParametersException
 
 
@@ -52,9 +52,7 @@ class BaseHttpClient(six.with_metaclass(abc.ABCMeta)):
 
         :rtype: list.
         '''
-        regex = r'{([\w-]+)}*'
-        url_params = re.findall(regex, url)
-        return list(set(url_params)) if url_params else []
+        return list(compile_template(url).params)
 
     @staticmethod
     def _process_single_header(header, value):
@@ -115,23 +113,11 @@ class BaseHttpClient(six.with_metaclass(abc.ABCMeta)):
 
         :rtype: string.
         '''
-        base_template = '{base}/{endpoint}'.format(
+        return '{base}/{endpoint}'.format(
             base=self.config['base_url'],
-            endpoint=endpoint['url_template']
+            endpoint=compile_template(endpoint['url_template']).render(params)
         )
 
-        params_for_url = BaseHttpClient.get_params_from_url_template(
-            base_template
-        )
-
-        parameter_values = {
-            param: params[param]
-            for param in params
-            if param in params_for_url
-        }
-
-        return base_template.format(**parameter_values)
-
     @staticmethod
     def validate_params(endpoint, all_arguments):
         '''
@@ -0,0 +1,394 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from splitapiclient.util.logger import LOGGER
+from splitapiclient.util.deadline import current_options
+
+
+# Headers that tell how long to wait before retrying, in order of preference.
+# Split reports the remaining seconds of the exhausted window per org and IP,
+# Harness and most proxies use the standard Retry-After header.
+RETRY_AFTER_HEADERS = [
+    'Retry-After',
+    'X-RateLimit-Reset-Seconds-Org',
+    'X-RateLimit-Reset-Seconds-IP',
+]
+
+
+# Verbs that can safely be sent again after a transient failure. POST is
+# only added when explicitly enabled through `retry_post`.
+IDEMPOTENT_METHODS = ('GET', 'PUT', 'DELETE')
+
+# Statuses returned by gateways and overloaded backends that usually succeed
+# when the request is sent again.
+TRANSIENT_STATUSES = (500, 502, 503, 504)
+
+# requests exceptions considered transient (connection resets, refused
+# connections and timeouts).
+TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class RetryStats:
+    '''
+    Thread safe counters describing the calls made with a retry policy,
+    meant to be polled for monitoring.
+    '''
+
+    def __init__(self):
+        '''
+        Class constructor.
+        '''
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        '''
+        Sets every counter back to zero.
+        '''
+        with self._lock:
+            self._calls = 0
+            self._requests = 0
+            self._retries = 0
+            self._exhausted = 0
+            self._retries_by_reason = {}
+            self._total_latency = 0.0
+            self._max_latency = 0.0
+
+    def record_retry(self, reason):
+        '''
+        Records a retry caused by `reason` (status code or exception name).
+        '''
+        reason = str(reason)
+        with self._lock:
+            self._retries += 1
+            self._retries_by_reason[reason] = self._retries_by_reason.get(reason, 0) + 1
+
+    def record_exhausted(self):
+        '''
+        Records a call that still failed when the policy stopped retrying.
+        '''
+        with self._lock:
+            self._exhausted += 1
+
+    def record_call(self, latency, attempts):
+        '''
+        Records a finished call.
+
+        :param latency: float. Seconds spent on the call, retries included.
+        :param attempts: int. Number of requests sent for the call.
+        '''
+        with self._lock:
+            self._calls += 1
+            self._requests += attempts
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+    def snapshot(self):
+        '''
+        Returns a consistent copy of the counters.
+
+        :rtype: dict
+        '''
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'requests': self._requests,
+                'retries': self._retries,
+                'exhausted': self._exhausted,
+                'retries_by_reason': dict(self._retries_by_reason),
+                'total_latency': self._total_latency,
+                'avg_latency': self._total_latency / self._calls if self._calls else 0.0,
+                'max_latency': self._max_latency,
+            }
+
+
+class TokenBucket:
+    '''
+    Thread safe token bucket used to pace requests on the client side, so
+    that parallel workers stay below the organization rate limit instead of
+    discovering it through 429 responses.
+    '''
+
+    def __init__(self, rate, capacity=None):
+        '''
+        Class constructor.
+
+        :param rate: float. Tokens (requests) added per second.
+        :param capacity: float. Maximum burst size (defaults to `rate`).
+        '''
+        self._rate = float(rate)
+        self._capacity = float(capacity) if capacity else max(self._rate, 1.0)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._last) * self._rate
+        )
+        self._last = now
+
+    def acquire(self):
+        '''
+        Takes one token, blocking until one is available.
+
+        :returns: seconds spent waiting
+        :rtype: float
+        '''
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+            waited += wait
+
+
+class RetryPolicy:
+    '''
+    Describes how the http clients react to rate limiting and transient
+    failures.
+    Responses whose status is in `retry_statuses` (429 by default) are always
+    retried, since the server did not process them. Transient 5xx statuses,
+    connection errors and timeouts are only retried for idempotent verbs
+    (GET, PUT, DELETE), and for POST when `retry_post` is set.
+    Retries wait the delay advertised by the server (Retry-After or Split
+    rate limit headers) or, when none is given, an exponential backoff with
+    full jitter. Retrying stops once `max_attempts` requests were made or
+    when waiting would go beyond `deadline` seconds since the first one.
+    An optional token bucket paces every request sent with this policy, and
+    `stats` keeps retry counts and call latencies.
+    '''
+
+    def __init__(self, max_attempts=10, backoff_factor=1.0, max_backoff=60.0,
+                 jitter=True, deadline=None, retry_statuses=(429,),
+                 requests_per_second=None, burst=None,
+                 transient_statuses=TRANSIENT_STATUSES,
+                 retry_connection_errors=True, retry_post=False):
+        '''
+        Class constructor.
+
+        :param max_attempts: int. Maximum number of requests for a single
+            call, including the first one. None means no limit.
+        :param backoff_factor: float. Base delay in seconds; the n-th retry
+            waits up to backoff_factor * 2 ** (n - 1) seconds.
+        :param max_backoff: float. Upper bound for any single delay.
+        :param jitter: bool. Randomize backoff delays (full jitter) so that
+            parallel workers don't retry in lockstep.
+        :param deadline: float. Maximum seconds to keep retrying a call.
+        :param retry_statuses: iterable. HTTP status codes to retry.
+        :param requests_per_second: float. Client side rate limit shared by
+            all requests using this policy (optional).
+        :param burst: float. Token bucket capacity (defaults to the rate).
+        :param transient_statuses: iterable. 5xx statuses retried for
+            idempotent verbs. Pass an empty tuple to disable.
+        :param retry_connection_errors: bool. Retry connection errors and
+            timeouts for idempotent verbs.
+        :param retry_post: bool. Also retry POST requests on transient
+            failures. Only enable it for endpoints known to be idempotent.
+        '''
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self._bucket = TokenBucket(requests_per_second, burst) \
+            if requests_per_second else None
+        self.transient_statuses = frozenset(transient_statuses)
+        self.retry_connection_errors = retry_connection_errors
+        self.retry_post = retry_post
+        self._stats = RetryStats()
+
+    @classmethod
+    def from_config(cls, config):
+        '''
+        Builds the policy passed in the `get_client` config, either as a
+        RetryPolicy instance or a dict of constructor arguments.
+
+        :param config: dict. Client configuration.
+
+        :rtype: RetryPolicy
+        '''
+        policy = config.get('retry_policy')
+        if isinstance(policy, cls):
+            return policy
+        return cls(**(policy or {}))
+
+    @property
+    def token_bucket(self):
+        return self._bucket
+
+    @property
+    def stats(self):
+        return self._stats
+
+    def is_idempotent(self, method):
+        '''
+        Whether requests with the given verb may be sent again after a
+        transient failure.
+
+        :param method: string. HTTP verb.
+
+        :rtype: bool
+        '''
+        method = method.upper()
+        return method in IDEMPOTENT_METHODS or (self.retry_post and method == 'POST')
+
+    def acquire(self):
+        '''
+        Waits for the token bucket (if any) before sending a request.
+
+        :returns: seconds spent waiting
+        :rtype: float
+        '''
+        return self._bucket.acquire() if self._bucket else 0.0
+
+    @staticmethod
+    def _server_delay(response):
+        '''
+        Returns the delay requested by the server through headers, if any.
+        '''
+        headers = getattr(response, 'headers', None) or {}
+        for name in RETRY_AFTER_HEADERS:
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                return max(0.0, float(value))
+            except (TypeError, ValueError):
+                pass
+            try:
+                retry_at = parsedate_to_datetime(value)
+                return max(0.0, retry_at.timestamp() - time.time())
+            except (TypeError, ValueError, IndexError):
+                pass
+        return None
+
+    def backoff(self, attempt):
+        '''
+        Exponential backoff delay before retry number `attempt` (1 based).
+
+        :rtype: float
+        '''
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def should_retry(self, response, method='GET'):
+        '''
+        Whether the response status is one this policy retries for the
+        given verb.
+
+        :param response: Response object.
+        :param method: string. HTTP verb of the request.
+
+        :rtype: bool
+        '''
+        if response.status_code in self.retry_statuses:
+            return True
+        return response.status_code in self.transient_statuses and \
+            self.is_idempotent(method)
+
+    def should_retry_error(self, error, method='GET'):
+        '''
+        Whether the exception raised while sending a request is a transient
+        one this policy retries for the given verb.
+
+        :param error: Exception raised by requests.
+        :param method: string. HTTP verb of the request.
+
+        :rtype: bool
+        '''
+        return self.retry_connection_errors and \
+            isinstance(error, TRANSIENT_ERRORS) and self.is_idempotent(method)
+
+    def next_delay(self, attempt, response, started, deadline=None):
+        '''
+        Returns how long to wait before retrying a call, or None when the
+        call should not be retried anymore.
+
+        :param attempt: int. Number of requests already made for this call.
+        :param response: Response object of the last request (None when it
+            failed with a connection error).
+        :param started: float. time.monotonic() of the first request.
+        :param deadline: Deadline. Operation deadline the retry must not
+            go beyond (optional).
+
+        :rtype: float/None
+        '''
+        if self.max_attempts is not None and attempt >= self.max_attempts:
+            return None
+        delay = self._server_delay(response)
+        if delay is None:
+            delay = self.backoff(attempt)
+        if self.deadline is not None and \
+                time.monotonic() - started + delay > self.deadline:
+            return None
+        if deadline is not None and delay >= deadline.remaining():
+            return None
+        return delay
+
+    def execute(self, send, method='GET', deadline=None):
+        '''
+        Sends a request, retrying it according to this policy. The last
+        response is returned even if its status is still an error one, and
+        the last exception is re-raised when a connection error can't be
+        retried anymore.
+
+        :param send: callable. Sends the request and returns the response.
+        :param method: string. HTTP verb of the request.
+        :param deadline: Deadline. Operation deadline (optional).
+
+        :rtype: Response
+        '''
+        started = time.monotonic()
+        attempt = 0
+        options = current_options()
+        priority = options is not None and options.priority
+        try:
+            while True:
+                if not priority:
+                    self.acquire()
+                attempt += 1
+                try:
+                    response = send()
+                except Exception as e:
+                    if not self.should_retry_error(e, method):
+                        raise
+                    delay = self.next_delay(attempt, None, started, deadline)
+                    if delay is None:
+                        self._stats.record_exhausted()
+                        raise
+                    reason = type(e).__name__
+                else:
+                    if not self.should_retry(response, method):
+                        return response
+                    delay = self.next_delay(attempt, response, started, deadline)
+                    if delay is None:
+                        self._stats.record_exhausted()
+                        return response
+                    reason = response.status_code
+                self._stats.record_retry(reason)
+                LOGGER.warning(
+                    '%s %s on attempt %d, retrying in %.2f seconds'
+                    % (method, reason, attempt, delay)
+                )
+                time.sleep(delay)
+        finally:
+            self._stats.record_call(time.monotonic() - started, attempt)
@@ -0,0 +1,76 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+DEFAULT_TIMEOUT = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                   keep_alive=True):
+    '''
+    Builds a requests Session backed by a connection pool, so that every
+    http client (and therefore every microclient) sharing it reuses open
+    TCP/TLS connections instead of performing a new handshake per call.
+
+    :param pool_connections: int. Number of per-host pools to cache.
+    :param pool_maxsize: int. Maximum number of connections kept per host.
+    :param pool_block: bool. Whether to block when no free connection is
+        available instead of opening a throwaway one.
+    :param keep_alive: bool. When False, connections are closed after each
+        request.
+
+    :rtype: requests.Session
+    '''
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def session_from_config(config):
+    '''
+    Builds a pooled session from the options passed to `get_client`.
+
+    :param config: dict. Client configuration. Recognized keys are
+        'pool_connections', 'pool_maxsize', 'pool_block' and 'keep_alive'.
+
+    :rtype: requests.Session
+    '''
+    return create_session(
+        pool_connections=config.get('pool_connections', DEFAULT_POOL_CONNECTIONS),
+        pool_maxsize=config.get('pool_maxsize', DEFAULT_POOL_MAXSIZE),
+        pool_block=config.get('pool_block', False),
+        keep_alive=config.get('keep_alive', True)
+    )
+
+
+def timeout_from_config(config):
+    '''
+    Returns the requests timeout set in the options passed to `get_client`.
+    'timeout' (a number or a (connect, read) tuple) takes precedence over
+    'connect_timeout' and 'read_timeout'.
+
+    :param config: dict. Client configuration.
+
+    :rtype: float/tuple
+    '''
+    if config.get('timeout') is not None:
+        return config['timeout']
+    return (
+        config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT),
+        config.get('read_timeout', DEFAULT_READ_TIMEOUT)
+    )
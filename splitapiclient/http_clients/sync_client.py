@@ -1,25 +1,67 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
 import json
-import time
 from functools import partial
-import requests
+from requests.exceptions import Timeout
 from splitapiclient.http_clients import base_client
+from splitapiclient.http_clients.session import create_session, DEFAULT_TIMEOUT
+from splitapiclient.http_clients.retry_policy import RetryPolicy
 from splitapiclient.util.logger import LOGGER
+from splitapiclient.util.deadline import resolve_request_options
 from splitapiclient.util.exceptions import HTTPResponseError, \
     HTTPNotFoundError, HTTPIncorrectParametersError, HTTPUnauthorizedError, \
-    SplitBackendUnreachableError
+    HTTPTooManyRequestsError, SplitBackendUnreachableError, OperationTimeoutError
 
 
 class SyncHttpClient(base_client.BaseHttpClient):
     '''
     Synchronous API client.
     This client will block on every http request until a response is received.
+    Connections are pooled and kept alive through a requests Session.
     '''
 
+    def __init__(self, baseurl, auth_token, session=None, retry_policy=None,
+                 timeout=None):
+        '''
+        Class constructor. Stores basic connection information.
+
+        :param baseurl: string. Split host and base url.
+        :param auth_token: string. Authentication token needed to make API
+            calls.
+        :param session: requests.Session. Pooled session to share with other
+            http clients (optional, a new one is created if omitted).
+        :param retry_policy: RetryPolicy. Rate limit handling (optional,
+            defaults to RetryPolicy()).
+        :param timeout: float/tuple. Connect and read timeout of every request,
+            either a single number or a (connect, read) tuple (optional,
+            defaults to DEFAULT_TIMEOUT).
+        '''
+        base_client.BaseHttpClient.__init__(self, baseurl, auth_token)
+        self._session = session if session is not None else create_session()
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+
+    @property
+    def session(self):
+        return self._session
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    def close(self):
+        '''
+        Closes all pooled connections held by this client's session.
+        '''
+        self._session.close()
+
     def setup_method(self, method, body=None):
         '''
-        Wraps 'requests' module functions by partially applying the body
+        Wraps the pooled session's methods by partially applying the body
         parameter when needed to provide a standarized interface.
 
         :param method: string. GET | POST | PATCH | PUT | DELETE
@@ -28,11 +70,11 @@ class SyncHttpClient(base_client.BaseHttpClient):
         :rtype: function
         '''
         methods = {
-            'GET': requests.get,
-            'POST': partial(requests.post, json=body),
-            'PUT': partial(requests.put, json=body),
-            'PATCH': partial(requests.patch, json=body),
-            'DELETE': requests.delete
+            'GET': self._session.get,
+            'POST': partial(self._session.post, json=body),
+            'PUT': partial(self._session.put, json=body),
+            'PATCH': partial(self._session.patch, json=body),
+            'DELETE': self._session.delete
         }
 
         return methods[method]
@@ -49,6 +91,7 @@ class SyncHttpClient(base_client.BaseHttpClient):
             404: HTTPNotFoundError,
             401: HTTPUnauthorizedError,
             400: HTTPIncorrectParametersError,
+            429: HTTPTooManyRequestsError,
         }
         # Format error message with status code
         error_message = f"HTTP {response.status_code}: {response.text}"
@@ -66,6 +109,10 @@ class SyncHttpClient(base_client.BaseHttpClient):
         by using the top level SplitException
         '''
         LOGGER.debug(e)
+        if isinstance(e, Timeout):
+            raise OperationTimeoutError(
+                'Request to Split backend timed out'
+            )
         raise SplitBackendUnreachableError(
             'Unable to reach Split backend'
         )
@@ -96,20 +143,23 @@ class SyncHttpClient(base_client.BaseHttpClient):
         if body:
             LOGGER.debug('BODY: ' + json.dumps(body))
 
+        timeout, deadline = resolve_request_options(self._timeout)
+
+        def send():
+            if deadline is None:
+                return method(url, headers=headers, timeout=timeout)
+            deadline.check()
+            return method(url, headers=headers, timeout=deadline.cap(timeout))
+
         # Make the actual HTTP call!
-        while True:
-            try:
-                response = method(url, headers=headers)
-                LOGGER.debug('RESPONSE: ' + response.text)
-            except Exception as e:
-                return self._handle_connection_error(e)
-            if response.status_code==429:
-                LOGGER.warning('RESPONSE CODE: %s, retrying in 5 seconds' % response.status_code)
-                time.sleep(5)
-                continue
-            else:
-                break
-            
+        try:
+            response = self._retry_policy.execute(send, method_name, deadline)
+            LOGGER.debug('RESPONSE: ' + response.text)
+        except OperationTimeoutError:
+            raise
+        except Exception as e:
+            return self._handle_connection_error(e)
+
         if not (response.status_code == 200 or response.status_code == 204 or response.status_code == 201):
             LOGGER.warning('RESPONSE CODE: %s' % response.status_code)
             self._handle_invalid_response(response)
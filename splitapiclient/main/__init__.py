@@ -1,5 +1,6 @@
 from splitapiclient.main.sync_apiclient import SyncApiClient
 from splitapiclient.main.harness_apiclient import HarnessApiClient
+from splitapiclient.main.async_apiclient import AsyncApiClient
 
 
 def get_client(config):
@@ -11,17 +12,33 @@ def get_client(config):
             - 'apikey': Split API key for authentication
             - 'base_url': (optional) Base URL for the Split API
             - 'base_url_v3': (optional) Base URL for the Split API v3
-            - 'async': (optional) Whether to use async client (not yet implemented)
+            - 'async': (optional) Return an AsyncApiClient whose microclient
+              methods are coroutines (also honors 'harness_mode')
+            - 'max_workers': (optional) Max concurrent requests of the async client
+            - 'pool_connections': (optional) Number of per-host connection pools
+            - 'pool_maxsize': (optional) Max connections kept alive per host
+            - 'pool_block': (optional) Block when the connection pool is exhausted
+            - 'keep_alive': (optional) Set to False to disable connection reuse
+            - 'retry_policy': (optional) RetryPolicy instance or dict of its
+              arguments (429/5xx/connection error backoff, attempt/deadline caps,
+              token bucket, POST opt-in)
+            - 'timeout': (optional) Connect and read timeout, a number or a
+              (connect, read) tuple
+            - 'connect_timeout' / 'read_timeout': (optional) Defaults to 10 / 60
+              seconds
+            - 'lookup_cache': (optional) True or dict with 'ttl'/'maxsize' to cache
+              workspace, environment and traffic type find() lookups
         
         For harness mode:
             - 'harness_mode': Set to True to use harness mode
             - 'harness_token': Harness authentication token for x-api-key header
             - 'account_identifier': (optional) Account identifier for Harness operations
             - 'base_url': (optional) Base URL for the Harness API
+            - Connection pool and retry policy options are the same as in standard mode
     '''
     _async = config.get('async', False)
     if _async:
-        raise Exception('Async client not yet implemented')
+        return AsyncApiClient(config)
     
     # Check if harness mode is enabled
     if config.get('harness_mode', False):
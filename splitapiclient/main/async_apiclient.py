@@ -0,0 +1,201 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+from concurrent.futures import ThreadPoolExecutor
+from splitapiclient.main.apiclient import BaseApiClient
+from splitapiclient.main.sync_apiclient import SyncApiClient
+from splitapiclient.main.harness_apiclient import HarnessApiClient
+from splitapiclient.http_clients.async_client import AsyncHttpClient
+from splitapiclient.http_clients.session import DEFAULT_POOL_MAXSIZE
+from splitapiclient.microclients.async_microclient import AsyncMicroClient
+
+
+class AsyncApiClient(BaseApiClient):
+    '''
+    Asynchronous Split API client.
+    Mirrors SyncApiClient (or HarnessApiClient when 'harness_mode' is set),
+    but every microclient method is a coroutine. Calls are executed on a
+    bounded executor sharing the client's connection pool, so hundreds of
+    operations can be awaited concurrently with asyncio.gather.
+
+    Resources returned by the awaitable methods keep a reference to the
+    blocking http client, so their own helper methods remain synchronous.
+    '''
+
+    def __init__(self, config):
+        '''
+        Class constructor.
+
+        :param config: Dictionary containing the same options accepted by
+            SyncApiClient or HarnessApiClient ('harness_mode' selects which
+            one is used). Optional keys:
+                - 'max_workers': Maximum number of requests in flight
+                  (defaults to 'pool_maxsize')
+        '''
+        if config.get('harness_mode', False):
+            self._client = HarnessApiClient(config)
+        else:
+            self._client = SyncApiClient(config)
+
+        max_workers = config.get(
+            'max_workers', config.get('pool_maxsize', DEFAULT_POOL_MAXSIZE)
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._async_http_clients = {}
+        self._microclients = {}
+
+    def _async_http_client(self, http_client):
+        '''
+        Returns the AsyncHttpClient wrapping the given blocking client, all of
+        them sharing this client's executor.
+        '''
+        key = id(http_client)
+        if key not in self._async_http_clients:
+            self._async_http_clients[key] = AsyncHttpClient(
+                http_client, executor=self._executor
+            )
+        return self._async_http_clients[key]
+
+    def _wrap(self, name):
+        '''
+        Returns the awaitable facade of the blocking microclient exposed
+        by the wrapped api client under `name`.
+        '''
+        if name not in self._microclients:
+            microclient = getattr(self._client, name)
+            self._microclients[name] = AsyncMicroClient(
+                microclient,
+                self._async_http_client(microclient._http_client)
+            )
+        return self._microclients[name]
+
+    @property
+    def sync_client(self):
+        return self._client
+
+    def close(self):
+        '''
+        Waits for pending calls, shuts down the executor and closes all
+        pooled connections.
+        '''
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def traffic_types(self):
+        return self._wrap('traffic_types')
+
+    @property
+    def environments(self):
+        return self._wrap('environments')
+
+    @property
+    def splits(self):
+        return self._wrap('splits')
+
+    @property
+    def split_definitions(self):
+        return self._wrap('split_definitions')
+
+    @property
+    def segments(self):
+        return self._wrap('segments')
+
+    @property
+    def segment_definitions(self):
+        return self._wrap('segment_definitions')
+
+    @property
+    def rule_based_segments(self):
+        return self._wrap('rule_based_segments')
+
+    @property
+    def rule_based_segment_definitions(self):
+        return self._wrap('rule_based_segment_definitions')
+
+    @property
+    def large_segments(self):
+        return self._wrap('large_segments')
+
+    @property
+    def large_segment_definitions(self):
+        return self._wrap('large_segment_definitions')
+
+    @property
+    def workspaces(self):
+        return self._wrap('workspaces')
+
+    @property
+    def attributes(self):
+        return self._wrap('attributes')
+
+    @property
+    def identities(self):
+        return self._wrap('identities')
+
+    @property
+    def change_requests(self):
+        return self._wrap('change_requests')
+
+    @property
+    def users(self):
+        return self._wrap('users')
+
+    @property
+    def groups(self):
+        return self._wrap('groups')
+
+    @property
+    def apikeys(self):
+        return self._wrap('apikeys')
+
+    @property
+    def restrictions(self):
+        return self._wrap('restrictions')
+
+    @property
+    def flag_sets(self):
+        return self._wrap('flag_sets')
+
+    # Harness-specific properties (only available in harness mode)
+
+    @property
+    def token(self):
+        return self._wrap('token')
+
+    @property
+    def harness_apikey(self):
+        return self._wrap('harness_apikey')
+
+    @property
+    def service_account(self):
+        return self._wrap('service_account')
+
+    @property
+    def harness_user(self):
+        return self._wrap('harness_user')
+
+    @property
+    def harness_group(self):
+        return self._wrap('harness_group')
+
+    @property
+    def role(self):
+        return self._wrap('role')
+
+    @property
+    def resource_group(self):
+        return self._wrap('resource_group')
+
+    @property
+    def role_assignment(self):
+        return self._wrap('role_assignment')
+
+    @property
+    def harness_project(self):
+        return self._wrap('harness_project')
@@ -3,6 +3,12 @@ from __future__ import absolute_import, division, print_function, \
 import warnings
 from splitapiclient.main.apiclient import BaseApiClient
 from splitapiclient.http_clients.harness_client import HarnessHttpClient
+from splitapiclient.http_clients.session import session_from_config, timeout_from_config
+from splitapiclient.http_clients.retry_policy import RetryPolicy
+from splitapiclient.util.deadline import request_options
+from splitapiclient.util.cache import TTLCache
+from splitapiclient.util.snapshot import WorkspaceSnapshot
+from splitapiclient.util.inventory import crawl_rbac, DEFAULT_INVENTORY_WORKERS
 from splitapiclient.util.exceptions import InsufficientConfigArgumentsException
 from splitapiclient.microclients import TrafficTypeMicroClient
 from splitapiclient.microclients import EnvironmentMicroClient
@@ -60,6 +66,16 @@ class HarnessApiClient(BaseApiClient):
                 - 'account_identifier': Harness account identifier to use for all Harness operations (optional)
                 - 'org_identifier': Harness organization identifier to use for all Harness operations (optional)
                 - 'project_identifier': Harness project identifier to use for all Harness operations (optional)
+                - 'pool_connections': Number of per-host connection pools to cache (optional)
+                - 'pool_maxsize': Maximum connections kept alive per host (optional)
+                - 'pool_block': Block when the connection pool is exhausted (optional)
+                - 'keep_alive': Set to False to close connections after each call (optional)
+                - 'retry_policy': RetryPolicy instance (or dict of its arguments) for rate limit and transient failure handling (optional)
+                - 'timeout': Connect and read timeout, a number or a (connect, read) tuple (optional)
+                - 'connect_timeout': Connect timeout in seconds (optional, defaults to 10)
+                - 'read_timeout': Read timeout in seconds (optional, defaults to 60)
+                - 'lookup_cache': True, a dict of TTLCache arguments (ttl, maxsize) or a TTLCache
+                  instance to cache workspace, environment and traffic type find() lookups (optional)
         '''
         # Set up Split API base URLs for existing endpoints
         if 'base_url' in config:
@@ -95,25 +111,29 @@ class HarnessApiClient(BaseApiClient):
         self._org_identifier = config.get('org_identifier')
         self._project_identifier = config.get('project_identifier')
         
-        # Create HTTP clients - use same token for both Split and Harness endpoints
-        split_http_client = HarnessHttpClient(self._base_url, auth_token)
-        split_http_clientv3 = HarnessHttpClient(self._base_url_v3, auth_token)
+        # Create HTTP clients - use same token and connection pool for both Split and Harness endpoints
+        self._session = session_from_config(config)
+        self._retry_policy = RetryPolicy.from_config(config)
+        self._timeout = timeout_from_config(config)
+        self._lookup_cache = TTLCache.from_config(config)
+        split_http_client = HarnessHttpClient(self._base_url, auth_token, session=self._session, retry_policy=self._retry_policy, timeout=self._timeout)
+        split_http_clientv3 = HarnessHttpClient(self._base_url_v3, auth_token, session=self._session, retry_policy=self._retry_policy, timeout=self._timeout)
         
         # Create HTTP client for Harness endpoints
-        harness_http_client = HarnessHttpClient(self._harness_base_url, auth_token)
+        harness_http_client = HarnessHttpClient(self._harness_base_url, auth_token, session=self._session, retry_policy=self._retry_policy, timeout=self._timeout)
         
         # Standard microclients using Split endpoints
-        self._environment_client = EnvironmentMicroClient(split_http_client)
-        self._split_client = SplitMicroClient(split_http_client)
-        self._split_definition_client = SplitDefinitionMicroClient(split_http_client)
-        self._segment_client = SegmentMicroClient(split_http_client)
-        self._segment_definition_client = SegmentDefinitionMicroClient(split_http_client)
-        self._rule_based_segment_client = RuleBasedSegmentMicroClient(split_http_client)
+        self._environment_client = EnvironmentMicroClient(split_http_client, cache=self._lookup_cache)
+        self._split_client = SplitMicroClient(split_http_client, cache=self._lookup_cache)
+        self._split_definition_client = SplitDefinitionMicroClient(split_http_client, cache=self._lookup_cache)
+        self._segment_client = SegmentMicroClient(split_http_client, cache=self._lookup_cache)
+        self._segment_definition_client = SegmentDefinitionMicroClient(split_http_client, cache=self._lookup_cache)
+        self._rule_based_segment_client = RuleBasedSegmentMicroClient(split_http_client, cache=self._lookup_cache)
         self._rule_based_segment_definition_client = RuleBasedSegmentDefinitionMicroClient(split_http_client)
-        self._large_segment_client = LargeSegmentMicroClient(split_http_client)
-        self._large_segment_definition_client = LargeSegmentDefinitionMicroClient(split_http_client)
-        self._workspace_client = WorkspaceMicroClient(split_http_client)
-        self._traffic_type_client = TrafficTypeMicroClient(split_http_client)
+        self._large_segment_client = LargeSegmentMicroClient(split_http_client, cache=self._lookup_cache)
+        self._large_segment_definition_client = LargeSegmentDefinitionMicroClient(split_http_client, cache=self._lookup_cache)
+        self._workspace_client = WorkspaceMicroClient(split_http_client, cache=self._lookup_cache)
+        self._traffic_type_client = TrafficTypeMicroClient(split_http_client, cache=self._lookup_cache)
         self._attribute_client = AttributeMicroClient(split_http_client)
         self._identity_client = IdentityMicroClient(split_http_client)
         self._change_request_client = ChangeRequestMicroClient(split_http_client)
@@ -131,6 +151,94 @@ class HarnessApiClient(BaseApiClient):
         self._role_assignment_client = RoleAssignmentMicroClient(harness_http_client, self._account_identifier, self._org_identifier, self._project_identifier)
         self._harness_project_client = HarnessProjectMicroClient(harness_http_client, self._account_identifier, self._org_identifier, self._project_identifier)
 
+    def close(self):
+        '''
+        Closes all pooled connections shared by this client's microclients.
+        '''
+        self._session.close()
+
+    def snapshot(self, workspace_id, path=':memory:', refresh=True, max_workers=4):
+        '''
+        Returns a local SQLite snapshot of a workspace that answers list()
+        and find() offline, see util.snapshot.WorkspaceSnapshot.
+
+        :param workspace_id: string. Workspace id.
+        :param path: string. SQLite database file, in memory by default.
+            An existing file is reused and refreshed incrementally.
+        :param refresh: bool. Pull the workspace before returning.
+        :param max_workers: int. Listings fetched concurrently.
+
+        :rtype: WorkspaceSnapshot
+        '''
+        snapshot = WorkspaceSnapshot(self, workspace_id, path, max_workers)
+        if refresh:
+            snapshot.refresh()
+        return snapshot
+
+    def rbac_inventory(self, path=None, account_identifier=None,
+                       max_workers=DEFAULT_INVENTORY_WORKERS, include_users=True):
+        '''
+        Crawls the account, its organizations and projects concurrently and
+        returns a de-duplicated graph of users, groups, service accounts,
+        roles, resource groups and role assignments, see
+        util.inventory.crawl_rbac.
+
+        :param path: string. Also write the inventory to this JSON file.
+        :param account_identifier: string. Defaults to the client's account.
+        :param max_workers: int. Listings fetched concurrently.
+        :param include_users: bool. Also list the account users.
+
+        :rtype: RBACInventory
+        '''
+        account_id = account_identifier if account_identifier is not None else self._account_identifier
+        inventory = crawl_rbac(self, account_id, max_workers, include_users)
+        if path is not None:
+            inventory.write(path)
+        return inventory
+
+    @staticmethod
+    def request_options(timeout=None, deadline=None, priority=None):
+        '''
+        Context manager overriding the request timeout and/or setting an
+        overall deadline for every call made inside the block, see
+        util.deadline.request_options.
+
+        :param timeout: float/tuple. Connect and read timeout in seconds.
+        :param deadline: float. Seconds the whole block may take.
+        :param priority: bool. Skip the client side rate limiter.
+        '''
+        return request_options(timeout=timeout, deadline=deadline, priority=priority)
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @property
+    def lookup_cache(self):
+        '''
+        TTLCache shared by the microclients' find() lookups (workspaces,
+        environments, traffic types and segment name indexes), or None when
+        'lookup_cache' is not set.
+        Call lookup_cache.stats() for hit/miss counters.
+
+        :rtype: TTLCache/None
+        '''
+        return self._lookup_cache
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    @property
+    def retry_stats(self):
+        '''
+        Retry counts and latencies of every call made by this client's
+        microclients, see RetryStats.snapshot.
+
+        :rtype: dict
+        '''
+        return self._retry_policy.stats.snapshot()
+
     @property
     def traffic_types(self):
         return self._traffic_type_client
@@ -2,6 +2,11 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals
 from splitapiclient.main.apiclient import BaseApiClient
 from splitapiclient.http_clients.sync_client import SyncHttpClient
+from splitapiclient.http_clients.session import session_from_config, timeout_from_config
+from splitapiclient.http_clients.retry_policy import RetryPolicy
+from splitapiclient.util.deadline import request_options
+from splitapiclient.util.cache import TTLCache
+from splitapiclient.util.snapshot import WorkspaceSnapshot
 from splitapiclient.util.exceptions import InsufficientConfigArgumentsException
 from splitapiclient.microclients import TrafficTypeMicroClient
 from splitapiclient.microclients import EnvironmentMicroClient
@@ -40,6 +45,24 @@ class SyncApiClient(BaseApiClient):
             the API client. Shoud have AT LEAST the following keys:
                 - 'base_url': Base url where the API is hosted
                 - 'apikey': APIKey used to authenticate the user.
+            Optional connection pool keys (shared by every microclient):
+                - 'pool_connections': Number of per-host pools to cache
+                - 'pool_maxsize': Maximum connections kept alive per host
+                - 'pool_block': Block when the pool is exhausted
+                - 'keep_alive': Set to False to close connections after each call
+            Optional rate limit and transient failure handling:
+                - 'retry_policy': RetryPolicy instance (or dict of its arguments)
+                  shared by every microclient, see http_clients.retry_policy
+            Optional timeouts (use request_options for per-call overrides
+            and overall deadlines):
+                - 'timeout': Connect and read timeout, a number or a
+                  (connect, read) tuple
+                - 'connect_timeout': Connect timeout in seconds (default 10)
+                - 'read_timeout': Read timeout in seconds (default 60)
+            Optional lookup caching:
+                - 'lookup_cache': True, a dict of TTLCache arguments (ttl,
+                  maxsize) or a TTLCache instance. Caches workspace,
+                  environment and traffic type find() lookups
         '''
         if 'base_url' in config:
             self._base_url = config['base_url']
@@ -61,20 +84,24 @@ class SyncApiClient(BaseApiClient):
 
         self._apikey = config['apikey']
         
-        http_client = SyncHttpClient(self._base_url, self._apikey)
-        http_clientv3 = SyncHttpClient(self._base_url_v3, self._apikey)
+        self._session = session_from_config(config)
+        self._retry_policy = RetryPolicy.from_config(config)
+        self._timeout = timeout_from_config(config)
+        self._lookup_cache = TTLCache.from_config(config)
+        http_client = SyncHttpClient(self._base_url, self._apikey, session=self._session, retry_policy=self._retry_policy, timeout=self._timeout)
+        http_clientv3 = SyncHttpClient(self._base_url_v3, self._apikey, session=self._session, retry_policy=self._retry_policy, timeout=self._timeout)
         
-        self._environment_client = EnvironmentMicroClient(http_client)
-        self._split_client = SplitMicroClient(http_client)
-        self._split_definition_client = SplitDefinitionMicroClient(http_client)
-        self._segment_client = SegmentMicroClient(http_client)
-        self._segment_definition_client = SegmentDefinitionMicroClient(http_client)
-        self._rule_based_segment_client = RuleBasedSegmentMicroClient(http_client)
+        self._environment_client = EnvironmentMicroClient(http_client, cache=self._lookup_cache)
+        self._split_client = SplitMicroClient(http_client, cache=self._lookup_cache)
+        self._split_definition_client = SplitDefinitionMicroClient(http_client, cache=self._lookup_cache)
+        self._segment_client = SegmentMicroClient(http_client, cache=self._lookup_cache)
+        self._segment_definition_client = SegmentDefinitionMicroClient(http_client, cache=self._lookup_cache)
+        self._rule_based_segment_client = RuleBasedSegmentMicroClient(http_client, cache=self._lookup_cache)
         self._rule_based_segment_definition_client = RuleBasedSegmentDefinitionMicroClient(http_client)
-        self._large_segment_client = LargeSegmentMicroClient(http_client)
-        self._large_segment_definition_client = LargeSegmentDefinitionMicroClient(http_client)
-        self._workspace_client = WorkspaceMicroClient(http_client)
-        self._traffic_type_client = TrafficTypeMicroClient(http_client)
+        self._large_segment_client = LargeSegmentMicroClient(http_client, cache=self._lookup_cache)
+        self._large_segment_definition_client = LargeSegmentDefinitionMicroClient(http_client, cache=self._lookup_cache)
+        self._workspace_client = WorkspaceMicroClient(http_client, cache=self._lookup_cache)
+        self._traffic_type_client = TrafficTypeMicroClient(http_client, cache=self._lookup_cache)
         self._attribute_client = AttributeMicroClient(http_client)
         self._identity_client = IdentityMicroClient(http_client)
         self._change_request_client = ChangeRequestMicroClient(http_client)
@@ -84,6 +111,73 @@ class SyncApiClient(BaseApiClient):
         self._restriction_client = RestrictionMicroClient(http_client)
         self._flag_set_client = FlagSetMicroClient(http_clientv3)
 
+    def close(self):
+        '''
+        Closes all pooled connections shared by this client's microclients.
+        '''
+        self._session.close()
+
+    def snapshot(self, workspace_id, path=':memory:', refresh=True, max_workers=4):
+        '''
+        Returns a local SQLite snapshot of a workspace that answers list()
+        and find() offline, see util.snapshot.WorkspaceSnapshot.
+
+        :param workspace_id: string. Workspace id.
+        :param path: string. SQLite database file, in memory by default.
+            An existing file is reused and refreshed incrementally.
+        :param refresh: bool. Pull the workspace before returning.
+        :param max_workers: int. Listings fetched concurrently.
+
+        :rtype: WorkspaceSnapshot
+        '''
+        snapshot = WorkspaceSnapshot(self, workspace_id, path, max_workers)
+        if refresh:
+            snapshot.refresh()
+        return snapshot
+
+    @staticmethod
+    def request_options(timeout=None, deadline=None, priority=None):
+        '''
+        Context manager overriding the request timeout and/or setting an
+        overall deadline for every call made inside the block, see
+        util.deadline.request_options.
+
+        :param timeout: float/tuple. Connect and read timeout in seconds.
+        :param deadline: float. Seconds the whole block may take.
+        :param priority: bool. Skip the client side rate limiter.
+        '''
+        return request_options(timeout=timeout, deadline=deadline, priority=priority)
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @property
+    def lookup_cache(self):
+        '''
+        TTLCache shared by the microclients' find() lookups (workspaces,
+        environments, traffic types and segment name indexes), or None when
+        'lookup_cache' is not set.
+        Call lookup_cache.stats() for hit/miss counters.
+
+        :rtype: TTLCache/None
+        '''
+        return self._lookup_cache
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    @property
+    def retry_stats(self):
+        '''
+        Retry counts and latencies of every call made by this client's
+        microclients, see RetryStats.snapshot.
+
+        :rtype: dict
+        '''
+        return self._retry_policy.stats.snapshot()
+
     @property
     def traffic_types(self):
         return self._traffic_type_client
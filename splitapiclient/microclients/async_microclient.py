@@ -0,0 +1,60 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+from functools import wraps
+
+
+class AsyncMicroClient:
+    '''
+    Awaitable facade over a blocking microclient.
+    Every public method of the wrapped microclient (`list`, `find`, `get`,
+    `add`, `kill`, `import_keys_from_json`, ...) is exposed as a coroutine
+    function with the same signature, executed on the async http client's
+    executor so that many operations can be awaited concurrently.
+    Streaming `iter_*` methods are exposed as async generators.
+    '''
+
+    def __init__(self, microclient, async_http_client):
+        '''
+        Constructor
+
+        :param microclient: blocking microclient instance to wrap
+        :param async_http_client: AsyncHttpClient used to run the calls
+        '''
+        self._microclient = microclient
+        self._async_http_client = async_http_client
+
+    @property
+    def microclient(self):
+        return self._microclient
+
+    def __getattr__(self, name):
+        '''
+        Returns a coroutine function wrapping the microclient's method.
+        Non callable and private attributes are not exposed.
+        '''
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._microclient, name)
+        if not callable(attr):
+            raise AttributeError(name)
+
+        if name.startswith('iter_'):
+            @wraps(attr)
+            async def async_generator(*args, **kwargs):
+                iterator = attr(*args, **kwargs)
+                exhausted = object()
+                while True:
+                    item = await self._async_http_client.run(
+                        next, iterator, exhausted
+                    )
+                    if item is exhausted:
+                        return
+                    yield item
+
+            return async_generator
+
+        @wraps(attr)
+        async def coroutine(*args, **kwargs):
+            return await self._async_http_client.run(attr, *args, **kwargs)
+
+        return coroutine
@@ -3,6 +3,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import marker_pages
 
 class ChangeRequestMicroClient:
     '''
@@ -67,9 +68,15 @@ class ChangeRequestMicroClient:
         :returns: list of Change request objects
         :rtype: list(ChangeRequest)
         '''
-        final_list = []
-        afterMarker = 0
-        
+        return [item for item in self.iter_list(environment_id, status)]
+
+    def iter_list(self, environment_id, status):
+        '''
+        Yields change request objects page by page, as each response arrives.
+
+        :returns: generator of Change request objects
+        :rtype: generator(ChangeRequest)
+        '''
         # Build URL templates locally without mutating self._endpoint
         list_initial_url = self._endpoint['list_initial']['url_template']
         list_next_url = self._endpoint['list_next']['url_template']
@@ -81,32 +88,27 @@ class ChangeRequestMicroClient:
             list_initial_url = list_initial_url + "&status={status}"
             list_next_url = list_next_url + "&status={status}"
         
-        while True:
-            if afterMarker==0:
+        def fetch_page(afterMarker):
+            if afterMarker is None:
                 # Create a new endpoint dict with modified URL template (keeping _endpoint immutable)
                 endpoint = {**self._endpoint['list_initial'], 'url_template': list_initial_url}
-                response = self._http_client.make_request(
+                return self._http_client.make_request(
                     endpoint,
                     status=status,
-                    environmentId=environment_id               
+                    environmentId=environment_id
                 )
-            else:
-                # Create a new endpoint dict with modified URL template (keeping _endpoint immutable)
-                endpoint = {**self._endpoint['list_next'], 'url_template': list_next_url}
-                response = self._http_client.make_request(
-                    endpoint,
-                    status=status,
-                    environmentId=environment_id,
-                    after = afterMarker
-                )
-            for item in response['data']:
-                final_list.append(as_dict(item))
-            if response['nextMarker'] is None:
-                break
-            else:
-                afterMarker = response['nextMarker']
-                continue
-        return [ChangeRequest(item,  self._http_client) for item in final_list]
+            # Create a new endpoint dict with modified URL template (keeping _endpoint immutable)
+            endpoint = {**self._endpoint['list_next'], 'url_template': list_next_url}
+            return self._http_client.make_request(
+                endpoint,
+                status=status,
+                environmentId=environment_id,
+                after = afterMarker
+            )
+
+        for page in marker_pages(fetch_page):
+            for item in page:
+                yield ChangeRequest(as_dict(item),  self._http_client)
 
     def find(self, split_name=None, segment_name=None, environment_id=None, status=None):
         '''
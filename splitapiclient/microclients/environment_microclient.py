@@ -54,11 +54,15 @@ class EnvironmentMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache used to resolve names in find() without
+            listing the workspace's environments each time (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
 
     def list(self, workspace_id):
         '''
@@ -73,6 +77,25 @@ class EnvironmentMicroClient:
         )
         return [Environment(item, workspace_id, self._http_client) for item in response]
 
+    def iter_raw(self, workspace_id):
+        '''
+        Yields the raw API items (dicts) of the workspace's environments.
+
+        :returns: generator of dicts
+        :rtype: generator(dict)
+        '''
+        for item in self._fetch_all(workspace_id):
+            yield item
+
+    def _fetch_all(self, workspace_id):
+        '''
+        Returns the raw environment items of a workspace.
+        '''
+        return self._http_client.make_request(
+            self._endpoint['all_items'],
+            workspaceId = workspace_id
+        )
+
     def find(self, environment_name, workspace_id):
         '''
         Find Environment in environment list objects.
@@ -80,16 +103,25 @@ class EnvironmentMicroClient:
         :returns: Environment objects
         :rtype: Environment
         '''
-        response = self._http_client.make_request(
-            self._endpoint['all_items'],
-            workspaceId = workspace_id
-        )
+        if self._cache is None:
+            response = self._fetch_all(workspace_id)
+        else:
+            response = self._cache.get_or_load(
+                ('environments', workspace_id), lambda: self._fetch_all(workspace_id)
+            )
         for item in response:
             if item['name']==environment_name:
                 return Environment(item, workspace_id, self._http_client)
         LOGGER.error("Environment Name does not exist")
         return None
 
+    def _invalidate(self, workspace_id):
+        '''
+        Drops the cached environment list of a workspace.
+        '''
+        if self._cache is not None:
+            self._cache.invalidate(('environments', workspace_id))
+
     def add(self, environment, workspace_id):
         '''
         add an environment
@@ -106,6 +138,7 @@ class EnvironmentMicroClient:
             body = data,
             workspaceId = workspace_id
         )
+        self._invalidate(workspace_id)
         return Environment(response, workspace_id,  self._http_client)
 
     def update(self, environment_id, workspace_id, fieldName, fieldValue):
@@ -129,6 +162,7 @@ class EnvironmentMicroClient:
             workspaceId = workspace_id,
             environmentId = environment_id
         )
+        self._invalidate(workspace_id)
         return Environment(response, workspace_id,  self._http_client)
 
     def delete(self, environment_id, workspace_id):
@@ -146,5 +180,6 @@ class EnvironmentMicroClient:
             workspaceId = workspace_id,
             environmentId = environment_id
         )
+        self._invalidate(workspace_id)
         return response
 
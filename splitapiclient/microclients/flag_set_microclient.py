@@ -3,6 +3,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import marker_pages
 
 
 class FlagSetMicroClient:
@@ -79,28 +80,40 @@ class FlagSetMicroClient:
         :returns: list of flag_sets objects
         :rtype: list(flag_sets)
         '''
-        final_list = []
-        afterMarker = 0
-        while True:
-            if afterMarker==0:
-                response = self._http_client.make_request(
+        return [item for item in self.iter_list(workspace_id)]
+
+    def iter_raw(self, workspace_id):
+        '''
+        Yields flag_sets items as returned by the API (dicts), page by page.
+
+        :returns: generator of dicts
+        :rtype: generator(dict)
+        '''
+        def fetch_page(afterMarker):
+            if afterMarker is None:
+                return self._http_client.make_request(
                     self._endpoint['list_initial'],
                     workspace_id = workspace_id
                 )
-            else:
-                response = self._http_client.make_request(
-                    self._endpoint['list_next'],
-                    workspace_id = workspace_id,
-                    after = afterMarker
-                )
-            for item in response['data']:
-                final_list.append(as_dict(item))
-            if response['nextMarker'] is None:
-                break
-            else:
-                afterMarker = response['nextMarker']
-                continue
-        return [FlagSet(item, workspace_id, self._http_client) for item in final_list]
+            return self._http_client.make_request(
+                self._endpoint['list_next'],
+                workspace_id = workspace_id,
+                after = afterMarker
+            )
+
+        for page in marker_pages(fetch_page):
+            for item in page:
+                yield as_dict(item)
+
+    def iter_list(self, workspace_id):
+        '''
+        Yields flag_sets objects page by page, as each response arrives.
+
+        :returns: generator of flag_sets objects
+        :rtype: generator(flag_sets)
+        '''
+        for item in self.iter_raw(workspace_id):
+            yield FlagSet(item, workspace_id, self._http_client)
         
     def find(self, flag_set_name=None, workspace_id=None):
         '''
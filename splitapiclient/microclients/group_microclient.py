@@ -3,6 +3,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import offset_pages
 
 class GroupMicroClient:
     '''
@@ -60,31 +61,35 @@ class GroupMicroClient:
         '''
         self._http_client = http_client
 
-    def list(self):
+    def list(self, parallel=False):
         '''
         Returns a list of Group objects.
 
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
         :returns: list of Group objects
         :rtype: list(Group)
         '''
-        offset_val = 0
-        final_list = []
-        while True:
-            response = self._http_client.make_request(
+        return [item for item in self.iter_list(parallel)]
+
+    def iter_list(self, parallel=False):
+        '''
+        Yields Group objects page by page, as each response arrives.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of Group objects
+        :rtype: generator(Group)
+        '''
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 offset = offset_val
             )
-            for item in response['objects']:
-                final_list.append(as_dict(item))
-            offset = int(response['offset'])
-            totalCount = int(response['totalCount'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        return [Group(item, self._http_client) for item in final_list]
+
+        for page in offset_pages(fetch_page, parallel=parallel):
+            for item in page:
+                yield Group(as_dict(item), self._http_client)
 
     def find(self, group_name):
         '''
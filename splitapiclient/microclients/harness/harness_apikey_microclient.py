@@ -5,6 +5,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.endpoints import scoped_endpoint
 
 
 class HarnessApiKeyMicroClient:
@@ -100,12 +101,8 @@ class HarnessApiKeyMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['all_items'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['all_items'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         try:
             request_kwargs = {
@@ -146,12 +143,8 @@ class HarnessApiKeyMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['get_apikey'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['get_apikey'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'apiKeyIdentifier': apikey_id,
@@ -190,12 +183,8 @@ class HarnessApiKeyMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['create'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['create'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': apikey_data,
@@ -235,12 +224,8 @@ class HarnessApiKeyMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['add_permissions'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['add_permissions'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': permissions,
@@ -278,12 +263,8 @@ class HarnessApiKeyMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['delete'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['delete'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'apiKeyIdentifier': apikey_id,
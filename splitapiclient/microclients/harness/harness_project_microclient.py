@@ -5,6 +5,8 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.endpoints import scoped_endpoint
+from splitapiclient.util.pagination import index_pages
 
 
 class HarnessProjectMicroClient:
@@ -83,87 +85,84 @@ class HarnessProjectMicroClient:
         self._org_identifier = org_identifier
         self._project_identifier = project_identifier
 
-    def list(self, account_identifier=None, org_identifier=None):
+    def list(self, account_identifier=None, org_identifier=None, parallel=False):
         '''
         Returns a list of HarnessProject objects.
 
         :param account_identifier: Account identifier to use for this request, overrides the default
         :param org_identifier: Organization identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
         :returns: list of HarnessProject objects
         :rtype: list(HarnessProject)
         '''
+        return [item for item in self.iter_list(account_identifier, org_identifier, parallel)]
+
+    def iter_list(self, account_identifier=None, org_identifier=None, parallel=False):
+        '''
+        Generator yielding HarnessProject objects page by page. The page count of
+        the first response tells which pages remain, so no empty page is
+        requested after the last one.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
+        :rtype: generator(HarnessProject)
+        '''
+        try:
+            for item in self._iter_projects(account_identifier, org_identifier, parallel):
+                yield item
+        except HTTPResponseError as e:
+            LOGGER.error(f"HTTP error fetching projects: {str(e)}")
+        except Exception as e:
+            LOGGER.error(f"Error fetching projects: {str(e)}")
+
+    def list_scope(self, account_identifier=None, org_identifier=None, parallel=False):
+        '''
+        Returns the HarnessProject objects of exactly the given scope. Unlike
+        list(), an org identifier left as None is omitted instead of falling
+        back to the client's default, and HTTP errors are raised instead of
+        ending the listing early.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier, None for every organization
+        :param parallel: fetch the pages after the first one concurrently
+        :returns: list of HarnessProject objects
+        :rtype: list(HarnessProject)
+        '''
+        return list(self._iter_projects(account_identifier, org_identifier, parallel, use_defaults=False))
+
+    def _iter_projects(self, account_identifier, org_identifier, parallel, use_defaults=True):
+        '''
+        Same as iter_list, but HTTP errors are raised instead of ending the
+        listing silently. With use_defaults=False, identifiers left as None
+        are omitted instead of falling back to the client's defaults.
+        '''
         account_id = account_identifier if account_identifier is not None else self._account_identifier
         if account_id is None:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
-        org_id = org_identifier if org_identifier is not None else self._org_identifier
-            
-        page_index = 0
-        final_list = []
-        last_json = None
-        total_projects_seen = 0
-        while True:
-            try:
-                # Conditionally modify endpoint URL template to omit optional parameters if not provided
-                endpoint = self._endpoint['all_items'].copy()
-                if org_id is None:
-                    endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-                
-                request_kwargs = {
-                    'pageIndex': page_index,
-                    'accountIdentifier': account_id
-                }
-                if org_id is not None:
-                    request_kwargs['orgIdentifier'] = org_id
-                    
-                response = self._http_client.make_request(
-                    endpoint,
-                    **request_kwargs
-                )
+        org_id = org_identifier
+        if use_defaults and org_id is None:
+            org_id = self._org_identifier
 
-                data = response.get('data', {})
-                
-                # Convert to JSON string for deep comparison
-                import json
-                current_json = json.dumps(data, sort_keys=True)
-                
-                # If we get the same response twice, we're in a loop
-                if current_json == last_json:
-                    break
-                
-                last_json = current_json
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['all_items'], orgIdentifier=org_id)
 
-                content_obj = data.get('content', []) if isinstance(data.get('content'), list) else []
-                content = []
-                for item in content_obj:
-                    if isinstance(item, dict) and 'project' in item:
-                        content.append(item['project'])
-                
-                # Also break if we get empty content
-                if not content:
-                    break
+        request_kwargs = {'accountIdentifier': account_id}
+        if org_id is not None:
+            request_kwargs['orgIdentifier'] = org_id
 
-                final_list.extend(content)
-                total_projects_seen += len(content)
-                
-               
-                # Get pagination info if available
-                total_elements = data.get('totalElements', 0)
-                total_pages = data.get('totalPages', 0)
-                if total_elements and total_pages:
-                    # If we've seen all pages according to API, break
-                    if page_index >= total_pages - 1:  # -1 because pages are 0-indexed
-                        break
-                
-                page_index += 1
+        def fetch_page(page_index):
+            response = self._http_client.make_request(
+                endpoint,
+                pageIndex=page_index,
+                **request_kwargs
+            )
+            return response.get('data', {})
 
-            except HTTPResponseError as e:
-                LOGGER.error(f"HTTP error fetching projects: {str(e)}")
-                break  # Break the loop on HTTP error
-            except Exception as e:
-                LOGGER.error(f"Error fetching projects: {str(e)}")
-                break  # Break the loop on any other error
-            
-        return [HarnessProject(item, self._http_client) for item in final_list]
+        for page in index_pages(fetch_page, parallel=parallel):
+            for item in page:
+                if isinstance(item, dict) and 'project' in item:
+                    yield HarnessProject(item['project'], self._http_client)
 
     def get(self, project_identifier, account_identifier=None, org_identifier=None):
         '''
@@ -180,10 +179,8 @@ class HarnessProjectMicroClient:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
         org_id = org_identifier if org_identifier is not None else self._org_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['get'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['get'], orgIdentifier=org_id)
         
         request_kwargs = {
             'projectIdentifier': project_identifier,  # Path parameter - replaces {projectIdentifier} in path
@@ -213,10 +210,8 @@ class HarnessProjectMicroClient:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
         org_id = org_identifier if org_identifier is not None else self._org_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['create'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['create'], orgIdentifier=org_id)
         
         request_kwargs = {
             'body': project_data,
@@ -247,10 +242,8 @@ class HarnessProjectMicroClient:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
         org_id = org_identifier if org_identifier is not None else self._org_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['update'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['update'], orgIdentifier=org_id)
         
         request_kwargs = {
             'projectIdentifier': project_identifier,  # Path parameter - replaces {projectIdentifier} in path
@@ -281,10 +274,8 @@ class HarnessProjectMicroClient:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
         org_id = org_identifier if org_identifier is not None else self._org_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['delete'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['delete'], orgIdentifier=org_id)
         
         request_kwargs = {
             'projectIdentifier': project_identifier,  # Path parameter - replaces {projectIdentifier} in path
@@ -1,10 +1,17 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
+from urllib.parse import quote
 from splitapiclient.resources.harness import HarnessUser, HarnessInvite
 from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.endpoints import scoped_endpoint
+from splitapiclient.util.pagination import index_pages
+
+
+# Users and invites requested per page of the aggregate endpoints
+USER_PAGE_SIZE = 100
 
 
 class HarnessUserMicroClient:
@@ -14,7 +21,7 @@ class HarnessUserMicroClient:
     _endpoint = {
         'all_items': {
             'method': 'POST', # yes this is really a post for getting users
-            'url_template': '/ng/api/user/aggregate?accountIdentifier={accountIdentifier}&orgIdentifier={orgIdentifier}&projectIdentifier={projectIdentifier}&pageIndex={pageIndex}',
+            'url_template': '/ng/api/user/aggregate?accountIdentifier={accountIdentifier}&orgIdentifier={orgIdentifier}&projectIdentifier={projectIdentifier}&pageIndex={pageIndex}&pageSize={pageSize}&searchTerm={searchTerm}',
             'headers': [{
                 'name': 'x-api-key',
                 'template': '{value}',
@@ -80,7 +87,7 @@ class HarnessUserMicroClient:
         },
         'list_pending': {
             'method': 'POST', # yes this is also really a POST
-            'url_template': '/ng/api/invites/aggregate?accountIdentifier={accountIdentifier}&orgIdentifier={orgIdentifier}&projectIdentifier={projectIdentifier}',
+            'url_template': '/ng/api/invites/aggregate?accountIdentifier={accountIdentifier}&orgIdentifier={orgIdentifier}&projectIdentifier={projectIdentifier}&pageIndex={pageIndex}&pageSize={pageSize}&searchTerm={searchTerm}',
             'headers': [{
                 'name': 'x-api-key',
                 'template': '{value}',
@@ -105,57 +112,148 @@ class HarnessUserMicroClient:
         self._org_identifier = org_identifier
         self._project_identifier = project_identifier
 
-    def list(self, account_identifier=None, org_identifier=None, project_identifier=None):
+    def list(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False,
+             page_size=USER_PAGE_SIZE, search_term=None, role_identifiers=None,
+             resource_group_identifiers=None):
         '''
         Returns a list of HarnessUser objects.
 
         :param account_identifier: Account identifier to use for this request, overrides the default
         :param org_identifier: Organization identifier to use for this request, overrides the default
         :param project_identifier: Project identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
+        :param page_size: number of users requested per page
+        :param search_term: only users whose name or email match it, filtered by the server
+        :param role_identifiers: only users assigned one of these roles
+        :param resource_group_identifiers: only users assigned one of these resource groups
+        :returns: list of HarnessUser objects
+        :rtype: list(HarnessUser)
+        '''
+        return [item for item in self.iter_list(
+            account_identifier, org_identifier, project_identifier, parallel, page_size,
+            search_term, role_identifiers, resource_group_identifiers
+        )]
+
+    def iter_list(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False,
+                  page_size=USER_PAGE_SIZE, search_term=None, role_identifiers=None,
+                  resource_group_identifiers=None):
+        '''
+        Generator yielding HarnessUser objects page by page. The page count of
+        the first response tells which pages remain, so no empty page is
+        requested after the last one. Filters are applied by the server.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier to use for this request, overrides the default
+        :param project_identifier: Project identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
+        :param page_size: number of users requested per page
+        :param search_term: only users whose name or email match it
+        :param role_identifiers: only users assigned one of these roles
+        :param resource_group_identifiers: only users assigned one of these resource groups
+        :rtype: generator(HarnessUser)
+        '''
+        try:
+            for item in self._iter_users(
+                account_identifier, org_identifier, project_identifier, parallel, page_size,
+                search_term, role_identifiers, resource_group_identifiers
+            ):
+                yield item
+        except HTTPResponseError:
+            # Stop listing if there's an HTTP error with the request
+            return
+
+    def list_scope(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False):
+        '''
+        Returns the HarnessUser objects of exactly the given scope. Unlike
+        list(), org and project identifiers left as None are omitted instead
+        of falling back to the client's defaults, and HTTP errors are raised
+        instead of ending the listing early.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier, None for the account scope
+        :param project_identifier: Project identifier, None for the account and organization scopes
+        :param parallel: fetch the pages after the first one concurrently
         :returns: list of HarnessUser objects
         :rtype: list(HarnessUser)
         '''
+        return list(self._iter_users(account_identifier, org_identifier, project_identifier, parallel, use_defaults=False))
+
+    def _iter_users(self, account_identifier, org_identifier, project_identifier, parallel,
+                    page_size=USER_PAGE_SIZE, search_term=None, role_identifiers=None,
+                    resource_group_identifiers=None, use_defaults=True):
+        '''
+        Same as iter_list, but HTTP errors are raised instead of ending the
+        listing silently. With use_defaults=False, identifiers left as None
+        are omitted instead of falling back to the client's defaults.
+        '''
+        body = {}
+        if role_identifiers:
+            body['roleIdentifiers'] = list(role_identifiers)
+        if resource_group_identifiers:
+            body['resourceGroupIdentifiers'] = list(resource_group_identifiers)
+        pages = self._aggregate_pages(
+            'all_items', account_identifier, org_identifier, project_identifier,
+            parallel, page_size, search_term, body or None, use_defaults
+        )
+        for page in pages:
+            for item in page:
+                yield HarnessUser(item['user'], self._http_client)
+
+    def find_by_email(self, email, account_identifier=None, org_identifier=None, project_identifier=None):
+        '''
+        Returns the user with the given email, or None. The lookup is
+        filtered by the server, so only the matching users are downloaded.
+
+        :param email: email of the user, compared case insensitively
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier to use for this request, overrides the default
+        :param project_identifier: Project identifier to use for this request, overrides the default
+        :rtype: HarnessUser
+        '''
+        for user in self.iter_list(account_identifier, org_identifier, project_identifier,
+                                   parallel=False, search_term=email):
+            if (user.email or '').lower() == email.lower():
+                return user
+        return None
+
+    def _aggregate_pages(self, endpoint_name, account_identifier, org_identifier, project_identifier,
+                         parallel, page_size, search_term, body, use_defaults=True):
+        '''
+        Pages of one of the aggregate (POST) listing endpoints.
+
+        :rtype: generator(list)
+        '''
         account_id = account_identifier if account_identifier is not None else self._account_identifier
         if account_id is None:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
-        org_id = org_identifier if org_identifier is not None else self._org_identifier
-        project_id = project_identifier if project_identifier is not None else self._project_identifier
-            
-        page_index = 0
-        final_list = []
-        while True:
-            try:
-                # Conditionally modify endpoint URL template to omit optional parameters if not provided
-                endpoint = self._endpoint['all_items'].copy()
-                if org_id is None:
-                    endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-                if project_id is None:
-                    endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
-                
-                request_kwargs = {
-                    'pageIndex': page_index,
-                    'accountIdentifier': account_id
-                }
-                if org_id is not None:
-                    request_kwargs['orgIdentifier'] = org_id
-                if project_id is not None:
-                    request_kwargs['projectIdentifier'] = project_id
-                    
-                response = self._http_client.make_request(
-                    endpoint,
-                    **request_kwargs
-                )
-                content = response.get('data', {}).get('content', [])
-                if not content:
-                    break
-                
-                final_list.extend([HarnessUser(item['user'], self._http_client) for item in content])
-                page_index += 1
-            except HTTPResponseError:
-                # Break out of the loop if there's an HTTP error with the request
-                break
-            
-        return final_list
+        org_id, project_id = org_identifier, project_identifier
+        if use_defaults:
+            org_id = org_id if org_id is not None else self._org_identifier
+            project_id = project_id if project_id is not None else self._project_identifier
+
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint[endpoint_name], orgIdentifier=org_id,
+                                   projectIdentifier=project_id, searchTerm=search_term)
+
+        request_kwargs = {'accountIdentifier': account_id, 'pageSize': page_size}
+        if org_id is not None:
+            request_kwargs['orgIdentifier'] = org_id
+        if project_id is not None:
+            request_kwargs['projectIdentifier'] = project_id
+        if search_term is not None:
+            request_kwargs['searchTerm'] = quote(search_term, safe='')
+        if body is not None:
+            request_kwargs['body'] = body
+
+        def fetch_page(page_index):
+            response = self._http_client.make_request(
+                endpoint,
+                pageIndex=page_index,
+                **request_kwargs
+            )
+            return response.get('data', {})
+
+        return index_pages(fetch_page, parallel=parallel)
 
     def get(self, user_id, account_identifier=None, org_identifier=None, project_identifier=None):
         '''
@@ -175,12 +273,8 @@ class HarnessUserMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['get_user'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['get_user'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'userId': user_id,
@@ -215,12 +309,8 @@ class HarnessUserMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['invite'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['invite'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': user_data,
@@ -256,12 +346,8 @@ class HarnessUserMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['update'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['update'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': update_data,
@@ -298,12 +384,8 @@ class HarnessUserMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['add_user_to_groups'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['add_user_to_groups'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': {"userGroupIdsToAdd": group_ids},
@@ -339,12 +421,8 @@ class HarnessUserMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['delete_pending'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['delete_pending'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'inviteId': invite_id,
@@ -361,51 +439,21 @@ class HarnessUserMicroClient:
         )
         return True
 
-    def list_pending(self, account_identifier=None, org_identifier=None, project_identifier=None):
+    def list_pending(self, account_identifier=None, org_identifier=None, project_identifier=None,
+                     page_size=USER_PAGE_SIZE, search_term=None):
         '''
         Returns a list of pending users.
 
         :param account_identifier: Account identifier to use for this request, overrides the default
         :param org_identifier: Organization identifier to use for this request, overrides the default
         :param project_identifier: Project identifier to use for this request, overrides the default
+        :param page_size: number of invites requested per page
+        :param search_term: only invites whose email match it, filtered by the server
         :returns: list of pending users
         :rtype: list(HarnessUser)
         '''
-        # Use the provided account_identifier or fall back to the default
-        account_id = account_identifier if account_identifier is not None else self._account_identifier
-        if account_id is None:
-            raise ValueError("account_identifier must be provided either at client initialization or method call")
-        org_id = org_identifier if org_identifier is not None else self._org_identifier
-        project_id = project_identifier if project_identifier is not None else self._project_identifier
-            
-        page_index = 0
-        final_list = []
-        while True:
-            # Conditionally modify endpoint URL template to omit optional parameters if not provided
-            endpoint = self._endpoint['list_pending'].copy()
-            if org_id is None:
-                endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-            if project_id is None:
-                endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
-            
-            request_kwargs = {
-                'pageIndex': page_index,
-                'accountIdentifier': account_id
-            }
-            if org_id is not None:
-                request_kwargs['orgIdentifier'] = org_id
-            if project_id is not None:
-                request_kwargs['projectIdentifier'] = project_id
-                
-            response = self._http_client.make_request(
-                endpoint,
-                **request_kwargs
-            )
-            content = response.get('data', {}).get('content', [])
-            if not content:
-                break
-            
-            final_list.extend([HarnessInvite(item, self._http_client) for item in content])
-            page_index += 1
-            
-        return final_list
+        pages = self._aggregate_pages(
+            'list_pending', account_identifier, org_identifier, project_identifier,
+            False, page_size, search_term, None
+        )
+        return [HarnessInvite(item, self._http_client) for page in pages for item in page]
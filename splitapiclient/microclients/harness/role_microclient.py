@@ -5,6 +5,8 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.endpoints import scoped_endpoint
+from splitapiclient.util.pagination import index_pages
 
 
 class RoleMicroClient:
@@ -83,62 +85,89 @@ class RoleMicroClient:
         self._org_identifier = org_identifier
         self._project_identifier = project_identifier
 
-    def list(self, account_identifier=None, org_identifier=None, project_identifier=None):
+    def list(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False):
         '''
         Returns a list of Role objects.
 
         :param account_identifier: Account identifier to use for this request, overrides the default
         :param org_identifier: Organization identifier to use for this request, overrides the default
         :param project_identifier: Project identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
         :returns: list of Role objects
         :rtype: list(Role)
         '''
+        return [item for item in self.iter_list(account_identifier, org_identifier, project_identifier, parallel)]
+
+    def iter_list(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False):
+        '''
+        Generator yielding Role objects page by page. The page count of
+        the first response tells which pages remain, so no empty page is
+        requested after the last one.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier to use for this request, overrides the default
+        :param project_identifier: Project identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
+        :rtype: generator(Role)
+        '''
+        try:
+            for item in self._iter_roles(account_identifier, org_identifier, project_identifier, parallel):
+                yield item
+        except HTTPResponseError:
+            # Stop listing if there's an HTTP error with the request
+            return
+
+    def list_scope(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False):
+        '''
+        Returns the Role objects of exactly the given scope. Unlike
+        list(), org and project identifiers left as None are omitted instead
+        of falling back to the client's defaults, and HTTP errors are raised
+        instead of ending the listing early.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier, None for the account scope
+        :param project_identifier: Project identifier, None for the account and organization scopes
+        :param parallel: fetch the pages after the first one concurrently
+        :returns: list of Role objects
+        :rtype: list(Role)
+        '''
+        return list(self._iter_roles(account_identifier, org_identifier, project_identifier, parallel, use_defaults=False))
+
+    def _iter_roles(self, account_identifier, org_identifier, project_identifier, parallel, use_defaults=True):
+        '''
+        Same as iter_list, but HTTP errors are raised instead of ending the
+        listing silently. With use_defaults=False, identifiers left as None
+        are omitted instead of falling back to the client's defaults.
+        '''
         account_id = account_identifier if account_identifier is not None else self._account_identifier
         if account_id is None:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
-        org_id = org_identifier if org_identifier is not None else self._org_identifier
-        project_id = project_identifier if project_identifier is not None else self._project_identifier
-            
-        page_index = 0
-        final_list = []
-        while True:
-            try:
-                # Conditionally modify endpoint URL template to omit optional parameters if not provided
-                endpoint = self._endpoint['all_items'].copy()
-                if org_id is None:
-                    endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-                if project_id is None:
-                    endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
-                
-                request_kwargs = {
-                    'accountIdentifier': account_id,
-                    'pageIndex': page_index
-                }
-                if org_id is not None:
-                    request_kwargs['orgIdentifier'] = org_id
-                if project_id is not None:
-                    request_kwargs['projectIdentifier'] = project_id
-                    
-                response = self._http_client.make_request(
-                    endpoint,
-                    **request_kwargs
-                )
-                data = response.get('data', {})
-                content_obj = data.get('content', []) if isinstance(data.get('content'), list) else []
-                content = []
-                for item in content_obj:
-                    if isinstance(item, dict) and 'role' in item:
-                        content.append(item['role'])
-                
-                final_list.extend(content)
-                if not content:
-                    break
-                page_index += 1
-            except HTTPResponseError:
-                # Break out of the loop if there's an HTTP error with the request
-                break
-            
-        return [Role(item, self._http_client) for item in final_list]
+        org_id, project_id = org_identifier, project_identifier
+        if use_defaults:
+            org_id = org_id if org_id is not None else self._org_identifier
+            project_id = project_id if project_id is not None else self._project_identifier
+
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['all_items'], orgIdentifier=org_id, projectIdentifier=project_id)
+
+        request_kwargs = {'accountIdentifier': account_id}
+        if org_id is not None:
+            request_kwargs['orgIdentifier'] = org_id
+        if project_id is not None:
+            request_kwargs['projectIdentifier'] = project_id
+
+        def fetch_page(page_index):
+            response = self._http_client.make_request(
+                endpoint,
+                pageIndex=page_index,
+                **request_kwargs
+            )
+            return response.get('data', {})
+
+        for page in index_pages(fetch_page, parallel=parallel):
+            for item in page:
+                if isinstance(item, dict) and 'role' in item:
+                    yield Role(item['role'], self._http_client)
 
     def get(self, role_id, account_identifier=None, org_identifier=None, project_identifier=None):
         '''
@@ -158,12 +187,8 @@ class RoleMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['get_role'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['get_role'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'roleId': role_id,
@@ -198,12 +223,8 @@ class RoleMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['create'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['create'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': role_data,
@@ -239,12 +260,8 @@ class RoleMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['update'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['update'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': update_data,
@@ -280,12 +297,8 @@ class RoleMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['delete'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['delete'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'roleId': role_id,
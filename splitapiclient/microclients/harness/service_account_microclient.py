@@ -5,6 +5,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.endpoints import scoped_endpoint
 
 
 class ServiceAccountMicroClient:
@@ -93,38 +94,60 @@ class ServiceAccountMicroClient:
         :returns: list of ServiceAccount objects
         :rtype: list(ServiceAccount)
         '''
-        account_id = account_identifier if account_identifier is not None else self._account_identifier
-        if account_id is None:
-            raise ValueError("account_identifier must be provided either at client initialization or method call")
-        org_id = org_identifier if org_identifier is not None else self._org_identifier
-        project_id = project_identifier if project_identifier is not None else self._project_identifier
-            
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['all_items'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
-        
         try:
-            request_kwargs = {
-                'accountIdentifier': account_id
-            }
-            if org_id is not None:
-                request_kwargs['orgIdentifier'] = org_id
-            if project_id is not None:
-                request_kwargs['projectIdentifier'] = project_id
-                
-            response = self._http_client.make_request(
-                endpoint,
-                **request_kwargs
-            )
-            data = response.get('data', [])
-            return [ServiceAccount(item, self._http_client) for item in data]
+            return self._list_service_accounts(account_identifier, org_identifier, project_identifier)
         except HTTPResponseError as e:
             LOGGER.error(f"HTTP error fetching service accounts: {str(e)}")
             return []  # Return empty list on HTTP error
 
+    def list_scope(self, account_identifier=None, org_identifier=None, project_identifier=None):
+        '''
+        Returns the ServiceAccount objects of exactly the given scope. Unlike
+        list(), org and project identifiers left as None are omitted instead
+        of falling back to the client's defaults, and HTTP errors are raised
+        instead of returning an empty list.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier, None for the account scope
+        :param project_identifier: Project identifier, None for the account and organization scopes
+        :returns: list of ServiceAccount objects
+        :rtype: list(ServiceAccount)
+        '''
+        return self._list_service_accounts(account_identifier, org_identifier, project_identifier,
+                                           use_defaults=False)
+
+    def _list_service_accounts(self, account_identifier, org_identifier, project_identifier, use_defaults=True):
+        '''
+        Same as list, but HTTP errors are raised instead of returning an
+        empty list. With use_defaults=False, identifiers left as None are
+        omitted instead of falling back to the client's defaults.
+        '''
+        account_id = account_identifier if account_identifier is not None else self._account_identifier
+        if account_id is None:
+            raise ValueError("account_identifier must be provided either at client initialization or method call")
+        org_id, project_id = org_identifier, project_identifier
+        if use_defaults:
+            org_id = org_id if org_id is not None else self._org_identifier
+            project_id = project_id if project_id is not None else self._project_identifier
+
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['all_items'], orgIdentifier=org_id, projectIdentifier=project_id)
+
+        request_kwargs = {
+            'accountIdentifier': account_id
+        }
+        if org_id is not None:
+            request_kwargs['orgIdentifier'] = org_id
+        if project_id is not None:
+            request_kwargs['projectIdentifier'] = project_id
+
+        response = self._http_client.make_request(
+            endpoint,
+            **request_kwargs
+        )
+        data = response.get('data', [])
+        return [ServiceAccount(item, self._http_client) for item in data]
+
     def get(self, service_account_id, account_identifier=None, org_identifier=None, project_identifier=None):
         '''
         Get a specific service account by ID
@@ -143,12 +166,8 @@ class ServiceAccountMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['item'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['item'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'serviceAccountId': service_account_id,
@@ -188,12 +207,8 @@ class ServiceAccountMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['create'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['create'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': service_account_data,
@@ -230,12 +245,8 @@ class ServiceAccountMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['update'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['update'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': update_data,
@@ -272,12 +283,8 @@ class ServiceAccountMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['delete'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['delete'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'serviceAccountId': service_account_id,
@@ -1,10 +1,20 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
 from splitapiclient.resources.harness import Token
+import threading
+import time
 from splitapiclient.util.exceptions import HTTPResponseError, \
-    UnknownApiClientError
+    UnknownApiClientError, TokenSinkError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.endpoints import scoped_endpoint
+from splitapiclient.util.pagination import index_pages
+from splitapiclient.util.bulk import run_each, is_rate_limited, \
+    DEFAULT_BULK_WORKERS, DEFAULT_ITEM_ATTEMPTS
+
+
+# Rotations sent concurrently by rotate_expiring
+MAX_ROTATION_WORKERS = 8
 
 
 class TokenMicroClient:
@@ -83,63 +93,89 @@ class TokenMicroClient:
         self._org_identifier = org_identifier
         self._project_identifier = project_identifier
 
-    def list(self, account_identifier=None, org_identifier=None, project_identifier=None):
+    def list(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False):
         '''
         Returns a list of Token objects.
 
         :param account_identifier: Account identifier to use for this request, overrides the default
         :param org_identifier: Organization identifier to use for this request, overrides the default
         :param project_identifier: Project identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
+        :returns: list of Token objects
+        :rtype: list(Token)
+        '''
+        return [item for item in self.iter_list(account_identifier, org_identifier, project_identifier, parallel)]
+
+    def iter_list(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False):
+        '''
+        Generator yielding Token objects page by page. The page count of
+        the first response tells which pages remain, so no empty page is
+        requested after the last one.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier to use for this request, overrides the default
+        :param project_identifier: Project identifier to use for this request, overrides the default
+        :param parallel: fetch the pages after the first one concurrently
+        :rtype: generator(Token)
+        '''
+        try:
+            for token in self._iter_tokens(account_identifier, org_identifier, project_identifier, parallel):
+                yield token
+        except HTTPResponseError:
+            # Stop listing if there's an HTTP error with the request
+            return
+
+    def list_scope(self, account_identifier=None, org_identifier=None, project_identifier=None, parallel=False):
+        '''
+        Returns the Token objects of exactly the given scope. Unlike
+        list(), org and project identifiers left as None are omitted instead
+        of falling back to the client's defaults, and HTTP errors are raised
+        instead of ending the listing early.
+
+        :param account_identifier: Account identifier to use for this request, overrides the default
+        :param org_identifier: Organization identifier, None for the account scope
+        :param project_identifier: Project identifier, None for the account and organization scopes
+        :param parallel: fetch the pages after the first one concurrently
         :returns: list of Token objects
         :rtype: list(Token)
         '''
+        return list(self._iter_tokens(account_identifier, org_identifier, project_identifier, parallel, use_defaults=False))
+
+    def _iter_tokens(self, account_identifier, org_identifier, project_identifier, parallel, use_defaults=True):
+        '''
+        Same as iter_list, but HTTP errors are raised instead of ending the
+        listing silently. With use_defaults=False, identifiers left as None
+        are omitted instead of falling back to the client's defaults.
+        '''
         account_id = account_identifier if account_identifier is not None else self._account_identifier
         if account_id is None:
             raise ValueError("account_identifier must be provided either at client initialization or method call")
-        org_id = org_identifier if org_identifier is not None else self._org_identifier
-        project_id = project_identifier if project_identifier is not None else self._project_identifier
-        
-        page_index = 0
-        final_list = []
-        while True:
-            try:
-                # Conditionally modify endpoint URL template to omit optional parameters if not provided
-                endpoint = self._endpoint['all_items'].copy()
-                if org_id is None:
-                    endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-                if project_id is None:
-                    endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
-                
-                request_kwargs = {
-                    'accountIdentifier': account_id,
-                    'pageIndex': page_index
-                }
-                if org_id is not None:
-                    request_kwargs['orgIdentifier'] = org_id
-                if project_id is not None:
-                    request_kwargs['projectIdentifier'] = project_id
-                    
-                response = self._http_client.make_request(
-                    endpoint,
-                    **request_kwargs
-                )
-                data = response.get('data', {})
-                
-                content = data.get('content', [])
-                if content:
-                    # Extract token data from each item in the list
-                    for item in content:
-                        if isinstance(item, dict) and 'token' in item:
-                            final_list.append(item['token'])
-                else:
-                    break
-                    
-                page_index += 1
-            except HTTPResponseError:
-                # Break out of the loop if there's an HTTP error with the request
-                break
-        
-        return [Token(item, self._http_client) for item in final_list]
+        org_id, project_id = org_identifier, project_identifier
+        if use_defaults:
+            org_id = org_id if org_id is not None else self._org_identifier
+            project_id = project_id if project_id is not None else self._project_identifier
+
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['all_items'], orgIdentifier=org_id, projectIdentifier=project_id)
+
+        request_kwargs = {'accountIdentifier': account_id}
+        if org_id is not None:
+            request_kwargs['orgIdentifier'] = org_id
+        if project_id is not None:
+            request_kwargs['projectIdentifier'] = project_id
+
+        def fetch_page(page_index):
+            response = self._http_client.make_request(
+                endpoint,
+                pageIndex=page_index,
+                **request_kwargs
+            )
+            return response.get('data', {})
+
+        for page in index_pages(fetch_page, parallel=parallel):
+            for item in page:
+                if isinstance(item, dict) and 'token' in item:
+                    yield Token(item['token'], self._http_client)
 
     def get(self, token_id, account_identifier=None, org_identifier=None, project_identifier=None):
         '''
@@ -181,12 +217,8 @@ class TokenMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['create'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['create'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': token_data,
@@ -222,12 +254,8 @@ class TokenMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['update_token'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['update_token'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'body': update_data,
@@ -266,12 +294,8 @@ class TokenMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['rotate_token'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['rotate_token'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'tokenId': token_id,
@@ -308,12 +332,8 @@ class TokenMicroClient:
         org_id = org_identifier if org_identifier is not None else self._org_identifier
         project_id = project_identifier if project_identifier is not None else self._project_identifier
             
-        # Conditionally modify endpoint URL template to omit optional parameters if not provided
-        endpoint = self._endpoint['delete'].copy()
-        if org_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&orgIdentifier={orgIdentifier}', '')
-        if project_id is None:
-            endpoint['url_template'] = endpoint['url_template'].replace('&projectIdentifier={projectIdentifier}', '')
+        # Endpoint variant leaving out the optional parameters that weren't provided
+        endpoint = scoped_endpoint(self._endpoint['delete'], orgIdentifier=org_id, projectIdentifier=project_id)
         
         request_kwargs = {
             'tokenId': token_id,
@@ -329,3 +349,123 @@ class TokenMicroClient:
             **request_kwargs
         )
         return True
+
+    @staticmethod
+    def _expires_at(token):
+        '''
+        Earliest of a token's validTo and scheduledExpireTime, in epoch
+        milliseconds, or None when it doesn't expire.
+        '''
+        times = [t for t in (token.validTo, token.scheduledExpireTime) if t]
+        return min(times) if times else None
+
+    def rotate_expiring(self, within, sink, scopes=None, account_identifier=None,
+                        max_workers=MAX_ROTATION_WORKERS, attempts=DEFAULT_ITEM_ATTEMPTS,
+                        list_workers=DEFAULT_BULK_WORKERS):
+        '''
+        Rotates every valid service account token expiring in the next
+        `within` seconds. Tokens of all the scopes are listed concurrently,
+        then rotated in parallel; each new value is handed to `sink` as soon
+        as it's received and isn't kept afterwards.
+        A rotation isn't idempotent, so only the attempts rejected by rate
+        limiting are repeated.
+
+        :param within: number. Seconds from now; tokens expiring before are rotated.
+        :param sink: callable. Receives (token, new value) for every rotated
+            token, one call at a time. If it raises, the token is reported as
+            'undelivered': it was rotated but its new value is lost.
+        :param scopes: list of (org identifier, project identifier) tuples to
+            list tokens from, listed exactly as given: None identifiers are
+            left out (e.g. (None, None) is the account scope) instead of
+            falling back to the client's defaults. Default: the client's
+            default scope.
+        :param account_identifier: Account identifier to use for these requests, overrides the default
+        :param max_workers: int. Rotations in flight.
+        :param attempts: int. Maximum attempts per rotation.
+        :param list_workers: int. Scopes listed concurrently.
+
+        :returns: result holding an ItemResult per selected token (without
+            the new values), with an 'audit' list and the 'scanned',
+            'selected', 'rotated', 'failed' and 'list_errors' counts in its
+            metadata.
+        :rtype: BulkOperationResult
+        '''
+        use_defaults = scopes is None
+        if use_defaults:
+            scopes = [(None, None)]
+        listed = run_each(
+            scopes,
+            lambda scope: list(self._iter_tokens(
+                account_identifier, scope[0], scope[1], False, use_defaults=use_defaults
+            )),
+            max_workers=list_workers,
+        )
+        for failed in listed.failed:
+            LOGGER.error('Could not list tokens of scope %s: %s' % (failed.item, failed.error))
+
+        deadline = (time.time() + within) * 1000
+        seen = set()
+        candidates = []
+        scanned = 0
+        for scope_result in listed.successful:
+            org_id, project_id = scope_result.item
+            for token in scope_result.value:
+                scanned += 1
+                key = (token.parentIdentifier, token.apiKeyIdentifier, token.identifier)
+                expires_at = self._expires_at(token)
+                if key in seen or token.valid is False or expires_at is None or expires_at > deadline:
+                    continue
+                seen.add(key)
+                candidates.append((token, org_id, project_id))
+
+        lock = threading.Lock()
+
+        def rotate(candidate):
+            token, org_id, project_id = candidate
+            value = self.rotate(
+                token.identifier, token.parentIdentifier, token.apiKeyIdentifier,
+                account_identifier, org_id, project_id
+            )
+            try:
+                with lock:
+                    sink(token, value)
+            except Exception as e:
+                raise TokenSinkError('Token %s was rotated but its new value could not be '
+                                     'delivered: %s' % (token.identifier, e))
+
+        rotated = run_each(candidates, rotate, max_workers=max_workers,
+                           attempts=attempts, retryable=is_rate_limited)
+
+        audit = []
+        for item_result in rotated.successful + rotated.failed:
+            token, org_id, project_id = item_result.item
+            if item_result.success:
+                status = 'rotated'
+            elif isinstance(item_result.error, TokenSinkError):
+                status = 'undelivered'
+            else:
+                status = 'failed'
+            audit.append({
+                'identifier': token.identifier,
+                'parent_identifier': token.parentIdentifier,
+                'api_key_identifier': token.apiKeyIdentifier,
+                'org_identifier': org_id,
+                'project_identifier': project_id,
+                'expires_at': self._expires_at(token),
+                'status': status,
+                'error': str(item_result.error) if item_result.error is not None else None,
+                'attempts': item_result.attempts,
+                'elapsed': item_result.elapsed,
+            })
+        audit.sort(key=lambda entry: (str(entry['org_identifier']), str(entry['project_identifier']),
+                                      entry['parent_identifier'] or '', entry['identifier'] or ''))
+
+        rotated.metadata.update({
+            'audit': audit,
+            'scanned': scanned,
+            'selected': len(candidates),
+            'rotated': len(rotated.successful),
+            'failed': len(rotated.failed),
+            'list_errors': [(failed.item, failed.error) for failed in listed.failed],
+        })
+        return rotated
@@ -4,6 +4,10 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
 from splitapiclient.util.bulk_result import BulkOperationResult
+from splitapiclient.util.bulk import run_batches, DEFAULT_BULK_WORKERS
+
+
+IDENTITY_BATCH_SIZE = 100
 
 
 class IdentityMicroClient:
@@ -134,6 +138,87 @@ class IdentityMicroClient:
 
         return BulkOperationResult(successful, failed, response.get('metadata'))
 
+    def save_many(self, identities, batch_size=IDENTITY_BATCH_SIZE,
+                  max_workers=DEFAULT_BULK_WORKERS, keep_successful=True):
+        '''
+        Save any number of identities, for any traffic types and
+        environments. Identities are grouped by (trafficTypeId,
+        environmentId), each group is split into batches of `batch_size`
+        and the batches are sent concurrently with save_all. The input is
+        consumed lazily, so generators of any size can be passed.
+
+        :param identities: iterable of Identity instances or dicts
+            containing keys with identity's properties
+        :param batch_size: identities per request
+        :param max_workers: number of batches sent concurrently
+        :param keep_successful: keep the saved Identity objects in the
+            result; disable it for very large loads to only keep counts
+
+        :returns: merged result of every batch. Failed items hold the
+            Identity object, a status code (None when the whole batch
+            request failed), a message and the 'index' of the identity in
+            the input (so failed_ranges gives input positions even though
+            identities are regrouped), and can be retried with
+            save_many(result.failed_items()). metadata holds the
+            'saved', 'failed' and 'batches' counts.
+        :rtype: BulkOperationResult
+        '''
+        def batches():
+            # Batches hold (input position, identity) pairs; a batch's start
+            # is the input position of its first identity
+            pending = {}
+            for position, identity in enumerate(identities):
+                data = as_dict(identity)
+                group = (data.get('trafficTypeId'), data.get('environmentId'))
+                batch = pending.setdefault(group, [])
+                batch.append((position, data))
+                if len(batch) >= batch_size:
+                    del pending[group]
+                    yield batch[0][0], batch
+            for batch in pending.values():
+                yield batch[0][0], batch
+
+        def save(index, batch):
+            saved = self.save_all([data for _, data in batch])
+            if saved.failed:
+                # Failures are reported by object, matched back to the input
+                # positions by key
+                positions = {}
+                for position, data in batch:
+                    positions.setdefault(data.get('key'), []).append(position)
+                for failure in saved.failed:
+                    candidates = positions.get(failure['object'].key)
+                    failure['index'] = candidates.pop(0) if candidates else None
+            return saved
+
+        result = BulkOperationResult(metadata={'saved': 0, 'failed': 0, 'batches': 0})
+
+        def collect(batch):
+            # Runs as each batch completes, so with keep_successful=False
+            # the saved identities are dropped right away
+            result.metadata['batches'] += 1
+            if batch.success:
+                saved = batch.value
+                result.metadata['saved'] += len(saved.successful)
+                result.metadata['failed'] += len(saved.failed)
+                if keep_successful:
+                    result.successful.extend(saved.successful)
+                result.failed.extend(saved.failed)
+                return
+            result.metadata['failed'] += batch.size
+            result.failed.extend(
+                {
+                    'object': Identity(data, self._http_client),
+                    'status': getattr(getattr(batch.error, '_error', None), 'status_code', None),
+                    'message': str(batch.error),
+                    'index': position,
+                }
+                for position, data in batch.items
+            )
+
+        run_batches(batches(), save, max_workers=max_workers, on_batch=collect)
+        return result
+
     def update(self, identity):
         '''
         Update an existing identity
@@ -1,10 +1,11 @@
 from splitapiclient.resources import LargeSegmentDefinition
 from splitapiclient.util.exceptions import HTTPResponseError, \
-    UnknownApiClientError
+    UnknownApiClientError, InvalidArgumentException
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
-import urllib
-import requests
+from splitapiclient.util.lookup import find_by_name
+from splitapiclient.util import upload
+from splitapiclient.util.keys import prepare_key_file
 
 class LargeSegmentDefinitionMicroClient:
     '''
@@ -35,11 +36,14 @@ class LargeSegmentDefinitionMicroClient:
 
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache holding the name index used by find() (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
 
     def list(self, environment_id, workspace_id):
         '''
@@ -72,11 +76,15 @@ class LargeSegmentDefinitionMicroClient:
         :returns: SegmentDefinition object
         :rtype: SegmentDefinition
         '''
-        for item in self.list(environment_id, workspace_id):
-            if item.name == segment_name:
-                return item
-        LOGGER.error("Large Segment Definition Name does not exist")
-        return None
+        item = find_by_name(
+            segment_name,
+            lambda: self.list(environment_id, workspace_id),
+            self._cache,
+            ('large_segment_definitions', environment_id, workspace_id)
+        )
+        if item is None:
+            LOGGER.error("Large Segment Definition Name does not exist")
+        return item
 
 
 
@@ -138,12 +146,50 @@ class LargeSegmentDefinitionMicroClient:
         return response
 
 
-    def upload_file(self, result, file_path):
+    def prepare_file(self, source_path, destination_path, strict=True, **kwargs):
+        '''
+        Prepares a key file for upload before any change request is made:
+        keys are stripped, validated and de-duplicated and the result is
+        written to destination_path (see util.keys.prepare_key_file for the
+        extra keyword arguments, e.g. max_key_length).
+
+        :param source_path: csv, ndjson or txt key file
+        :param destination_path: path of the upload ready file
+        :param strict: raise if any key is invalid
+
+        :returns: key counts and duplicate rate
+        :rtype: KeyFileReport
+        '''
+        report = prepare_key_file(source_path, destination_path, **kwargs)
+        LOGGER.info('Prepared %s: %d keys, %d unique, %.2f%% duplicates, %d invalid' % (
+            source_path, report.total, report.unique,
+            100 * report.duplicate_rate, report.invalid
+        ))
+        if report.unique == 0:
+            raise InvalidArgumentException('No valid keys found in %s' % source_path)
+        if strict and report.invalid:
+            raise InvalidArgumentException(
+                '%d invalid keys found in %s, e.g. %s' % (
+                    report.invalid, source_path,
+                    ', '.join('%r (%s)' % sample for sample in report.invalid_samples[:3])
+                )
+            )
+        return report
+
+    def upload_file(self, result, file_path, progress=None, verify_checksum=False,
+                    retry_policy=None):
         '''
         Upload a file to the specified URL.
+        The file is streamed in blocks over the http client's pooled session
+        and hashed on the fly; failed attempts are retried with backoff.
 
         :param result: dictionary containing 'url', 'method', and 'transactionMetadata'
         :param file_path: path to the file to be uploaded
+        :param progress: callable receiving (bytes sent, total bytes)
+        :param verify_checksum: raise UploadIntegrityError if the ETag of the
+            stored object isn't the file's MD5 (off by default: SSE-KMS
+            objects have other ETags)
+        :param retry_policy: RetryPolicy for the upload (optional)
         
         :returns: response from the server
         :rtype: requests.Response
@@ -152,6 +198,8 @@ class LargeSegmentDefinitionMicroClient:
         headers = {
             'Host': result['transactionMetadata']['headers']['Host'][0]
         }
-        with open(file_path, 'rb') as file:
-            response = requests.put(url, headers=headers, data=file)
-        return response
\ No newline at end of file
+        return upload.upload_file(
+            url, file_path, headers=headers, progress=progress,
+            retry_policy=retry_policy, verify_checksum=verify_checksum,
+            session=getattr(self._http_client, 'session', None)
+        )
@@ -66,11 +66,29 @@ class LargeSegmentMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache shared with the large segment definition microclient, whose
+            name indexes are dropped when segments are deleted or moved
+            between environments (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
+
+    def _invalidate_definitions(self, environment_id=None, workspace_id=None):
+        '''
+        Drops the cached large segment definition name indexes of an environment or a
+        workspace.
+        '''
+        if self._cache is None:
+            return
+        self._cache.invalidate_where(
+            lambda key: key[0] == 'large_segment_definitions' and
+            (environment_id is None or key[1] == environment_id) and
+            (workspace_id is None or key[2] == workspace_id)
+        )
 
 
     def list(self, workspace_id):
@@ -139,6 +157,7 @@ class LargeSegmentMicroClient:
             workspaceId = workspace_id,
             segmentName = large_segment_name
         )
+        self._invalidate_definitions(workspace_id=workspace_id)
         return response
 
     def add_to_environment(self, large_segment_name, environment_id, workspace_id):
@@ -156,6 +175,7 @@ class LargeSegmentMicroClient:
             segmentName = large_segment_name,
             environmentId = environment_id
         )
+        self._invalidate_definitions(environment_id)
         response['workspaceId'] = workspace_id
         return LargeSegmentDefinition( response, self._http_client)
 
@@ -174,4 +194,5 @@ class LargeSegmentMicroClient:
             segmentName = large_segment_name,
             environmentId = environment_id
         )
+        self._invalidate_definitions(environment_id)
         return True
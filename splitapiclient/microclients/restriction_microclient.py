@@ -3,6 +3,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import offset_pages
 
 class RestrictionMicroClient:
     '''
@@ -38,32 +39,38 @@ class RestrictionMicroClient:
         '''
         self._http_client = http_client
 
-    def list(self, resource_type, resource_id):
+    def list(self, resource_type, resource_id, parallel=False):
         '''
         Returns a list of restriction objects.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: list of Restriction objects
         :rtype: list(Restriction)
         '''
-        offset_val = 0
-        final_list = []
-        while True:
-            response = self._http_client.make_request(
+        return [item for item in self.iter_list(resource_type, resource_id, parallel)]
+
+    def iter_list(self, resource_type, resource_id, parallel=False):
+        '''
+        Yields restriction objects page by page, as each response arrives.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of Restriction objects
+        :rtype: generator(Restriction)
+        '''
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 offset = offset_val,
                 resourceType = resource_type,
                 resourceId = resource_id
             )
-            for item in response['objects']:
-                final_list.append(item)
-            offset = int(response['offset'])
-            totalCount = int(response['totalCount'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        return [Restriction(item, self._http_client) for item in final_list]
-        
+
+        for page in offset_pages(fetch_page, parallel=parallel):
+            for item in page:
+                yield Restriction(item, self._http_client)
+
     def add(self, resource_type, resource_id, restrictions_list):
         '''
         add a new restriction to existing object
@@ -3,6 +3,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import limit_pages
 
 class RuleBasedSegmentDefinitionMicroClient:
     '''
@@ -62,38 +63,34 @@ class RuleBasedSegmentDefinitionMicroClient:
         :returns: list of RuleBasedSegment in environment objects
         :rtype: list(RuleBasedSegmentDefinition)
         '''
-        segment_definition_list = []
-        current_offset = offset
-        
-        while True:
-            response = self._http_client.make_request(
+        return [item for item in self.iter_list(environment_id, workspace_id, offset, limit)]
+
+    def iter_list(self, environment_id, workspace_id, offset=0, limit=50):
+        '''
+        Yields RuleBasedSegment in environment objects page by page, as each response arrives.
+
+        :param environment_id: id of the environment
+        :param workspace_id: id of the workspace
+        :param offset: starting position for pagination (default: 0)
+        :param limit: maximum number of items per page (default: 50)
+        :returns: generator of RuleBasedSegment in environment objects
+        :rtype: generator(RuleBasedSegmentDefinition)
+        '''
+        def fetch_page(current_offset):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 workspaceId = workspace_id,
                 environmentId = environment_id,
                 offset = current_offset,
                 limit = limit
             )
-            
-            # Process the current page of results
-            current_page_items = []
-            if isinstance(response, list):
-                for item in response:
-                    item['environment'] = {'id':environment_id, 'name':''}
-                    current_page_items.append(RuleBasedSegmentDefinition(item, self._http_client, workspace_id=workspace_id))
-            
-            # Add current page items to the full list
-            segment_definition_list.extend(current_page_items)
-            
-            # If we reached the end
-            # (fewer items than limit), then break the loop
-            # or if we have more than limit items, then the pagination logic isn't implemented yet at the api
-            if len(current_page_items) < limit or len(current_page_items) > limit:
-                break
-                
-            # Otherwise move to the next page
-            current_offset += limit
-            
-        return segment_definition_list
+
+        # Paging stops when a page has fewer items than limit, or more than limit
+        # (in which case the pagination logic isn't implemented yet at the api)
+        for page in limit_pages(fetch_page, limit, offset):
+            for item in page:
+                item['environment'] = {'id':environment_id, 'name':''}
+                yield RuleBasedSegmentDefinition(item, self._http_client, workspace_id=workspace_id)
 
     def find(self, segment_name, environment_id, workspace_id):
         '''
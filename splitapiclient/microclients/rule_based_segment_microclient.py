@@ -4,6 +4,8 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import limit_pages
+from splitapiclient.util.lookup import find_by_name
 
 class RuleBasedSegmentMicroClient:
     '''
@@ -67,11 +69,14 @@ class RuleBasedSegmentMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache holding the name index used by find() (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
 
     def list(self, workspace_id, offset=0, limit=50):
         '''
@@ -83,35 +88,44 @@ class RuleBasedSegmentMicroClient:
         :returns: list of RuleBasedSegment objects
         :rtype: list(RuleBasedSegment)
         '''
-        segment_list = []
-        current_offset = offset
-        
-        while True:
-            response = self._http_client.make_request(
+        return [item for item in self.iter_list(workspace_id, offset, limit)]
+
+    def iter_raw(self, workspace_id, offset=0, limit=50):
+        '''
+        Yields RuleBasedSegment items as returned by the API (dicts), page by page.
+
+        :param workspace_id: id of the workspace
+        :param offset: starting position for pagination (default: 0)
+        :param limit: maximum number of items per page (default: 50)
+        :returns: generator of dicts
+        :rtype: generator(dict)
+        '''
+        def fetch_page(current_offset):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 workspaceId = workspace_id,
                 offset = current_offset,
                 limit = limit
             )
-            
-            # Process the current page of results
-            current_page_items = []
-            if isinstance(response, list):
-                for item in response:
-                    current_page_items.append(RuleBasedSegment(item, self._http_client))
-            
-            # Add current page items to the full list
-            segment_list.extend(current_page_items)
-            
-            # If we reached the end (fewer items than limit), then break the loop
-            # or if we have more than limit items, then the pagination logic isn't implemented yet at the api
-            if len(current_page_items) < limit or len(current_page_items) > limit:
-                break
-                
-            # Otherwise move to the next page
-            current_offset += limit
-            
-        return segment_list
+
+        # Paging stops when a page has fewer items than limit, or more than limit
+        # (in which case the pagination logic isn't implemented yet at the api)
+        for page in limit_pages(fetch_page, limit, offset):
+            for item in page:
+                yield as_dict(item)
+
+    def iter_list(self, workspace_id, offset=0, limit=50):
+        '''
+        Yields RuleBasedSegment objects page by page, as each response arrives.
+
+        :param workspace_id: id of the workspace
+        :param offset: starting position for pagination (default: 0)
+        :param limit: maximum number of items per page (default: 50)
+        :returns: generator of RuleBasedSegment objects
+        :rtype: generator(RuleBasedSegment)
+        '''
+        for item in self.iter_raw(workspace_id, offset, limit):
+            yield RuleBasedSegment(item, self._http_client)
 
     def find(self, segment_name, workspace_id):
         '''
@@ -120,11 +134,15 @@ class RuleBasedSegmentMicroClient:
         :returns: RuleBasedSegment objects
         :rtype: RuleBasedSegment
         '''
-        for item in self.list(workspace_id):
-            if item.name == segment_name:
-                return item
-        LOGGER.error("RuleBasedSegment Name does not exist")
-        return None
+        item = find_by_name(
+            segment_name,
+            lambda: self.iter_list(workspace_id),
+            self._cache,
+            ('rule_based_segments', workspace_id)
+        )
+        if item is None:
+            LOGGER.error("RuleBasedSegment Name does not exist")
+        return item
 
     def add(self, segment, traffic_type_name, workspace_id):
         '''
@@ -142,6 +160,8 @@ class RuleBasedSegmentMicroClient:
             workspaceId = workspace_id,
             trafficTypeName = traffic_type_name
         )
+        if self._cache is not None:
+            self._cache.invalidate(('rule_based_segments', workspace_id))
         response['workspaceId'] = workspace_id
         return RuleBasedSegment(response, self._http_client)
 
@@ -159,6 +179,8 @@ class RuleBasedSegmentMicroClient:
             workspaceId = workspace_id,
             segmentName = segment_name
         )
+        if self._cache is not None:
+            self._cache.invalidate(('rule_based_segments', workspace_id))
         return response
 
     def add_to_environment(self, segment_name, environment_id, workspace_id=None):
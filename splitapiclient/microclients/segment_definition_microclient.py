@@ -1,8 +1,23 @@
+import csv
+import os
+from itertools import chain
 from splitapiclient.resources import SegmentDefinition
 from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import offset_pages
+from splitapiclient.util.lookup import find_by_name
+from splitapiclient.util.bulk import iter_batches, run_batches, \
+    DEFAULT_BULK_WORKERS
+from splitapiclient.util.bulk_result import BulkOperationResult
+from splitapiclient.util.keys import iter_keys_from_file, dedupe_keys, \
+    DEFAULT_DEDUPE_WINDOW, DEFAULT_DIFF_MEMORY_KEYS, ExportCheckpoint, diff_keys
+
+IMPORT_BATCH_SIZE = 10000
+EXPORT_CHECKPOINT_PAGES = 10
+CHECKPOINT_SUFFIX = '.checkpoint'
+
 
 class SegmentDefinitionMicroClient:
     '''
@@ -54,86 +69,192 @@ class SegmentDefinitionMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache holding the name index used by find() (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
 
-    def list(self, environment_id, workspace_id):
+    def list(self, environment_id, workspace_id, parallel=False):
         '''
         Returns a list of Segment in environemnt objects.
 
-        :returns: list of Segment in environemnt objects
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: list of SegmentDefinition objects
         :rtype: list(SegmentDefinition)
         '''
-        offset_val = 0
-        final_list = []
-        while True:
-            response = self._http_client.make_request(
+        return [item for item in self.iter_list(environment_id, workspace_id, parallel)]
+
+    def iter_raw(self, environment_id, workspace_id, parallel=False):
+        '''
+        Yields Segment in environment items as returned by the API (dicts), page by page.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of dicts
+        :rtype: generator(dict)
+        '''
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 workspaceId = workspace_id,
                 environmentId = environment_id,
                 offset = offset_val
             )
-            for item in response['objects']:
-                final_list.append(as_dict(item))
-            offset = int(response['offset'])
-            totalCount = int(response['totalCount'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        segment_definition_list = []
-        for item in final_list:
+
+        for page in offset_pages(fetch_page, parallel=parallel):
+            for item in page:
+                yield as_dict(item)
+
+    def iter_list(self, environment_id, workspace_id, parallel=False):
+        '''
+        Yields Segment in environment objects page by page, as each response arrives.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of SegmentDefinition objects
+        :rtype: generator(SegmentDefinition)
+        '''
+        for item in self.iter_raw(environment_id, workspace_id, parallel):
             item['environment'] = {'id':environment_id, 'name':''}
-            segment_definition_list.append(SegmentDefinition(item, self._http_client))
-        return segment_definition_list
+            yield SegmentDefinition(item, self._http_client)
 
     def find(self, segment_name, environment_id, workspace_id):
         '''
         Find Segment in environment list objects.
+        There is no single segment GET, so the listing is scanned until the
+        segment is found or, when the microclient has a cache, indexed once
+        by name and reused.
 
         :returns: SegmentDefinition object
         :rtype: SegmentDefinition
         '''
-        for item in self.list(environment_id, workspace_id):
-            if item.name == segment_name:
-                return item
-        LOGGER.error("Segment Definition Name does not exist")
-        return None
+        item = find_by_name(
+            segment_name,
+            lambda: self.iter_list(environment_id, workspace_id),
+            self._cache,
+            ('segment_definitions', environment_id, workspace_id)
+        )
+        if item is None:
+            LOGGER.error("Segment Definition Name does not exist")
+        return item
 
-    def get_keys(self, segment_name, environment_id):
+    def get_keys(self, segment_name, environment_id, parallel=False):
         '''
         Returns a list of Keys in Segment in environemnt objects.
 
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
         :returns: list of keys in Segment in environemnt objects
         :rtype: list(string)
         '''
-        offset_val = 0
-        final_list = []
-        while True:
-            response = self._http_client.make_request(
+        return [key for key in self.iter_keys(segment_name, environment_id, parallel)]
+
+    def iter_keys(self, segment_name, environment_id, parallel=False, offset=0):
+        '''
+        Yields the keys in Segment in environment page by page, as each
+        response arrives, so that only one page is held in memory at a time.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :param offset: position of the first key to return
+        :returns: generator of keys in Segment in environemnt objects
+        :rtype: generator(string)
+        '''
+        for page in self.iter_key_pages(segment_name, environment_id, parallel, offset):
+            for key in page:
+                yield key
+
+    def iter_key_pages(self, segment_name, environment_id, parallel=False, offset=0):
+        '''
+        Yields the keys in Segment in environment as one list per page.
+        Pages are contiguous, so the offset of the next page is `offset`
+        plus the number of keys yielded so far.
+
+        :param parallel: fetch the pages after the first one concurrently,
+            based on the key count of the first response (True, or the
+            number of workers to use)
+        :param offset: position of the first key to return
+        :returns: generator of lists of keys
+        :rtype: generator(list(string))
+        '''
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['get_keys'],
                 environmentId = environment_id,
                 segmentName = segment_name,
                 offset = offset_val
             )
-            for item in response['keys']:
-                final_list.append(as_dict(item))
-            offset = int(response['offset'])
-            totalCount = int(response['count'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        return [item["key"] for item in final_list]
 
+        for page in offset_pages(fetch_page, items_key='keys', total_key='count',
+                                 parallel=parallel, start=offset):
+            yield [item['key'] for item in page]
+
+    def export_keys_to_csv(self, segment_name, environment_id, csv_file_name,
+                           parallel=False, resume=False,
+                           checkpoint_every=EXPORT_CHECKPOINT_PAGES):
+        '''
+        Writes the keys in Segment in environment to a csv file, one page
+        at a time as responses arrive. Progress is recorded every
+        `checkpoint_every` pages in `<csv_file_name>.checkpoint`, so that an
+        interrupted export can be resumed with `resume=True` from the last
+        recorded offset. The checkpoint is removed once the export completes.
 
+        :param csv_file_name: path of the csv file to write
+        :param parallel: fetch pages concurrently (True, or the number of
+            workers to use)
+        :param resume: continue from the checkpoint left by a previous
+            export of the same segment, if any
+        :param checkpoint_every: pages written between checkpoints
+
+        :returns: number of keys written by this call
+        :rtype: integer
+        '''
+        checkpoint = ExportCheckpoint(csv_file_name + CHECKPOINT_SUFFIX)
+        state = checkpoint.load() if resume else None
+        if state is not None and (state.get('segment') != segment_name or
+                                  state.get('environment') != environment_id):
+            LOGGER.warning('Ignoring checkpoint of a different segment export')
+            state = None
+        if state is not None and (not os.path.exists(csv_file_name) or
+                                  os.path.getsize(csv_file_name) < state['bytes']):
+            LOGGER.warning('The csv file of the checkpoint is missing or incomplete, '
+                           'starting the export over')
+            checkpoint.remove()
+            state = None
+
+        offset = 0
+        mode = 'w'
+        if state is not None:
+            offset = state['offset']
+            # Drop anything written after the last checkpoint
+            with open(csv_file_name, mode='r+b') as keysFile:
+                keysFile.truncate(state['bytes'])
+            mode = 'a'
+            LOGGER.info('Resuming export of %s at offset %d' % (segment_name, offset))
+
+        written = 0
+        with open(csv_file_name, mode=mode) as keysFile:
+            keysWriter = csv.writer(keysFile,  delimiter=',',
+                            quotechar='|', quoting=csv.QUOTE_MINIMAL)
+            pages = self.iter_key_pages(segment_name, environment_id, parallel, offset)
+            for count, page in enumerate(pages, 1):
+                keysWriter.writerows([key] for key in page)
+                written += len(page)
+                if count % checkpoint_every == 0:
+                    keysFile.flush()
+                    checkpoint.save({
+                        'segment': segment_name,
+                        'environment': environment_id,
+                        'offset': offset + written,
+                        'bytes': keysFile.tell(),
+                    })
+        checkpoint.remove()
+        return written
 
     def get_key_count(self, segment_name, environment_id):
         '''
@@ -171,6 +292,158 @@ class SegmentDefinitionMicroClient:
         )
         return True
 
+    def bulk_import_keys(self, segment_name, environment_id, keys,
+                         replace_keys=False, data=None,
+                         batch_size=IMPORT_BATCH_SIZE,
+                         max_workers=DEFAULT_BULK_WORKERS):
+        '''
+        Imports any number of keys into a segment in batches of `batch_size`
+        keys. When `replace_keys` is set, the first batch replaces the
+        segment's keys and is uploaded alone; the remaining batches are
+        appended concurrently over a bounded pool. If the replacing batch
+        fails, nothing else is uploaded and the result is marked as aborted.
+
+        :param keys: iterable of keys. Generators are consumed lazily, so
+            the whole key set never has to be in memory.
+        :param replace_keys: replace the segment's keys instead of adding
+        :param data: extra body fields sent with every batch (e.g. comment)
+        :param batch_size: keys per request (the API accepts up to 10,000)
+        :param max_workers: number of batches uploaded concurrently
+
+        :returns: per batch report. Failed batches keep their keys and
+            input ranges so they can be retried.
+        :rtype: BulkOperationResult
+        '''
+        base = {k: v for k, v in as_dict(data or {}).items() if k != 'keys'}
+
+        def upload(index, batch):
+            body = dict(base)
+            body['keys'] = batch
+            return self.import_keys_from_json(
+                segment_name, environment_id, replace_keys and index == 0, body
+            )
+
+        batches = iter_batches(keys, batch_size)
+        if replace_keys:
+            # Replacing with no keys still has to clear the segment
+            batches = chain([next(batches, (0, []))], batches)
+        return run_batches(
+            batches, upload,
+            max_workers=max_workers, first_alone=replace_keys
+        )
+
+    def import_keys_from_file(self, segment_name, environment_id, path,
+                              format=None, replace_keys=False, data=None,
+                              column=0, field='key',
+                              dedupe_window=DEFAULT_DEDUPE_WINDOW,
+                              batch_size=IMPORT_BATCH_SIZE,
+                              max_workers=DEFAULT_BULK_WORKERS):
+        '''
+        Imports the keys stored in a csv, ndjson or txt file. The file is
+        parsed as a stream, de-duplicated with bounded memory and fed to
+        bulk_import_keys batch by batch, so its size isn't limited by the
+        available memory.
+
+        :param path: path of the key file
+        :param format: 'csv', 'ndjson' or 'txt' (inferred from the
+            extension when omitted)
+        :param replace_keys: replace the segment's keys instead of adding
+        :param data: extra body fields sent with every batch (e.g. comment)
+        :param column: csv column holding the keys (index or header name)
+        :param field: ndjson object field holding the key
+        :param dedupe_window: number of distinct keys remembered to drop
+            duplicates (None for exact de-duplication)
+        :param batch_size: keys per request
+        :param max_workers: number of batches uploaded concurrently
+
+        :returns: per batch report, ranges refer to de-duplicated keys
+        :rtype: BulkOperationResult
+        '''
+        keys = dedupe_keys(
+            iter_keys_from_file(path, format, column=column, field=field),
+            window=dedupe_window
+        )
+        return self.bulk_import_keys(
+            segment_name, environment_id, keys, replace_keys=replace_keys,
+            data=data, batch_size=batch_size, max_workers=max_workers
+        )
+
+    def bulk_remove_keys(self, segment_name, environment_id, keys, data=None,
+                         batch_size=IMPORT_BATCH_SIZE,
+                         max_workers=DEFAULT_BULK_WORKERS):
+        '''
+        Removes any number of keys from a segment in batches of
+        `batch_size` keys, sent concurrently over a bounded pool.
+
+        :param keys: iterable of keys, consumed lazily
+        :param data: extra body fields sent with every batch (e.g. comment)
+        :param batch_size: keys per request
+        :param max_workers: number of batches sent concurrently
+
+        :returns: per batch report with the failed key ranges
+        :rtype: BulkOperationResult
+        '''
+        base = {k: v for k, v in as_dict(data or {}).items() if k != 'keys'}
+
+        def remove(index, batch):
+            body = dict(base)
+            body['keys'] = batch
+            return self.remove_keys(segment_name, environment_id, body)
+
+        return run_batches(
+            iter_batches(keys, batch_size), remove, max_workers=max_workers
+        )
+
+    def sync_keys(self, segment_name, environment_id, desired_keys, data=None,
+                  parallel=False, batch_size=IMPORT_BATCH_SIZE,
+                  max_workers=DEFAULT_BULK_WORKERS,
+                  max_keys_in_memory=DEFAULT_DIFF_MEMORY_KEYS):
+        '''
+        Makes the segment's keys in environment equal to `desired_keys`
+        sending only the difference: the current keys are streamed from the
+        server, diffed against the desired ones (spilling to temporary files
+        when they don't fit in `max_keys_in_memory`) and only the missing
+        keys are uploaded and the extra keys removed.
+
+        :param desired_keys: iterable of keys the segment should hold
+        :param data: extra body fields sent with every batch (e.g. comment)
+        :param parallel: fetch the current keys concurrently (True, or the
+            number of workers to use)
+        :param batch_size: keys per request
+        :param max_workers: number of batches sent concurrently
+        :param max_keys_in_memory: keys held in memory while diffing
+
+        :returns: combined per batch report. metadata holds the 'added',
+            'removed' and 'unchanged' key counts and the separate 'add' and
+            'remove' reports, whose failed_items() can be retried with
+            bulk_import_keys and bulk_remove_keys.
+        :rtype: BulkOperationResult
+        '''
+        current = self.iter_keys(segment_name, environment_id, parallel=parallel)
+        with diff_keys(current, desired_keys, max_keys_in_memory) as diff:
+            LOGGER.info('Syncing segment %s: %d keys to add, %d to remove, %d unchanged' % (
+                segment_name, len(diff.to_add), len(diff.to_remove), diff.unchanged
+            ))
+            added = self.bulk_import_keys(
+                segment_name, environment_id, diff.to_add, data=data,
+                batch_size=batch_size, max_workers=max_workers
+            )
+            removed = self.bulk_remove_keys(
+                segment_name, environment_id, diff.to_remove, data=data,
+                batch_size=batch_size, max_workers=max_workers
+            )
+            return BulkOperationResult(
+                successful=added.successful + removed.successful,
+                failed=added.failed + removed.failed,
+                metadata={
+                    'added': len(diff.to_add),
+                    'removed': len(diff.to_remove),
+                    'unchanged': diff.unchanged,
+                    'add': added,
+                    'remove': removed,
+                }
+            )
+
     def remove_keys(self, segment_name, environment_id, data):
         '''
         remove keys from csv file into segment
@@ -4,6 +4,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import offset_pages
 
 class SegmentMicroClient:
     '''
@@ -66,38 +67,72 @@ class SegmentMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache shared with the segment definition microclient, whose
+            name indexes are dropped when segments are deleted or moved
+            between environments (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
 
-    def list(self, workspace_id):
+    def _invalidate_definitions(self, environment_id=None, workspace_id=None):
+        '''
+        Drops the cached segment definition name indexes of an environment or a
+        workspace.
+        '''
+        if self._cache is None:
+            return
+        self._cache.invalidate_where(
+            lambda key: key[0] == 'segment_definitions' and
+            (environment_id is None or key[1] == environment_id) and
+            (workspace_id is None or key[2] == workspace_id)
+        )
+
+    def list(self, workspace_id, parallel=False):
         '''
         Returns a list of Segment objects.
 
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
         :returns: list of Segment objects
         :rtype: list(Segment)
         '''
-        offset_val = 0
-        final_list = []
-        while True:
-            response = self._http_client.make_request(
+        return [item for item in self.iter_list(workspace_id, parallel)]
+
+    def iter_raw(self, workspace_id, parallel=False):
+        '''
+        Yields Segment items as returned by the API (dicts), page by page.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of dicts
+        :rtype: generator(dict)
+        '''
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 workspaceId = workspace_id,
                 offset = offset_val
             )
-            for item in response['objects']:
-                final_list.append(as_dict(item))
-            offset = int(response['offset'])
-            totalCount = int(response['totalCount'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        return [Segment(item, self._http_client) for item in final_list]
+
+        for page in offset_pages(fetch_page, parallel=parallel):
+            for item in page:
+                yield as_dict(item)
+
+    def iter_list(self, workspace_id, parallel=False):
+        '''
+        Yields Segment objects page by page, as each response arrives.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of Segment objects
+        :rtype: generator(Segment)
+        '''
+        for item in self.iter_raw(workspace_id, parallel):
+            yield Segment(item, self._http_client)
 
     def find(self, segment_name, workspace_id):
         '''
@@ -145,6 +180,7 @@ class SegmentMicroClient:
             workspaceId = workspace_id,
             segmentName = segment_name
         )
+        self._invalidate_definitions(workspace_id=workspace_id)
         return response
 
     def add_to_environment(self, segment_name, environment_id):
@@ -162,6 +198,7 @@ class SegmentMicroClient:
             segmentName = segment_name,
             environmentId = environment_id
         )
+        self._invalidate_definitions(environment_id)
         return SegmentDefinition(response, self._http_client)
 
     def remove_from_environment(self, segment_name, environment_id):
@@ -179,4 +216,5 @@ class SegmentMicroClient:
             segmentName = segment_name,
             environmentId = environment_id
         )
+        self._invalidate_definitions(environment_id)
         return response
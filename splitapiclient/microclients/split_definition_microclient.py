@@ -1,8 +1,16 @@
 from splitapiclient.resources import SplitDefinition
+from splitapiclient.microclients.split_microclient import SplitMicroClient
 from splitapiclient.util.exceptions import HTTPNotFoundError, HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import offset_pages
+from splitapiclient.util.bulk import run_each, is_rate_limited, \
+    DEFAULT_BULK_WORKERS, DEFAULT_WRITE_ATTEMPTS
+from splitapiclient.util.deadline import request_options
+from splitapiclient.util.sync import DefinitionSyncState
+
+MAX_KILL_WORKERS = 32
 
 class SplitDefinitionMicroClient:
     '''
@@ -65,52 +73,74 @@ class SplitDefinitionMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
         '''
         self._http_client = http_client
+        self._cache = cache
+
+    def _invalidate(self, environment_id, workspace_id):
+        '''
+        Drops the cached definitions of an environment after a write, so
+        lookups such as kill_many's flag set resolution see the change.
+        '''
+        if self._cache is not None:
+            self._cache.invalidate(('split_definitions', environment_id, workspace_id))
 
-    def list(self, environment_id, workspace_id):
+    def list(self, environment_id, workspace_id, parallel=False):
         '''
         Returns a list of Split definitions objects.
 
-        :returns: list of Split definitions objects
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: list of SplitDefinition objects
         :rtype: list(SplitDefinition)
         '''
-        offset_val = 0
-        final_list = []
-        while True:
-            response = self._http_client.make_request(
+        return [item for item in self.iter_list(environment_id, workspace_id, parallel)]
+
+    def iter_raw(self, environment_id, workspace_id, parallel=False):
+        '''
+        Yields Split definitions items as returned by the API (dicts), page by page.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of dicts
+        :rtype: generator(dict)
+        '''
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 workspaceId = workspace_id,
                 environmentId = environment_id,
                 offset = offset_val
             )
-            for item in response['objects']:
-                final_list.append(as_dict(item))
-            offset = int(response['offset'])
-            totalCount = int(response['totalCount'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        return [SplitDefinition(item, environment_id, workspace_id, self._http_client) for item in final_list]
+
+        for page in offset_pages(fetch_page, parallel=parallel):
+            for item in page:
+                yield as_dict(item)
+
+    def iter_list(self, environment_id, workspace_id, parallel=False):
+        '''
+        Yields Split definitions objects page by page, as each response arrives.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of SplitDefinition objects
+        :rtype: generator(SplitDefinition)
+        '''
+        for item in self.iter_raw(environment_id, workspace_id, parallel):
+            yield SplitDefinition(item, environment_id, workspace_id, self._http_client)
 
     def find(self, split_name, environment_id, workspace_id):
         '''
         Find Split definition in environment objects.
+        The definition is fetched with a single GET, see get_definition.
 
         :returns: SplitDefinition object
         :rtype: SplitDefinition
         '''
-        for item in self.list(environment_id, workspace_id):
-            if item.name == split_name:
-                return item
-        LOGGER.error("Split Name does not exist")
-        return None
+        return self.get_definition(split_name, environment_id, workspace_id)
 
     def get_definition(self, split_name, environment_id, workspace_id):
         '''
@@ -149,8 +179,35 @@ class SplitDefinitionMicroClient:
             workspaceId = workspace_id,
             splitName = split_name
         )
+        self._invalidate(environment_id, workspace_id)
         return SplitDefinition(response, environment_id, workspace_id, self._http_client)
 
+    def update_definitions(self, updates, workspace_id,
+                           max_workers=DEFAULT_BULK_WORKERS,
+                           attempts=DEFAULT_WRITE_ATTEMPTS):
+        '''
+        update many split definitions concurrently, e.g. to promote a
+        release across flags and environments
+
+        :param updates: iterable of (split name, environment id, new
+            definition) tuples
+        :param workspace_id: workspace id
+        :param max_workers: number of updates sent concurrently
+        :param attempts: runs per update when it is still rate limited once
+            the http client's retry policy gives up
+
+        :returns: per update report; ItemResult values are the updated
+            SplitDefinition objects
+        :rtype: BulkOperationResult
+        '''
+        return run_each(
+            updates,
+            lambda update: self.update_definition(
+                update[0], update[1], workspace_id, update[2]
+            ),
+            max_workers=max_workers, attempts=attempts, retryable=is_rate_limited
+        )
+
     def kill(self, split_name, environment_id, workspace_id):
         '''
         kill a split
@@ -167,6 +224,7 @@ class SplitDefinitionMicroClient:
             workspaceId = workspace_id,
             splitName = split_name
         )
+        self._invalidate(environment_id, workspace_id)
         return response
 
     def restore(self, split_name, environment_id, workspace_id):
@@ -185,4 +243,157 @@ class SplitDefinitionMicroClient:
             workspaceId = workspace_id,
             splitName = split_name
         )
+        self._invalidate(environment_id, workspace_id)
         return response
+
+    def sync(self, environment_ids, workspace_id, state=None, parallel=False,
+             max_workers=DEFAULT_BULK_WORKERS):
+        '''
+        Returns only the definitions added, changed or removed in each
+        environment since the previous call with the same state. The API
+        can't filter by update time, so every definition is still fetched
+        (environments are listed concurrently); only the diff is
+        incremental. Definitions whose lastUpdateTime is unchanged are
+        skipped without hashing them, and lastTrafficReceivedAt updates are
+        not reported as changes.
+
+        :param environment_ids: environment id or list of environment ids
+        :param workspace_id: workspace id
+        :param state: DefinitionSyncState updated in place (a new one is
+            created when omitted, reporting every definition as added).
+            Persist it between runs with state.save(path).
+        :param parallel: fetch each environment's pages concurrently
+        :param max_workers: number of environments fetched concurrently
+
+        :returns: (changes per environment id, state). Environments that
+            couldn't be listed are left out and keep their previous state.
+        :rtype: tuple(dict(DefinitionChanges), DefinitionSyncState)
+        '''
+        if isinstance(environment_ids, str):
+            environment_ids = [environment_ids]
+        if state is None:
+            state = DefinitionSyncState()
+
+        def fetch(environment_id):
+            return [
+                (item, SplitDefinition(dict(item), environment_id, workspace_id, self._http_client))
+                for item in self.iter_raw(environment_id, workspace_id, parallel)
+            ]
+
+        result = run_each(environment_ids, fetch, max_workers=max_workers)
+        for failed in result.failed:
+            LOGGER.error('Could not sync split definitions of environment %s: %s'
+                         % (failed.item, failed.error))
+        changes = {
+            fetched.item: state.apply(fetched.item, fetched.value)
+            for fetched in result.successful
+        }
+        return changes, state
+
+    def _definitions(self, environment_id, workspace_id):
+        '''
+        Returns the Split definitions in environment, from the lookup cache
+        when it is enabled.
+        '''
+        if self._cache is None:
+            return self.list(environment_id, workspace_id, parallel=True)
+        return self._cache.get_or_load(
+            ('split_definitions', environment_id, workspace_id),
+            lambda: self.list(environment_id, workspace_id, parallel=True)
+        )
+
+    def resolve_targets(self, workspace_id, environment_ids, names=None,
+                        tags=None, flag_sets=None):
+        '''
+        Resolves a flag selector into (split name, environment id) pairs.
+
+        :param workspace_id: workspace id
+        :param environment_ids: environment id or list of environment ids
+        :param names: split names
+        :param tags: split tags; splits having any of them are selected
+        :param flag_sets: flag set names; splits in any of them (in each
+            environment) are selected
+
+        :returns: sorted (split name, environment id) pairs
+        :rtype: list(tuple)
+        '''
+        if isinstance(environment_ids, str):
+            environment_ids = [environment_ids]
+        selected = set(names or [])
+        if tags:
+            selected.update(
+                split.name for split in
+                SplitMicroClient(self._http_client).iter_list(workspace_id, tags, parallel=True)
+            )
+        targets = set()
+        for environment_id in environment_ids:
+            targets.update((name, environment_id) for name in selected)
+            if flag_sets:
+                targets.update(
+                    (definition.name, environment_id)
+                    for definition in self._definitions(environment_id, workspace_id)
+                    if any(fs.name in flag_sets for fs in definition.flag_sets or [])
+                )
+        return sorted(targets)
+
+    def _fan_out(self, operation, workspace_id, environment_ids, names, tags,
+                 flag_sets, max_workers, attempts):
+        '''
+        Runs operation on every resolved target at once, skipping the client
+        side rate limiter.
+        '''
+        targets = self.resolve_targets(
+            workspace_id, environment_ids, names, tags, flag_sets
+        )
+        if not targets:
+            LOGGER.warning('No splits matched the selector')
+        with request_options(priority=True):
+            result = run_each(
+                targets,
+                lambda target: operation(target[0], target[1], workspace_id),
+                max_workers=max(1, min(max_workers, len(targets))),
+                attempts=attempts, retryable=is_rate_limited
+            )
+        return result
+
+    def kill_many(self, workspace_id, environment_ids, names=None, tags=None,
+                  flag_sets=None, max_workers=MAX_KILL_WORKERS,
+                  attempts=DEFAULT_WRITE_ATTEMPTS):
+        '''
+        kill many splits in one or more environments at once. Targets are
+        the given split names plus the splits matching the tags and flag
+        sets; all kills are sent concurrently, bypassing the client side
+        rate limiter.
+
+        :param workspace_id: workspace id
+        :param environment_ids: environment id or list of environment ids
+        :param names: split names
+        :param tags: split tags
+        :param flag_sets: flag set names
+        :param max_workers: maximum number of kills in flight
+        :param attempts: runs per kill when it is still rate limited once
+            the http client's retry policy gives up. Each run already
+            retries on its own, so keep it small.
+
+        :returns: per (split name, environment id) report with timings
+        :rtype: BulkOperationResult
+        '''
+        return self._fan_out(
+            self.kill, workspace_id, environment_ids, names, tags, flag_sets,
+            max_workers, attempts
+        )
+
+    def restore_many(self, workspace_id, environment_ids, names=None, tags=None,
+                     flag_sets=None, max_workers=MAX_KILL_WORKERS,
+                     attempts=DEFAULT_WRITE_ATTEMPTS):
+        '''
+        restore many killed splits in one or more environments at once, see
+        kill_many.
+
+        :returns: per (split name, environment id) report with timings
+        :rtype: BulkOperationResult
+        '''
+        return self._fan_out(
+            self.restore, workspace_id, environment_ids, names, tags, flag_sets,
+            max_workers, attempts
+        )
@@ -1,8 +1,12 @@
 from splitapiclient.resources import Split
-from splitapiclient.util.exceptions import HTTPResponseError, \
+from splitapiclient.util.exceptions import HTTPNotFoundError, HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import offset_pages
+from splitapiclient.util.lookup import find_by_name
+from splitapiclient.util.bulk import run_each, is_rate_limited, \
+    DEFAULT_BULK_WORKERS, DEFAULT_WRITE_ATTEMPTS
 from splitapiclient.resources import SplitDefinition
 
 
@@ -100,55 +104,98 @@ class SplitMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache shared with the split definitions
+            microclient; its cached definitions are dropped after writes
+            that change them (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
+
+    def _invalidate_definitions(self, workspace_id, environment_id=None):
+        '''
+        Drops the cached split definitions of an environment, or of every
+        environment of the workspace, after a write.
+        '''
+        if self._cache is None:
+            return
+        if environment_id is not None:
+            self._cache.invalidate(('split_definitions', environment_id, workspace_id))
+        else:
+            self._cache.invalidate_where(
+                lambda key: key[0] == 'split_definitions' and key[2:] == (workspace_id,)
+            )
 
-    def list(self, workspace_id, tags = []):
+    def list(self, workspace_id, tags = [], parallel=False):
         '''
         Returns a list of Split objects.
 
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
         :returns: list of Split objects
         :rtype: list(Split)
         '''
-        offset_val = 0
-        final_list = []
+        return [item for item in self.iter_list(workspace_id, tags, parallel)]
+
+    def iter_raw(self, workspace_id, tags = [], parallel=False):
+        '''
+        Yields Split items as returned by the API (dicts), page by page.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of dicts
+        :rtype: generator(dict)
+        '''
         tags_list = ""
         for tag in tags:
             tags_list = tags_list + "&tag=" + tag
-        while True:
-            response = self._http_client.make_request(
+
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 workspaceId = workspace_id,
                 offset = offset_val,
                 tags = tags_list
             )
-            for item in response['objects']:
-                final_list.append(as_dict(item))
-            offset = int(response['offset'])
-            totalCount = int(response['totalCount'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        return [Split(item, workspace_id, self._http_client) for item in final_list]
+
+        for page in offset_pages(fetch_page, parallel=parallel):
+            for item in page:
+                yield as_dict(item)
+
+    def iter_list(self, workspace_id, tags = [], parallel=False):
+        '''
+        Yields Split objects page by page, as each response arrives.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of Split objects
+        :rtype: generator(Split)
+        '''
+        for item in self.iter_raw(workspace_id, tags, parallel):
+            yield Split(item, workspace_id, self._http_client)
 
     def find(self, split_name, workspace_id, tags = []):
         '''
         Find Split in workspace objects.
+        Without tags the split is fetched with a single GET. When tags are
+        given, the tagged listing is scanned until the split is found.
 
         :returns: Split object
         :rtype: Split
         '''
-        for item in self.list(workspace_id, tags):
-            if item.name == split_name:
-                return item
-        LOGGER.error("Split Name does not exist")
-        return None
+        if not tags:
+            try:
+                return self.get(split_name, workspace_id)
+            except HTTPNotFoundError:
+                LOGGER.error("Split Name does not exist")
+                return None
+        item = find_by_name(split_name, lambda: self.iter_list(workspace_id, tags))
+        if item is None:
+            LOGGER.error("Split Name does not exist")
+        return item
 
     def get(self, split_name, workspace_id):
         '''
@@ -201,6 +248,7 @@ class SplitMicroClient:
             workspaceId = workspace_id,
             splitName = split_name
         )
+        self._invalidate_definitions(workspace_id)
         return response
 
     def update_description(self, split_name, new_description, workspace_id):
@@ -238,8 +286,36 @@ class SplitMicroClient:
             environmentId = environment_id,
             splitName = split_name
         )
+        self._invalidate_definitions(workspace_id, environment_id)
         return SplitDefinition(response, environment_id, workspace_id, self._http_client)
 
+    def add_to_environments(self, additions, workspace_id,
+                            max_workers=DEFAULT_BULK_WORKERS,
+                            attempts=DEFAULT_WRITE_ATTEMPTS):
+        '''
+        Add many splits to environments concurrently. Each addition is a
+        POST, so it is sent once (plus the retry policy's retries); timeouts
+        and server errors are never repeated here.
+
+        :param additions: iterable of (split name, environment id,
+            definition) tuples
+        :param workspace_id: workspace id
+        :param max_workers: number of requests sent concurrently
+        :param attempts: runs per item when it is still rate limited once
+            the http client's retry policy gives up
+
+        :returns: per item report; ItemResult values are the created
+            SplitDefinition objects
+        :rtype: BulkOperationResult
+        '''
+        return run_each(
+            additions,
+            lambda addition: self.add_to_environment(
+                addition[0], addition[1], workspace_id, addition[2]
+            ),
+            max_workers=max_workers, attempts=attempts, retryable=is_rate_limited
+        )
+
     def remove_from_environment(self, split_name, environment_id,comment, title, workspace_id ):
         '''
         Remove split from environment
@@ -258,6 +334,7 @@ class SplitMicroClient:
             comment = comment, 
             title = title
         )
+        self._invalidate_definitions(workspace_id, environment_id)
         return response
 
     def associate_tags(self, split_name, tags, workspace_id):
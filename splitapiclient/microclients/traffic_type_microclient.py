@@ -32,11 +32,15 @@ class TrafficTypeMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache used to resolve names in find() without
+            listing the workspace's traffic types each time (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
 
     def list(self, workspace_id):
         '''
@@ -51,6 +55,15 @@ class TrafficTypeMicroClient:
         )
         return [TrafficType(item, workspace_id, self._http_client) for item in response]
 
+    def _fetch_all(self, workspace_id):
+        '''
+        Returns the raw traffic type items of a workspace.
+        '''
+        return self._http_client.make_request(
+            self._endpoint['all_items'],
+            workspaceId = workspace_id
+        )
+
     def find(self, traffic_type_name, workspace_id):
         '''
         Find TrafficType in workspace
@@ -58,10 +71,12 @@ class TrafficTypeMicroClient:
         :returns: TrafficType object
         :rtype: TrafficType
         '''
-        response = self._http_client.make_request(
-            self._endpoint['all_items'],
-            workspaceId = workspace_id
-        )
+        if self._cache is None:
+            response = self._fetch_all(workspace_id)
+        else:
+            response = self._cache.get_or_load(
+                ('traffic_types', workspace_id), lambda: self._fetch_all(workspace_id)
+            )
         for item in response:
             if item['name']==traffic_type_name:
                 return TrafficType(item, workspace_id, self._http_client)
@@ -81,4 +96,7 @@ class TrafficTypeMicroClient:
             self._endpoint['delete'],
             trafficTypeId = traffic_type_id,
         )
+        if self._cache is not None:
+            # The workspace of the traffic type isn't known here
+            self._cache.invalidate_where(lambda key: key[0] == 'traffic_types')
         return response
@@ -3,6 +3,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import marker_pages
 
 class UserMicroClient:
     '''
@@ -89,28 +90,30 @@ class UserMicroClient:
         :returns: list of User objects
         :rtype: list(User)
         '''
-        final_list = []
-        afterMarker = 0
-        while True:
-            if afterMarker==0:
-                response = self._http_client.make_request(
+        return [item for item in self.iter_list(status)]
+
+    def iter_list(self, status):
+        '''
+        Yields User objects page by page, as each response arrives.
+
+        :returns: generator of User objects
+        :rtype: generator(User)
+        '''
+        def fetch_page(afterMarker):
+            if afterMarker is None:
+                return self._http_client.make_request(
                     self._endpoint['list_initial'],
                     status = status
                 )
-            else:
-                response = self._http_client.make_request(
-                    self._endpoint['list_next'],
-                    status = status,
-                    after = afterMarker
-                )
-            for item in response['data']:
-                final_list.append(as_dict(item))
-            if response['nextMarker'] is None:
-                break
-            else:
-                afterMarker = response['nextMarker']
-                continue
-        return [User(item, self._http_client) for item in final_list]
+            return self._http_client.make_request(
+                self._endpoint['list_next'],
+                status = status,
+                after = afterMarker
+            )
+
+        for page in marker_pages(fetch_page):
+            for item in page:
+                yield User(as_dict(item), self._http_client)
 
     def find(self, user_email):
         '''
@@ -3,6 +3,7 @@ from splitapiclient.util.exceptions import HTTPResponseError, \
     UnknownApiClientError
 from splitapiclient.util.logger import LOGGER
 from splitapiclient.util.helpers import as_dict
+from splitapiclient.util.pagination import offset_pages
 
 
 class WorkspaceMicroClient:
@@ -66,51 +67,87 @@ class WorkspaceMicroClient:
         },
     }
 
-    def __init__(self, http_client):
+    def __init__(self, http_client, cache=None):
         '''
         Constructor
+
+        :param cache: TTLCache used to resolve names in find() without
+            listing every workspace each time (optional)
         '''
         self._http_client = http_client
+        self._cache = cache
 
-    def list(self):
+    def list(self, parallel=False):
         '''
         Returns a list of Workspaces objects.
 
-        :returns: list of Workspaces objects
-        :rtype: list(Workspaces)
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: list of Workspace objects
+        :rtype: list(Workspace)
+        '''
+        return [item for item in self.iter_list(parallel)]
+
+    def iter_list(self, parallel=False):
+        '''
+        Yields Workspace objects page by page, as each response arrives.
+
+        :param parallel: fetch the pages after the first one concurrently
+            (True, or the number of workers to use)
+        :returns: generator of Workspace objects
+        :rtype: generator(Workspace)
         '''
-        offset_val = 0
-        final_list = []
-        while True:
-            response = self._http_client.make_request(
+        for item in self._iter_items(parallel):
+            yield Workspace(item, self._http_client)
+
+    def _iter_items(self, parallel=False):
+        '''
+        Yields the raw workspace items of every page.
+        '''
+        def fetch_page(offset_val):
+            return self._http_client.make_request(
                 self._endpoint['all_items'],
                 offset = offset_val
             )
-            for item in response['objects']:
-                final_list.append(item)
-            offset = int(response['offset'])
-            totalCount = int(response['totalCount'])
-            limit = int(response['limit'])
-            if totalCount>(offset+limit):
-                offset_val = offset_val + limit
-                continue
-            else:
-                break
-        return [Workspace(item, self._http_client) for item in final_list]
-        
+
+        for page in offset_pages(fetch_page, parallel=parallel):
+            for item in page:
+                yield item
+
     def find(self, workspace_name=None):
         '''
         Search for workspace in list of Workspaces objects.
+        When the microclient has a cache, the workspace list is only
+        fetched again once its entry expires or is invalidated.
 
         :returns: workspace object
         :rtype: Workspace
         '''
-
-        for item in self.list():
-            if item.name==workspace_name:
-                return item
+        if self._cache is None:
+            items = self._iter_items()
+        else:
+            items = self._cache.get_or_load(
+                ('workspaces',), lambda: list(self._iter_items())
+            )
+        for item in items:
+            if item['name']==workspace_name:
+                return Workspace(item, self._http_client)
         LOGGER.error("Workspace Name does not exist")
         return None
+
+    def _invalidate(self, workspace_id=None):
+        '''
+        Drops the cached workspace list and, when a workspace id is given,
+        every lookup cached for that workspace, wherever the workspace id
+        sits in its key (e.g. ('segment_definitions', env, ws)).
+        '''
+        if self._cache is None:
+            return
+        self._cache.invalidate(('workspaces',))
+        if workspace_id is not None:
+            self._cache.invalidate_where(
+                lambda key: workspace_id in key[1:]
+            )
         
     def get_rollout_statuses(self, workspace_id):
         '''
@@ -139,6 +176,7 @@ class WorkspaceMicroClient:
             self._endpoint['create'],
             body=data
         )
+        self._invalidate()
         return Workspace(response, self._http_client)
 
     def update(self, workspace_id, fieldName, fieldValue):
@@ -159,6 +197,7 @@ class WorkspaceMicroClient:
             body=data,
             workspaceId = workspace_id
         )
+        self._invalidate()
         return Workspace(response, self._http_client)
 
     def delete(self, workspace_id):
@@ -174,4 +213,5 @@ class WorkspaceMicroClient:
             self._endpoint['delete'],
             workspaceId =workspace_id,
         )
+        self._invalidate(workspace_id)
         return response
@@ -69,7 +69,27 @@ class LargeSegmentDefinition(BaseResource):
         imc = require_client('LargeSegmentDefinition', self._client, apiclient)
         return imc.remove_all_members(workspaceId, self._environment['id'], self._name,  title, comment, approvers)
 
-    def submit_upload(self, title, comment, approvers,   filePath, apiclient=None):
+    def prepare_file(self, source_path, destination_path, apiclient=None, **kwargs):
+        '''
+        validate, strip and dedupe a key file into an upload ready file
+        before submitting it (see
+        LargeSegmentDefinitionMicroClient.prepare_file for the extra keyword
+        arguments)
+
+        :param source_path: csv, ndjson or txt key file
+        :param destination_path: path of the upload ready file
+        :param apiclient: If this instance wasn't returned by the client,
+            the IdentifyClient instance should be passed in order to perform the
+            http call
+
+        :returns: key counts and duplicate rate
+        :rtype: KeyFileReport
+        '''
+        imc = require_client('LargeSegmentDefinition', self._client, apiclient)
+        return imc.prepare_file(source_path, destination_path, **kwargs)
+
+    def submit_upload(self, title, comment, approvers,   filePath, apiclient=None,
+                      progress=None):
         '''
         submit a change request for large segment definition
 
@@ -81,6 +101,8 @@ class LargeSegmentDefinition(BaseResource):
         :param apiclient: If this instance wasn't returned by the client,
             the IdentifyClient instance should be passed in order to perform the
             http call
+        :param progress: callable receiving (bytes sent, total bytes) while
+            the file is uploaded
 
         :returns: ChangeRequest object
         '''
@@ -88,5 +110,5 @@ class LargeSegmentDefinition(BaseResource):
         imc = require_client('LargeSegmentDefinition', self._client, apiclient)
         result =  imc.submit_upload(workspaceId, self._environment['id'], self._name, title,comment, approvers)
         if result:
-            uploadResult =  imc.upload_file(result, filePath)
+            uploadResult =  imc.upload_file(result, filePath, progress=progress)
         return uploadResult if uploadResult else result
\ No newline at end of file
@@ -4,7 +4,6 @@ from splitapiclient.resources.base_resource import BaseResource
 from splitapiclient.util.helpers import require_client, as_dict
 from splitapiclient.resources import TrafficType
 from splitapiclient.resources import Environment
-import csv
 
 class SegmentDefinition(BaseResource):
     '''
@@ -79,30 +78,49 @@ class SegmentDefinition(BaseResource):
         imc = require_client('SegmentDefinition', self._client, apiclient)
         return imc.get_keys(self._name, self._environment['id'])
 
-    def export_keys_to_csv(self, csv_file_name, apiclient=None):
+    def iter_keys(self, apiclient=None):
+        '''
+        Iterate over the keys in segment in environment, one page at a time
+
+        :param apiclient: If this instance wasn't returned by the client,
+            the IdentifyClient instance should be passed in order to perform the
+            http call
+
+        :returns: generator of keys
+        :rtype: generator(string)
+        '''
+        imc = require_client('SegmentDefinition', self._client, apiclient)
+        return imc.iter_keys(self._name, self._environment['id'])
+
+    def export_keys_to_csv(self, csv_file_name, apiclient=None, parallel=False,
+                           resume=False):
         '''
         Get list of keys in segment in environment
+        Keys are written page by page; an interrupted export can be resumed
+        from its checkpoint file with resume=True.
 
         :param data: None
         :param apiclient: If this instance wasn't returned by the client,
             the IdentifyClient instance should be passed in order to perform the
             http call
+        :param parallel: fetch pages concurrently (True, or number of workers)
+        :param resume: continue a previously interrupted export
 
         :returns: True if successful
         :rtype: boolean
         '''
         imc = require_client('SegmentDefinition', self._client, apiclient)
-        fields = ['key']
-        with open(csv_file_name, mode='w') as keysFile:
-            keysWriter = csv.writer(keysFile,  delimiter=',',
-                            quotechar='|', quoting=csv.QUOTE_MINIMAL)
-            for key in imc.get_keys(self._name, self._environment['id']):
-                keysWriter.writerow([key])
+        imc.export_keys_to_csv(
+            self._name, self._environment['id'], csv_file_name,
+            parallel=parallel, resume=resume
+        )
         return True
 
     def import_keys_from_json(self, replace_keys, json_data, apiclient=None):
         '''
         import keys from csv file into segment
+        Keys are uploaded in batches of 10,000, see bulk_import_keys. The
+        error of the first failed batch is raised.
         
         :param data: replace boolean flag, json data
         :param apiclient: If this instance wasn't returned by the client,
@@ -113,27 +131,82 @@ class SegmentDefinition(BaseResource):
         :rtype: boolean
         '''
         imc = require_client('SegmentDefinition', self._client, apiclient)
-        keys = json_data['keys']
-        if(len(keys) > 10000):
-            # Split keys into batches of 10,000
-            key_batches = [keys[i:i + 10000] for i in range(0, len(keys), 10000)]
-            success = True
-            # Process each batch
-            first_batch = True
-            for key_batch in key_batches:
-                # Make a copy of the json_data to avoid modifying the original
-                batch_data = json_data.copy()
-                batch_data['keys'] = key_batch
-                # If any batch fails, mark the entire operation as failed
-                # First batch uses original replace_keys value, subsequent batches use False
-                batch_replace_keys = replace_keys if first_batch else False
-                batch_result = imc.import_keys_from_json(self._name, self._environment['id'], batch_replace_keys, batch_data)
-                if not batch_result:
-                    success = False
-                first_batch = False
-            return success
-        else:
-            return imc.import_keys_from_json(self._name, self._environment['id'], replace_keys, json_data)
+        result = imc.bulk_import_keys(
+            self._name, self._environment['id'], json_data['keys'],
+            replace_keys=replace_keys, data=json_data
+        )
+        if result.failed:
+            raise result.failed[0].error
+        return result.success
+
+    def bulk_import_keys(self, keys, replace_keys=False, data=None,
+                         batch_size=10000, max_workers=4, apiclient=None):
+        '''
+        import any number of keys into segment, uploading batches concurrently
+
+        :param keys: iterable or generator of keys
+        :param replace_keys: replace the segment's keys instead of adding
+        :param data: extra body fields sent with every batch (e.g. comment)
+        :param batch_size: keys per request
+        :param max_workers: number of batches uploaded concurrently
+        :param apiclient: If this instance wasn't returned by the client,
+            the IdentifyClient instance should be passed in order to perform the
+            http call
+
+        :returns: per batch report with the failed key ranges
+        :rtype: BulkOperationResult
+        '''
+        imc = require_client('SegmentDefinition', self._client, apiclient)
+        return imc.bulk_import_keys(
+            self._name, self._environment['id'], keys,
+            replace_keys=replace_keys, data=data,
+            batch_size=batch_size, max_workers=max_workers
+        )
+
+    def import_keys_from_file(self, path, format=None, replace_keys=False,
+                              data=None, apiclient=None, **kwargs):
+        '''
+        import keys from a csv, ndjson or txt file into segment, streaming it
+        in batches (see SegmentDefinitionMicroClient.import_keys_from_file
+        for the extra keyword arguments)
+
+        :param path: path of the key file
+        :param format: 'csv', 'ndjson' or 'txt' (inferred from the extension)
+        :param replace_keys: replace the segment's keys instead of adding
+        :param data: extra body fields sent with every batch (e.g. comment)
+        :param apiclient: If this instance wasn't returned by the client,
+            the IdentifyClient instance should be passed in order to perform the
+            http call
+
+        :returns: per batch report with the failed key ranges
+        :rtype: BulkOperationResult
+        '''
+        imc = require_client('SegmentDefinition', self._client, apiclient)
+        return imc.import_keys_from_file(
+            self._name, self._environment['id'], path, format=format,
+            replace_keys=replace_keys, data=data, **kwargs
+        )
+
+    def sync_keys(self, desired_keys, data=None, apiclient=None, **kwargs):
+        '''
+        make the segment hold exactly desired_keys, uploading and removing
+        only the keys that differ from the current ones (see
+        SegmentDefinitionMicroClient.sync_keys for the extra keyword
+        arguments)
+
+        :param desired_keys: iterable or generator of keys
+        :param data: extra body fields sent with every batch (e.g. comment)
+        :param apiclient: If this instance wasn't returned by the client,
+            the IdentifyClient instance should be passed in order to perform the
+            http call
+
+        :returns: per batch report with the added, removed and unchanged counts
+        :rtype: BulkOperationResult
+        '''
+        imc = require_client('SegmentDefinition', self._client, apiclient)
+        return imc.sync_keys(
+            self._name, self._environment['id'], desired_keys, data=data, **kwargs
+        )
 
     def remove_keys(self, json_data, apiclient=None):
         '''
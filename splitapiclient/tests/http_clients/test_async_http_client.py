@@ -0,0 +1,54 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import asyncio
+from splitapiclient.http_clients.async_client import AsyncHttpClient
+from splitapiclient.http_clients.session import DEFAULT_POOL_MAXSIZE
+from splitapiclient.http_clients.sync_client import SyncHttpClient
+
+
+class FakeResponse:
+    '''
+    Simple class to mock returned Response objects from the requests module.
+    '''
+    def __init__(self, status, text):
+        self.status_code = status
+        self.text = text
+
+
+class TestAsyncHttpClient:
+    '''
+    Tests for the AsyncHttpClient class
+    '''
+
+    def test_make_request(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('http://a.b.com', 'fake_api_key')
+        mocker.patch.object(sc.session, 'get')
+        sc.session.get.return_value = FakeResponse(200, '{"valid": "json"}')
+        ac = AsyncHttpClient(sc, max_workers=4)
+        endpoint = {
+            'method': 'GET',
+            'url_template': 'abc',
+            'headers': [],
+            'query_string': [],
+            'response': True
+        }
+
+        async def run():
+            return await asyncio.gather(*[ac.make_request(endpoint) for _ in range(5)])
+
+        results = asyncio.run(run())
+        assert results == [{'valid': 'json'}] * 5
+        assert sc.session.get.call_count == 5
+        assert ac.config is sc.config
+        ac.close()
+
+    def test_max_workers_defaults_to_pool_size(self):
+        '''
+        '''
+        sc = SyncHttpClient('http://a.b.com', 'fake_api_key')
+        ac = AsyncHttpClient(sc)
+        assert ac.executor._max_workers == DEFAULT_POOL_MAXSIZE
+        ac.close()
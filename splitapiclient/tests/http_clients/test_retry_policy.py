@@ -0,0 +1,180 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import time
+import pytest
+import requests
+from splitapiclient.http_clients.retry_policy import RetryPolicy, TokenBucket
+from splitapiclient.http_clients.sync_client import SyncHttpClient
+from splitapiclient.util.deadline import request_options
+from splitapiclient.util.exceptions import HTTPTooManyRequestsError, \
+    HTTPResponseError, SplitBackendUnreachableError
+
+
+class FakeResponse:
+    '''
+    Simple class to mock returned Response objects from the requests module.
+    '''
+    def __init__(self, status, text, headers=None):
+        self.status_code = status
+        self.text = text
+        self.headers = headers or {}
+
+
+ENDPOINT = {
+    'method': 'GET',
+    'url_template': 'abc',
+    'headers': [],
+    'query_string': [],
+    'response': True
+}
+
+
+class TestRetryPolicy:
+    '''
+    Tests for the RetryPolicy and TokenBucket classes
+    '''
+
+    def test_server_delay_headers(self):
+        '''
+        '''
+        policy = RetryPolicy(jitter=False)
+        started = time.monotonic()
+        assert policy.next_delay(1, FakeResponse(429, '', {'Retry-After': '7'}), started) == 7
+        assert policy.next_delay(
+            1, FakeResponse(429, '', {'X-RateLimit-Reset-Seconds-Org': '3'}), started
+        ) == 3
+        assert policy.next_delay(
+            1, FakeResponse(429, '', {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}), started
+        ) == 0
+
+    def test_exponential_backoff(self):
+        '''
+        '''
+        policy = RetryPolicy(jitter=False, backoff_factor=0.5, max_backoff=3)
+        started = time.monotonic()
+        delays = [policy.next_delay(i, FakeResponse(429, ''), started) for i in range(1, 6)]
+        assert delays == [0.5, 1, 2, 3, 3]
+
+        jittered = RetryPolicy(backoff_factor=2)
+        for _ in range(20):
+            assert 0 <= jittered.backoff(3) <= 8
+
+    def test_caps(self):
+        '''
+        '''
+        policy = RetryPolicy(max_attempts=3, jitter=False)
+        started = time.monotonic()
+        assert policy.next_delay(2, FakeResponse(429, ''), started) is not None
+        assert policy.next_delay(3, FakeResponse(429, ''), started) is None
+
+        policy = RetryPolicy(max_attempts=None, deadline=5)
+        assert policy.next_delay(1, FakeResponse(429, '', {'Retry-After': '10'}), started) is None
+
+    def test_from_config(self):
+        '''
+        '''
+        policy = RetryPolicy(max_attempts=2)
+        assert RetryPolicy.from_config({'retry_policy': policy}) is policy
+        assert RetryPolicy.from_config({'retry_policy': {'max_attempts': 4}}).max_attempts == 4
+        assert RetryPolicy.from_config({}).max_attempts == 10
+
+    def test_token_bucket(self, mocker):
+        '''
+        '''
+        sleep = mocker.patch('splitapiclient.http_clients.retry_policy.time.sleep')
+        bucket = TokenBucket(10, 2)
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        bucket._last = time.monotonic()
+        assert bucket.acquire() > 0
+        assert sleep.called
+
+    def test_priority_skips_token_bucket(self, mocker):
+        '''
+        '''
+        policy = RetryPolicy(requests_per_second=1, burst=1)
+        acquire = mocker.patch.object(policy, 'acquire')
+        policy.execute(lambda: FakeResponse(200, ''), 'PUT')
+        assert acquire.call_count == 1
+        with request_options(priority=True):
+            with request_options(timeout=5):
+                policy.execute(lambda: FakeResponse(200, ''), 'PUT')
+        assert acquire.call_count == 1
+
+    def test_make_request_retries_429(self, mocker):
+        '''
+        '''
+        sleep = mocker.patch('splitapiclient.http_clients.retry_policy.time.sleep')
+        c1 = SyncHttpClient('http://a.b.com', 'fake_api_key',
+                            retry_policy=RetryPolicy(max_attempts=3, jitter=False))
+        mocker.patch.object(c1.session, 'get')
+        c1.session.get.side_effect = [
+            FakeResponse(429, '', {'Retry-After': '2'}),
+            FakeResponse(200, '{"valid": "json"}'),
+        ]
+        assert c1.make_request(ENDPOINT) == {'valid': 'json'}
+        sleep.assert_called_once_with(2.0)
+
+        c1.session.get.side_effect = None
+        c1.session.get.return_value = FakeResponse(429, '')
+        with pytest.raises(HTTPTooManyRequestsError):
+            c1.make_request(ENDPOINT)
+        assert c1.session.get.call_count == 2 + 3
+
+    def test_transient_failures_idempotent_only(self):
+        '''
+        '''
+        policy = RetryPolicy()
+        assert policy.should_retry(FakeResponse(503, ''), 'GET')
+        assert policy.should_retry(FakeResponse(502, ''), 'DELETE')
+        assert not policy.should_retry(FakeResponse(503, ''), 'POST')
+        assert not policy.should_retry(FakeResponse(503, ''), 'PATCH')
+        assert policy.should_retry(FakeResponse(429, ''), 'POST')
+        assert not policy.should_retry(FakeResponse(404, ''), 'GET')
+        assert policy.should_retry_error(requests.exceptions.ConnectionError(), 'PUT')
+        assert policy.should_retry_error(requests.exceptions.ReadTimeout(), 'GET')
+        assert not policy.should_retry_error(requests.exceptions.ConnectionError(), 'POST')
+        assert not policy.should_retry_error(ValueError(), 'GET')
+
+        policy = RetryPolicy(retry_post=True)
+        assert policy.should_retry(FakeResponse(503, ''), 'POST')
+        assert policy.should_retry_error(requests.exceptions.ConnectionError(), 'POST')
+
+        policy = RetryPolicy(transient_statuses=(), retry_connection_errors=False)
+        assert not policy.should_retry(FakeResponse(503, ''), 'GET')
+        assert not policy.should_retry_error(requests.exceptions.ConnectionError(), 'GET')
+
+    def test_make_request_retries_transient(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.retry_policy.time.sleep')
+        policy = RetryPolicy(max_attempts=3, jitter=False)
+        c1 = SyncHttpClient('http://a.b.com', 'fake_api_key', retry_policy=policy)
+        mocker.patch.object(c1.session, 'get')
+        c1.session.get.side_effect = [
+            requests.exceptions.ConnectionError('reset'),
+            FakeResponse(503, ''),
+            FakeResponse(200, '{"valid": "json"}'),
+        ]
+        assert c1.make_request(ENDPOINT) == {'valid': 'json'}
+
+        c1.session.get.side_effect = requests.exceptions.ConnectionError('reset')
+        with pytest.raises(SplitBackendUnreachableError):
+            c1.make_request(ENDPOINT)
+
+        mocker.patch.object(c1.session, 'post')
+        c1.session.post.return_value = FakeResponse(503, '')
+        with pytest.raises(HTTPResponseError):
+            c1.make_request(dict(ENDPOINT, method='POST'))
+        assert c1.session.post.call_count == 1
+
+        stats = policy.stats.snapshot()
+        assert stats['calls'] == 3
+        assert stats['requests'] == 3 + 3 + 1
+        assert stats['retries'] == 4
+        assert stats['exhausted'] == 1
+        assert stats['retries_by_reason'] == {'ConnectionError': 3, '503': 1}
+        assert stats['max_latency'] >= stats['avg_latency'] >= 0
+        policy.stats.reset()
+        assert policy.stats.snapshot()['calls'] == 0
@@ -27,46 +27,46 @@ class TestSyncHttpClient:
         '''
         c1 = SyncHttpClient('http://a.b.com', 'fake_api_key')
 
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.get')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.post')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.put')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.patch')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.delete')
+        mocker.patch.object(c1.session, 'get')
+        mocker.patch.object(c1.session, 'post')
+        mocker.patch.object(c1.session, 'put')
+        mocker.patch.object(c1.session, 'patch')
+        mocker.patch.object(c1.session, 'delete')
 
         c1.setup_method('GET', None)()
-        sync_client.requests.get.assert_called_once_with()
+        c1.session.get.assert_called_once_with()
 
-        sync_client.requests.get.reset_mock()
+        c1.session.get.reset_mock()
         c1.setup_method('GET', {'something': 'a'})()
-        sync_client.requests.get.assert_called_once_with()
+        c1.session.get.assert_called_once_with()
 
         c1.setup_method('POST', None)()
-        sync_client.requests.post.assert_called_once_with(json=None)
+        c1.session.post.assert_called_once_with(json=None)
 
-        sync_client.requests.post.reset_mock()
+        c1.session.post.reset_mock()
         c1.setup_method('POST', {'something': 'a'})()
-        sync_client.requests.post.assert_called_once_with(json={'something': 'a'})
+        c1.session.post.assert_called_once_with(json={'something': 'a'})
 
         c1.setup_method('PUT', None)()
-        sync_client.requests.put.assert_called_once_with(json=None)
+        c1.session.put.assert_called_once_with(json=None)
 
-        sync_client.requests.put.reset_mock()
+        c1.session.put.reset_mock()
         c1.setup_method('PUT', {'something': 'a'})()
-        sync_client.requests.put.assert_called_once_with(json={'something': 'a'})
+        c1.session.put.assert_called_once_with(json={'something': 'a'})
 
         c1.setup_method('PATCH', None)()
-        sync_client.requests.patch.assert_called_once_with(json=None)
+        c1.session.patch.assert_called_once_with(json=None)
 
-        sync_client.requests.patch.reset_mock()
+        c1.session.patch.reset_mock()
         c1.setup_method('PATCH', {'something': 'a'})()
-        sync_client.requests.patch.assert_called_once_with(json={'something': 'a'})
+        c1.session.patch.assert_called_once_with(json={'something': 'a'})
 
         c1.setup_method('DELETE', {'something': 'a'})()
-        sync_client.requests.delete.assert_called_once_with()
+        c1.session.delete.assert_called_once_with()
 
-        sync_client.requests.delete.reset_mock()
+        c1.session.delete.reset_mock()
         c1.setup_method('DELETE', {'something': 'a'})()
-        sync_client.requests.delete.assert_called_once_with()
+        c1.session.delete.assert_called_once_with()
 
     def test_handle_invalid_response(self):
         '''
@@ -84,11 +84,11 @@ class TestSyncHttpClient:
         '''
         c1 = SyncHttpClient('http://a.b.com', 'fake_api_key')
 
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.get')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.post')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.put')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.patch')
-        mocker.patch('splitapiclient.http_clients.sync_client.requests.delete')
+        mocker.patch.object(c1.session, 'get')
+        mocker.patch.object(c1.session, 'post')
+        mocker.patch.object(c1.session, 'put')
+        mocker.patch.object(c1.session, 'patch')
+        mocker.patch.object(c1.session, 'delete')
 
         cases = [{  # Successful GET
             'endpoint': {
@@ -100,7 +100,7 @@ class TestSyncHttpClient:
             },
             'body': None,
             'params': {},
-            'mock': sync_client.requests.get,
+            'mock': c1.session.get,
             'response': FakeResponse(200, '{"valid": "json"}')
         }, {  # Unauthorized GET
             'endpoint': {
@@ -112,7 +112,7 @@ class TestSyncHttpClient:
             },
             'body': None,
             'params': {},
-            'mock': sync_client.requests.get,
+            'mock': c1.session.get,
             'response': FakeResponse(401, '{"valid": "json"}'),
             'raises': HTTPUnauthorizedError,
         }, {  # Not Found GET
@@ -125,7 +125,7 @@ class TestSyncHttpClient:
             },
             'body': None,
             'params': {},
-            'mock': sync_client.requests.get,
+            'mock': c1.session.get,
             'response': FakeResponse(404, '{"valid": "json"}'),
             'raises': HTTPNotFoundError,
         }, {  # Incorrect parameters
@@ -138,7 +138,7 @@ class TestSyncHttpClient:
             },
             'body': None,
             'params': {},
-            'mock': sync_client.requests.get,
+            'mock': c1.session.get,
             'response': FakeResponse(400, '{"valid": "json"}'),
             'raises': HTTPIncorrectParametersError,
         }, {  # Successful POST
@@ -151,7 +151,7 @@ class TestSyncHttpClient:
             },
             'body': '{"some": "valid body"}',
             'params': {},
-            'mock': sync_client.requests.post,
+            'mock': c1.session.post,
             'response': FakeResponse(200, '{"valid": "json"}')
         }, {  # Successful PATCH
             'endpoint': {
@@ -163,7 +163,7 @@ class TestSyncHttpClient:
             },
             'body': '{"some": "valid body"}',
             'params': {},
-            'mock': sync_client.requests.patch,
+            'mock': c1.session.patch,
             'response': FakeResponse(200, '{"valid": "json"}')
         }, {  # Successful PUT
             'endpoint': {
@@ -175,7 +175,7 @@ class TestSyncHttpClient:
             },
             'body': '{"some": "valid body"}',
             'params': {},
-            'mock': sync_client.requests.put,
+            'mock': c1.session.put,
             'response': FakeResponse(200, '{"valid": "json"}')
         }, {  # Successful DELETE
             'endpoint': {
@@ -187,7 +187,7 @@ class TestSyncHttpClient:
             },
             'body': '',
             'params': {},
-            'mock': sync_client.requests.delete,
+            'mock': c1.session.delete,
             'response': FakeResponse(200, '{"valid": "json"}')
         }]
 
@@ -208,5 +208,6 @@ class TestSyncHttpClient:
                 )
                 case['mock'].assert_called_once_with(
                     '%s/%s' % (c1.config['base_url'], case['endpoint']['url_template']),
+                    timeout=c1.timeout,
                     **named_args
                 )
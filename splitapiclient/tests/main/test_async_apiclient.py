@@ -0,0 +1,67 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import asyncio
+import pytest
+from splitapiclient.main import get_client
+from splitapiclient.main.async_apiclient import AsyncApiClient
+from splitapiclient.main.harness_apiclient import HarnessApiClient
+from splitapiclient.microclients import SplitMicroClient
+from splitapiclient.microclients.harness import TokenMicroClient
+from splitapiclient.resources import Split
+
+
+class TestAsyncApiClient:
+    '''
+    '''
+
+    def test_get_client(self):
+        '''
+        '''
+        c1 = get_client({'apikey': '123', 'async': True})
+        assert isinstance(c1, AsyncApiClient)
+        assert isinstance(c1.splits.microclient, SplitMicroClient)
+        assert c1.splits is c1.splits
+        c1.close()
+
+        c2 = get_client({'harness_token': 'abc', 'harness_mode': True, 'async': True})
+        assert isinstance(c2.sync_client, HarnessApiClient)
+        assert isinstance(c2.token.microclient, TokenMicroClient)
+        c2.close()
+
+    def test_awaitable_methods(self, mocker):
+        '''
+        '''
+        c1 = AsyncApiClient({'apikey': '123', 'max_workers': 4})
+        mocker.patch.object(
+            c1.sync_client.splits, 'get',
+            side_effect=lambda name, ws: Split({'name': name}, ws)
+        )
+
+        async def run():
+            async with c1 as client:
+                return await asyncio.gather(
+                    *[client.splits.get('s%d' % i, 'ws') for i in range(10)]
+                )
+
+        results = asyncio.run(run())
+        assert [s.name for s in results] == ['s%d' % i for i in range(10)]
+        assert c1.sync_client.splits.get.call_count == 10
+
+        with pytest.raises(AttributeError):
+            c1.splits._endpoint
+
+    def test_async_iterators(self, mocker):
+        '''
+        '''
+        c1 = AsyncApiClient({'apikey': '123'})
+        mocker.patch.object(
+            c1.sync_client.segment_definitions, 'iter_keys',
+            side_effect=lambda name, env: iter(['k1', 'k2', 'k3'])
+        )
+
+        async def run():
+            return [key async for key in c1.segment_definitions.iter_keys('seg', 'env')]
+
+        assert asyncio.run(run()) == ['k1', 'k2', 'k3']
+        c1.close()
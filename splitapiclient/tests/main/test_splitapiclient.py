@@ -25,3 +25,25 @@ class TestSyncApiClient:
         c3 = SyncApiClient({'base_url': 'http://test', 'apikey': '123'})
         assert c3._base_url == 'http://test'
         assert c3._apikey == '123'
+
+    def test_connection_pool_shared(self):
+        '''
+        '''
+        c1 = SyncApiClient({'apikey': '123', 'pool_maxsize': 32})
+        assert c1.splits._http_client.session is c1.flag_sets._http_client.session
+        adapter = c1.splits._http_client.session.get_adapter('https://api.split.io')
+        assert adapter._pool_maxsize == 32
+        assert c1.splits._http_client.session.headers['Connection'] == 'keep-alive'
+
+        c2 = SyncApiClient({'apikey': '123', 'keep_alive': False})
+        assert c2.splits._http_client.session.headers['Connection'] == 'close'
+        c2.close()
+
+    def test_retry_policy_shared(self):
+        '''
+        '''
+        c1 = SyncApiClient({'apikey': '123', 'retry_policy': {'retry_post': True}})
+        assert c1.splits._http_client.retry_policy is c1.retry_policy
+        assert c1.flag_sets._http_client.retry_policy is c1.retry_policy
+        assert c1.retry_policy.retry_post
+        assert c1.retry_stats['calls'] == 0
@@ -139,3 +139,25 @@ class TestEnvironmentMicroClient:
             'apiTokens' : None
         }
         assert response == result.to_dict()
+
+    def test_find_cached(self, mocker):
+        '''
+        '''
+        from splitapiclient.util.cache import TTLCache
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        cache = TTLCache()
+        emc = EnvironmentMicroClient(sc, cache=cache)
+        SyncHttpClient.make_request.return_value = [
+            {'id': '1', 'name': 'env1'}, {'id': '2', 'name': 'env2'}
+        ]
+        assert emc.find('env1', 'ws_id').id == '1'
+        assert emc.find('env2', 'ws_id').id == '2'
+        assert SyncHttpClient.make_request.call_count == 1
+        assert cache.stats()['hits'] == 1
+
+        SyncHttpClient.make_request.return_value = {'id': '3', 'name': 'env3'}
+        emc.add({'name': 'env3'}, 'ws_id')
+        SyncHttpClient.make_request.return_value = [{'id': '3', 'name': 'env3'}]
+        assert emc.find('env3', 'ws_id').id == '3'
+        assert SyncHttpClient.make_request.call_count == 3
@@ -26,32 +26,32 @@ def fake_response():
 
 @pytest.fixture
 def mock_requests_get(mocker):
-    """Mock requests.get and return the mock for assertions."""
-    mock = mocker.patch('splitapiclient.http_clients.sync_client.requests.get')
+    """Mock requests.Session.get and return the mock for assertions."""
+    mock = mocker.patch('requests.Session.get')
     mock.return_value = FakeResponse(200, '{"data": []}')
     return mock
 
 
 @pytest.fixture
 def mock_requests_post(mocker):
-    """Mock requests.post and return the mock for assertions."""
-    mock = mocker.patch('splitapiclient.http_clients.sync_client.requests.post')
+    """Mock requests.Session.post and return the mock for assertions."""
+    mock = mocker.patch('requests.Session.post')
     mock.return_value = FakeResponse(200, '{"data": {}}')
     return mock
 
 
 @pytest.fixture
 def mock_requests_put(mocker):
-    """Mock requests.put and return the mock for assertions."""
-    mock = mocker.patch('splitapiclient.http_clients.sync_client.requests.put')
+    """Mock requests.Session.put and return the mock for assertions."""
+    mock = mocker.patch('requests.Session.put')
     mock.return_value = FakeResponse(200, '{"data": {}}')
     return mock
 
 
 @pytest.fixture
 def mock_requests_delete(mocker):
-    """Mock requests.delete and return the mock for assertions."""
-    mock = mocker.patch('splitapiclient.http_clients.sync_client.requests.delete')
+    """Mock requests.Session.delete and return the mock for assertions."""
+    mock = mocker.patch('requests.Session.delete')
     mock.return_value = FakeResponse(200, '{}')
     return mock
 
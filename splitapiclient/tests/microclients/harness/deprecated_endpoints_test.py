@@ -141,7 +141,7 @@ class TestAuthenticationInHarnessMode:
         """
         # Create a custom HTTP client class for testing
         class TestHttpClient(HarnessHttpClient):
-            def __init__(self, baseurl, auth_token):
+            def __init__(self, baseurl, auth_token, **kwargs):
                 self.baseurl = baseurl
                 self.auth_token = auth_token
                 # Initialize with empty config
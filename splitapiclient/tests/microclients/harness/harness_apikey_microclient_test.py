@@ -322,7 +322,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -337,7 +337,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -352,7 +352,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_list_url_with_project_identifier_only(self, mocker):
         """Verify list URL contains projectIdentifier when set, but not orgIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -367,7 +367,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -382,7 +382,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -402,7 +402,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_get_url_without_optional_identifiers(self, mocker):
         """Verify get URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'apiKey': {'identifier': 'ak1', 'name': 'AK1', 'description': '', 'parentIdentifier': 'parent1', 'apiKeyType': 'SERVICE_ACCOUNT'}}
         }))
@@ -420,7 +420,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_get_url_with_org_identifier_only(self, mocker):
         """Verify get URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'apiKey': {'identifier': 'ak1', 'name': 'AK1', 'description': '', 'parentIdentifier': 'parent1', 'apiKeyType': 'SERVICE_ACCOUNT'}}
         }))
@@ -438,7 +438,7 @@ class TestHarnessApiKeyURLGeneration:
 
     def test_get_url_with_both_identifiers(self, mocker):
         """Verify get URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'apiKey': {'identifier': 'ak1', 'name': 'AK1', 'description': '', 'parentIdentifier': 'parent1', 'apiKeyType': 'SERVICE_ACCOUNT'}}
         }))
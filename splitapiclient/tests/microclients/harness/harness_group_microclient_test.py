@@ -429,7 +429,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier/filterType when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         # Return empty content on second call to stop pagination
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
@@ -447,7 +447,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -464,7 +464,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_list_url_with_project_identifier_only(self, mocker):
         """Verify list URL contains projectIdentifier when set, but not orgIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -481,7 +481,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -497,7 +497,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_list_url_with_filter_type(self, mocker):
         """Verify list URL contains filterType when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -512,7 +512,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_list_url_with_all_parameters(self, mocker):
         """Verify list URL contains all parameters when all are set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -529,7 +529,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -551,7 +551,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_get_url_without_optional_identifiers(self, mocker):
         """Verify get URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'identifier': 'group1', 'name': 'Group 1', 'accountIdentifier': 'test_account', 'users': []}
         }))
@@ -568,7 +568,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_get_url_with_org_identifier_only(self, mocker):
         """Verify get URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'identifier': 'group1', 'name': 'Group 1', 'accountIdentifier': 'test_account', 'users': []}
         }))
@@ -585,7 +585,7 @@ class TestHarnessGroupURLGeneration:
 
     def test_get_url_with_both_identifiers(self, mocker):
         """Verify get URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'identifier': 'group1', 'name': 'Group 1', 'accountIdentifier': 'test_account', 'users': []}
         }))
@@ -307,7 +307,7 @@ class TestHarnessProjectURLGeneration:
 
     def test_list_url_without_org_identifier(self, mocker):
         """Verify list URL doesn't contain orgIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         # First call returns data, second call returns data to trigger second page, third returns empty
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({
@@ -327,7 +327,7 @@ class TestHarnessProjectURLGeneration:
 
     def test_list_url_with_org_identifier(self, mocker):
         """Verify list URL contains orgIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({
                 'data': {'content': [], 'totalPages': 1}
@@ -346,7 +346,7 @@ class TestHarnessProjectURLGeneration:
 
     def test_list_url_with_method_override_org_identifier(self, mocker):
         """Verify list URL uses method parameters to override instance org_identifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({
                 'data': {'content': [], 'totalPages': 1}
@@ -368,7 +368,7 @@ class TestHarnessProjectURLGeneration:
 
     def test_get_url_without_org_identifier(self, mocker):
         """Verify get URL doesn't contain orgIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'project': {'identifier': 'proj1', 'name': 'Project 1', 'description': '', 'orgIdentifier': 'org1', 'color': '', 'modules': []}}
         }))
@@ -384,7 +384,7 @@ class TestHarnessProjectURLGeneration:
 
     def test_get_url_with_org_identifier(self, mocker):
         """Verify get URL contains orgIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'project': {'identifier': 'proj1', 'name': 'Project 1', 'description': '', 'orgIdentifier': 'org1', 'color': '', 'modules': []}}
         }))
@@ -400,7 +400,7 @@ class TestHarnessProjectURLGeneration:
 
     def test_get_url_with_method_override_org_identifier(self, mocker):
         """Verify get URL uses method parameters to override instance org_identifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'project': {'identifier': 'proj1', 'name': 'Project 1', 'description': '', 'orgIdentifier': 'override_org', 'color': '', 'modules': []}}
         }))
@@ -63,17 +63,19 @@ class TestHarnessUserMicroClient:
         
         # Create expected endpoint with modified URL template (orgIdentifier and projectIdentifier removed)
         expected_endpoint = HarnessUserMicroClient._endpoint['all_items'].copy()
-        expected_endpoint['url_template'] = '/ng/api/user/aggregate?accountIdentifier={accountIdentifier}&pageIndex={pageIndex}'
+        expected_endpoint['url_template'] = '/ng/api/user/aggregate?accountIdentifier={accountIdentifier}&pageIndex={pageIndex}&pageSize={pageSize}'
         
         SyncHttpClient.make_request.assert_any_call(
             expected_endpoint,
             pageIndex=0,
-            accountIdentifier='test_account'
+            accountIdentifier='test_account',
+            pageSize=100
         )
         SyncHttpClient.make_request.assert_any_call(
             expected_endpoint,
             pageIndex=1,
-            accountIdentifier='test_account'
+            accountIdentifier='test_account',
+            pageSize=100
         )
         
         # Verify the result
@@ -330,17 +332,19 @@ class TestHarnessUserMicroClient:
         
         # Create expected endpoint with modified URL template (orgIdentifier and projectIdentifier removed)
         expected_endpoint = HarnessUserMicroClient._endpoint['list_pending'].copy()
-        expected_endpoint['url_template'] = '/ng/api/invites/aggregate?accountIdentifier={accountIdentifier}'
+        expected_endpoint['url_template'] = '/ng/api/invites/aggregate?accountIdentifier={accountIdentifier}&pageIndex={pageIndex}&pageSize={pageSize}'
         
         SyncHttpClient.make_request.assert_any_call(
             expected_endpoint,
             pageIndex=0,
-            accountIdentifier='test_account'
+            accountIdentifier='test_account',
+            pageSize=100
         )
         SyncHttpClient.make_request.assert_any_call(
             expected_endpoint,
             pageIndex=1,
-            accountIdentifier='test_account'
+            accountIdentifier='test_account',
+            pageSize=100
         )
         
         # Verify the result
@@ -351,6 +355,37 @@ class TestHarnessUserMicroClient:
         assert result[1]._id == 'invite2'
 
 
+    def test_list_server_side_filters(self, mocker):
+        '''
+        Test page size, search term and filters are sent to the aggregate endpoint
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        umc = HarnessUserMicroClient(sc, 'test_account')
+        make_request = mocker.patch.object(sc, 'make_request', return_value={'data': {
+            'content': [
+                {'user': {'uuid': 'u1', 'email': 'someone.else@example.com'}},
+                {'user': {'uuid': 'u2', 'email': 'Someone@example.com'}},
+            ],
+            'totalPages': 1,
+        }})
+
+        umc.list(page_size=500, search_term='a+b@example.com', role_identifiers=['_account_viewer'])
+        endpoint, = make_request.call_args[0]
+        assert endpoint['url_template'].endswith('&pageSize={pageSize}&searchTerm={searchTerm}')
+        assert make_request.call_args[1] == {
+            'accountIdentifier': 'test_account',
+            'pageIndex': 0,
+            'pageSize': 500,
+            'searchTerm': 'a%2Bb%40example.com',
+            'body': {'roleIdentifiers': ['_account_viewer']},
+        }
+
+        user = umc.find_by_email('someone@example.com')
+        assert user._uuid == 'u2'
+        assert make_request.call_args[1]['searchTerm'] == 'someone%40example.com'
+        assert umc.find_by_email('nobody@example.com') is None
+
+
 class TestHarnessUserURLGeneration:
     """
     Tests that verify actual URL generation by mocking at the requests level.
@@ -364,7 +399,7 @@ class TestHarnessUserURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_post = mocker.patch('splitapiclient.http_clients.harness_client.requests.post')
+        mock_post = mocker.patch('requests.Session.post')
         mock_post.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -380,7 +415,7 @@ class TestHarnessUserURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_post = mocker.patch('splitapiclient.http_clients.harness_client.requests.post')
+        mock_post = mocker.patch('requests.Session.post')
         mock_post.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -396,7 +431,7 @@ class TestHarnessUserURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_post = mocker.patch('splitapiclient.http_clients.harness_client.requests.post')
+        mock_post = mocker.patch('requests.Session.post')
         mock_post.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -412,7 +447,7 @@ class TestHarnessUserURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_post = mocker.patch('splitapiclient.http_clients.harness_client.requests.post')
+        mock_post = mocker.patch('requests.Session.post')
         mock_post.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -434,7 +469,7 @@ class TestHarnessUserURLGeneration:
 
     def test_get_url_without_optional_identifiers(self, mocker):
         """Verify get URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'user': {'uuid': 'user1', 'name': 'User 1', 'email': 'user1@test.com', 'status': 'ACTIVE'}}
         }))
@@ -451,7 +486,7 @@ class TestHarnessUserURLGeneration:
 
     def test_get_url_with_org_identifier_only(self, mocker):
         """Verify get URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'user': {'uuid': 'user1', 'name': 'User 1', 'email': 'user1@test.com', 'status': 'ACTIVE'}}
         }))
@@ -468,7 +503,7 @@ class TestHarnessUserURLGeneration:
 
     def test_get_url_with_both_identifiers(self, mocker):
         """Verify get URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'user': {'uuid': 'user1', 'name': 'User 1', 'email': 'user1@test.com', 'status': 'ACTIVE'}}
         }))
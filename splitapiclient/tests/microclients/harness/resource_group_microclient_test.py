@@ -302,7 +302,7 @@ class TestResourceGroupURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -318,7 +318,7 @@ class TestResourceGroupURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -334,7 +334,7 @@ class TestResourceGroupURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -350,7 +350,7 @@ class TestResourceGroupURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -372,7 +372,7 @@ class TestResourceGroupURLGeneration:
 
     def test_get_url_without_optional_identifiers(self, mocker):
         """Verify get URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'resourceGroup': {'identifier': 'rg1', 'name': 'RG 1', 'description': '', 'resourceFilter': {}}}
         }))
@@ -390,7 +390,7 @@ class TestResourceGroupURLGeneration:
 
     def test_get_url_with_org_identifier_only(self, mocker):
         """Verify get URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'resourceGroup': {'identifier': 'rg1', 'name': 'RG 1', 'description': '', 'resourceFilter': {}}}
         }))
@@ -407,7 +407,7 @@ class TestResourceGroupURLGeneration:
 
     def test_get_url_with_both_identifiers(self, mocker):
         """Verify get URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'resourceGroup': {'identifier': 'rg1', 'name': 'RG 1', 'description': '', 'resourceFilter': {}}}
         }))
@@ -236,7 +236,7 @@ class TestRoleAssignmentURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -252,7 +252,7 @@ class TestRoleAssignmentURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -268,7 +268,7 @@ class TestRoleAssignmentURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -284,7 +284,7 @@ class TestRoleAssignmentURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -306,7 +306,7 @@ class TestRoleAssignmentURLGeneration:
 
     def test_get_url_without_optional_identifiers(self, mocker):
         """Verify get URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'roleAssignment': {'identifier': 'ra1', 'roleIdentifier': 'role1', 'resourceGroupIdentifier': 'rg1', 'principal': {}}}
         }))
@@ -323,7 +323,7 @@ class TestRoleAssignmentURLGeneration:
 
     def test_get_url_with_org_identifier_only(self, mocker):
         """Verify get URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'roleAssignment': {'identifier': 'ra1', 'roleIdentifier': 'role1', 'resourceGroupIdentifier': 'rg1', 'principal': {}}}
         }))
@@ -340,7 +340,7 @@ class TestRoleAssignmentURLGeneration:
 
     def test_get_url_with_both_identifiers(self, mocker):
         """Verify get URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'roleAssignment': {'identifier': 'ra1', 'roleIdentifier': 'role1', 'resourceGroupIdentifier': 'rg1', 'principal': {}}}
         }))
@@ -354,3 +354,22 @@ class TestRoleAssignmentURLGeneration:
         assert 'accountIdentifier=test_account' in called_url
         assert 'orgIdentifier=org1' in called_url
         assert 'projectIdentifier=proj1' in called_url
+
+    def test_list_uses_page_count(self, mocker):
+        """Verify the remaining pages are fetched from totalPages, without an empty page"""
+        sc = SyncHttpClient('abc', 'abc')
+        ramc = RoleAssignmentMicroClient(sc, 'test_account')
+
+        def request(endpoint, **kwargs):
+            index = kwargs['pageIndex']
+            return {'data': {
+                'content': [{'roleAssignment': {'identifier': 'ra%d' % index}}],
+                'pageIndex': index,
+                'totalPages': 5,
+            }}
+        make_request = mocker.patch.object(sc, 'make_request', side_effect=request)
+
+        result = ramc.list()
+        assert [ra.identifier for ra in result] == ['ra0', 'ra1', 'ra2', 'ra3', 'ra4']
+        assert sorted(c[1]['pageIndex'] for c in make_request.call_args_list) == [0, 1, 2, 3, 4]
+
@@ -3,6 +3,7 @@ from __future__ import absolute_import, division, print_function, \
 
 import json
 from splitapiclient.microclients.harness import RoleMicroClient
+from splitapiclient.microclients.harness import role_microclient
 from splitapiclient.http_clients.sync_client import SyncHttpClient
 from splitapiclient.http_clients.harness_client import HarnessHttpClient
 from splitapiclient.resources.harness import Role
@@ -259,6 +260,26 @@ class TestRoleMicroClient:
         # Verify the result
         assert result is True
 
+    def test_list_pages_sequentially_by_default(self, mocker):
+        '''
+        Test that list() only fetches the pages concurrently when asked to
+        '''
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        index_pages = mocker.spy(role_microclient, 'index_pages')
+        sc = SyncHttpClient('abc', 'abc')
+        rmc = RoleMicroClient(sc, 'test_account')
+
+        def page(identifier):
+            return {'data': {'content': [{'role': {'identifier': identifier}}], 'totalPages': 2}}
+
+        SyncHttpClient.make_request.side_effect = [page('role1'), page('role2')]
+        assert [role.identifier for role in rmc.list()] == ['role1', 'role2']
+        assert index_pages.call_args[1]['parallel'] is False
+
+        SyncHttpClient.make_request.side_effect = [page('role1'), page('role2')]
+        assert [role.identifier for role in rmc.list(parallel=True)] == ['role1', 'role2']
+        assert index_pages.call_args[1]['parallel'] is True
+
 
 class TestRoleURLGeneration:
     """
@@ -273,7 +294,7 @@ class TestRoleURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -289,7 +310,7 @@ class TestRoleURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -305,7 +326,7 @@ class TestRoleURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -321,7 +342,7 @@ class TestRoleURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -343,7 +364,7 @@ class TestRoleURLGeneration:
 
     def test_get_url_without_optional_identifiers(self, mocker):
         """Verify get URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'role': {'identifier': 'role1', 'name': 'Role 1', 'description': '', 'permissions': []}}
         }))
@@ -360,7 +381,7 @@ class TestRoleURLGeneration:
 
     def test_get_url_with_org_identifier_only(self, mocker):
         """Verify get URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'role': {'identifier': 'role1', 'name': 'Role 1', 'description': '', 'permissions': []}}
         }))
@@ -377,7 +398,7 @@ class TestRoleURLGeneration:
 
     def test_get_url_with_both_identifiers(self, mocker):
         """Verify get URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'role': {'identifier': 'role1', 'name': 'Role 1', 'description': '', 'permissions': []}}
         }))
@@ -252,7 +252,7 @@ class TestServiceAccountURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -266,7 +266,7 @@ class TestServiceAccountURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -280,7 +280,7 @@ class TestServiceAccountURLGeneration:
 
     def test_list_url_with_project_identifier_only(self, mocker):
         """Verify list URL contains projectIdentifier when set, but not orgIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -294,7 +294,7 @@ class TestServiceAccountURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -308,7 +308,7 @@ class TestServiceAccountURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({'data': []}))
 
         hc = HarnessHttpClient('https://app.harness.io', 'test_token')
@@ -328,7 +328,7 @@ class TestServiceAccountURLGeneration:
 
     def test_get_url_without_optional_identifiers(self, mocker):
         """Verify get URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'serviceAccount': {'identifier': 'sa1', 'name': 'SA1', 'description': '', 'email': '', 'tags': {}}}
         }))
@@ -345,7 +345,7 @@ class TestServiceAccountURLGeneration:
 
     def test_get_url_with_org_identifier_only(self, mocker):
         """Verify get URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'serviceAccount': {'identifier': 'sa1', 'name': 'SA1', 'description': '', 'email': '', 'tags': {}}}
         }))
@@ -362,7 +362,7 @@ class TestServiceAccountURLGeneration:
 
     def test_get_url_with_project_identifier_only(self, mocker):
         """Verify get URL contains projectIdentifier when set, but not orgIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'serviceAccount': {'identifier': 'sa1', 'name': 'SA1', 'description': '', 'email': '', 'tags': {}}}
         }))
@@ -379,7 +379,7 @@ class TestServiceAccountURLGeneration:
 
     def test_get_url_with_both_identifiers(self, mocker):
         """Verify get URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'serviceAccount': {'identifier': 'sa1', 'name': 'SA1', 'description': '', 'email': '', 'tags': {}}}
         }))
@@ -396,7 +396,7 @@ class TestServiceAccountURLGeneration:
 
     def test_get_url_with_method_override_identifiers(self, mocker):
         """Verify get URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.return_value = FakeResponse(200, json.dumps({
             'data': {'serviceAccount': {'identifier': 'sa1', 'name': 'SA1', 'description': '', 'email': '', 'tags': {}}}
         }))
@@ -6,6 +6,8 @@ from splitapiclient.microclients.harness import TokenMicroClient
 from splitapiclient.http_clients.sync_client import SyncHttpClient
 from splitapiclient.http_clients.harness_client import HarnessHttpClient
 from splitapiclient.resources.harness import Token
+from splitapiclient.util.exceptions import HTTPResponseError, \
+    HTTPTooManyRequestsError, TokenSinkError
 from splitapiclient.tests.microclients.harness.conftest import FakeResponse
 
 
@@ -307,6 +309,105 @@ class TestTokenMicroClient:
         assert result is True
 
 
+    def test_rotate_expiring(self, mocker):
+        '''
+        Test tokens expiring within the window are rotated and streamed to the sink
+        '''
+        mocker.patch('splitapiclient.util.bulk.time.sleep')
+        mocker.patch('splitapiclient.microclients.harness.token_microclient.time.time',
+                     return_value=1000)
+        sc = SyncHttpClient('abc', 'abc')
+        tmc = TokenMicroClient(sc, 'test_account')
+        attempts = {}
+
+        def token(identifier, valid_to, valid=True):
+            return {'token': {'identifier': identifier, 'parentIdentifier': 'sa1',
+                              'apiKeyIdentifier': 'key1', 'validTo': valid_to, 'valid': valid}}
+
+        def request(endpoint, **kwargs):
+            if endpoint['url_template'].startswith('/ng/api/token/aggregate'):
+                if kwargs.get('projectIdentifier') == 'p2':
+                    raise HTTPResponseError('forbidden', FakeResponse(403, ''))
+                return {'data': {'totalPages': 1, 'content': [
+                    token('soon', 1500 * 1000),
+                    token('later', 9000 * 1000),
+                    token('expired', 500 * 1000, valid=False),
+                    token('throttled', 1200 * 1000),
+                    token('broken', 1100 * 1000),
+                ]}}
+            name = kwargs['tokenId']
+            attempts[name] = attempts.get(name, 0) + 1
+            if name == 'throttled' and attempts[name] == 1:
+                raise HTTPTooManyRequestsError('slow down', FakeResponse(429, ''))
+            if name == 'broken':
+                raise HTTPResponseError('server error', FakeResponse(500, ''))
+            return {'data': 'secret-' + name}
+        mocker.patch.object(sc, 'make_request', side_effect=request)
+
+        received = []
+        result = tmc.rotate_expiring(3600, lambda t, value: received.append((t.identifier, value)),
+                                     scopes=[('o1', 'p1'), ('o1', 'p2')])
+
+        assert sorted(received) == [('soon', 'secret-soon'), ('throttled', 'secret-throttled')]
+        # Server errors aren't retried, a rotation might have happened
+        assert attempts == {'soon': 1, 'throttled': 2, 'broken': 1}
+        assert all(r.value is None for r in result.successful)
+        assert result.metadata['scanned'] == 5
+        assert result.metadata['selected'] == 3
+        assert result.metadata['rotated'] == 2
+        assert len(result.metadata['list_errors']) == 1
+        statuses = {e['identifier']: e['status'] for e in result.metadata['audit']}
+        assert statuses == {'broken': 'failed', 'soon': 'rotated', 'throttled': 'rotated'}
+
+    def test_rotate_expiring_sink_failure(self, mocker):
+        '''
+        Test a failing sink reports the token as rotated but undelivered
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        tmc = TokenMicroClient(sc, 'test_account')
+
+        def request(endpoint, **kwargs):
+            if endpoint['url_template'].startswith('/ng/api/token/aggregate'):
+                return {'data': {'totalPages': 1, 'content': [
+                    {'token': {'identifier': 't1', 'validTo': 1}},
+                ]}}
+            return {'data': 'secret'}
+        mocker.patch.object(sc, 'make_request', side_effect=request)
+
+        def sink(token, value):
+            raise IOError('vault unavailable')
+
+        result = tmc.rotate_expiring(60, sink)
+        assert not result.success
+        assert isinstance(result.failed[0].error, TokenSinkError)
+        assert result.failed[0].attempts == 1
+        assert result.metadata['audit'][0]['status'] == 'undelivered'
+
+    def test_rotate_expiring_scopes_ignore_client_defaults(self, mocker):
+        '''
+        Test explicit scopes are listed as given, not completed with the client's defaults
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        tmc = TokenMicroClient(sc, 'test_account', 'o1', 'p1')
+        listed = []
+
+        def request(endpoint, **kwargs):
+            listed.append((kwargs.get('orgIdentifier'), kwargs.get('projectIdentifier')))
+            return {'data': {'totalPages': 1, 'content': []}}
+        mocker.patch.object(sc, 'make_request', side_effect=request)
+
+        tmc.rotate_expiring(60, lambda t, value: None, scopes=[(None, None), ('o2', None)])
+        assert set(listed) == set([(None, None), ('o2', None)])
+
+        listed[:] = []
+        tmc.rotate_expiring(60, lambda t, value: None)
+        assert listed == [('o1', 'p1')]
+
+        listed[:] = []
+        assert tmc.list_scope(org_identifier='o2') == []
+        assert listed == [('o2', None)]
+
+
 class TestTokenURLGeneration:
     """
     Tests that verify actual URL generation by mocking at the requests level.
@@ -320,7 +421,7 @@ class TestTokenURLGeneration:
 
     def test_list_url_without_optional_identifiers(self, mocker):
         """Verify list URL doesn't contain orgIdentifier/projectIdentifier when not set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -336,7 +437,7 @@ class TestTokenURLGeneration:
 
     def test_list_url_with_org_identifier_only(self, mocker):
         """Verify list URL contains orgIdentifier when set, but not projectIdentifier"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -352,7 +453,7 @@ class TestTokenURLGeneration:
 
     def test_list_url_with_both_identifiers(self, mocker):
         """Verify list URL contains both orgIdentifier and projectIdentifier when set"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -368,7 +469,7 @@ class TestTokenURLGeneration:
 
     def test_list_url_with_method_override_identifiers(self, mocker):
         """Verify list URL uses method parameters to override instance defaults"""
-        mock_get = mocker.patch('splitapiclient.http_clients.harness_client.requests.get')
+        mock_get = mocker.patch('requests.Session.get')
         mock_get.side_effect = [
             FakeResponse(200, json.dumps({'data': {'content': []}})),
         ]
@@ -1,7 +1,11 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
 
+import gc
+import weakref
+
 from splitapiclient.microclients import IdentityMicroClient
+from splitapiclient.util.exceptions import HTTPResponseError
 from splitapiclient.http_clients.sync_client import SyncHttpClient
 from splitapiclient.resources import Identity
 from splitapiclient.util.bulk_result import BulkOperationResult
@@ -73,6 +77,77 @@ class TestIdentityMicroClient:
             environmentId=identities[0]['environmentId'],
         )
 
+    def test_save_many(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        imc = IdentityMicroClient(sc)
+        calls = []
+
+        def create_many(endpoint, body, trafficTypeId, environmentId):
+            calls.append((trafficTypeId, environmentId, [i['key'] for i in body]))
+            if body[0]['key'] == 'bad':
+                raise HTTPResponseError('HTTP 500: error')
+            return {
+                'objects': [i for i in body if i['key'] != 'k3'],
+                'failed': [{'object': i, 'status': 400, 'message': 'invalid'}
+                           for i in body if i['key'] == 'k3'],
+                'metadata': {},
+            }
+        mocker.patch.object(sc, 'make_request', side_effect=create_many)
+
+        identities = (
+            {'key': key, 'trafficTypeId': tt, 'environmentId': 'env'}
+            for key, tt in [('k1', 'tt1'), ('k2', 'tt2'), ('k3', 'tt1'),
+                            ('k4', 'tt1'), ('bad', 'tt3')]
+        )
+        result = imc.save_many(identities, batch_size=2)
+        assert sorted(calls) == [
+            ('tt1', 'env', ['k1', 'k3']), ('tt1', 'env', ['k4']),
+            ('tt2', 'env', ['k2']), ('tt3', 'env', ['bad']),
+        ]
+        assert sorted(i.key for i in result.successful) == ['k1', 'k2', 'k4']
+        assert result.metadata == {'saved': 3, 'failed': 2, 'batches': 4}
+        assert not result.success
+        assert sorted(i.key for i in result.failed_items()) == ['bad', 'k3']
+        failures = {f['object'].key: f for f in result.failed}
+        assert failures['bad']['message'] == 'HTTP 500: error'
+        assert failures['k3']['status'] == 400
+        # Positions in the caller's input, despite the regrouping
+        assert sorted(result.failed_ranges) == [(2, 3), (4, 5)]
+
+    def test_save_many_without_successful(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        imc = IdentityMicroClient(sc)
+        mocker.patch.object(
+            sc, 'make_request',
+            side_effect=lambda endpoint, body, **kwargs: {'objects': body, 'failed': [], 'metadata': {}}
+        )
+        batch_results = []
+        alive = []
+        save_all = imc.save_all
+
+        def tracked_save_all(batch):
+            gc.collect()
+            alive.append(sum(1 for ref in batch_results if ref() is not None))
+            saved = save_all(batch)
+            batch_results.append(weakref.ref(saved))
+            return saved
+        mocker.patch.object(imc, 'save_all', side_effect=tracked_save_all)
+
+        identities = (
+            {'key': 'k%d' % i, 'trafficTypeId': 'tt', 'environmentId': 'env'}
+            for i in range(20)
+        )
+        result = imc.save_many(identities, batch_size=1, max_workers=1,
+                               keep_successful=False)
+        assert result.successful == []
+        assert result.metadata == {'saved': 20, 'failed': 0, 'batches': 20}
+        # Only the batches still in flight are held while the load runs
+        assert max(alive) <= 2
+
 
     def test_update(self, mocker):
         '''
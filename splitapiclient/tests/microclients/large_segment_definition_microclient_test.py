@@ -1,5 +1,9 @@
+from splitapiclient.http_clients.sync_client import SyncHttpClient
 from splitapiclient.microclients import LargeSegmentDefinitionMicroClient
 from splitapiclient.http_clients.base_client import BaseHttpClient
+from splitapiclient.util.exceptions import UploadIntegrityError, \
+    InvalidArgumentException
+import hashlib
 import pytest
 import requests
 
@@ -64,18 +68,23 @@ class TestLargeSegmentDefinitionMicroClient:
         )
         assert attr == http_client_mock.make_request.return_value
 
-    def test_upload_file(self, mocker):
+    def test_upload_file(self, mocker, tmp_path):
         '''
         Test the upload_file method of LargeSegmentDefinitionMicroClient
         '''
         http_client_mock = mocker.Mock(spec=BaseHttpClient)
         client = LargeSegmentDefinitionMicroClient(http_client_mock)
 
-        file_path = 'path/to/file.csv'
-        
-        # Set up the mocks before the test
-        mock_open = mocker.patch('builtins.open', mocker.mock_open(read_data='file content'))
-        mock_requests_put = mocker.patch('requests.put', return_value=mocker.Mock(status_code=200))
+        file_path = tmp_path / 'file.csv'
+        file_path.write_bytes(b'file content')
+        bodies = []
+
+        def put(url, headers, data, timeout):
+            bodies.append(b''.join(data))
+            return mocker.Mock(status_code=200, headers={
+                'ETag': '"%s"' % hashlib.md5(b'file content').hexdigest()
+            })
+        mock_requests_put = mocker.patch('requests.put', side_effect=put)
 
         # Execute the test
         result = {
@@ -89,13 +98,83 @@ class TestLargeSegmentDefinitionMicroClient:
                 'url': 'http://example.com/upload'
             }
         }
-        attr = client.upload_file(result, file_path)
+        progress = []
+        attr = client.upload_file(result, str(file_path),
+                                  progress=lambda sent, total: progress.append((sent, total)))
 
         # Verify the mocks were called correctly
-        mock_open.assert_called_once_with(file_path, 'rb')
         mock_requests_put.assert_called_once_with(
             'http://example.com/upload',
             headers={'Host': 'example.com'},
-            data=mocker.ANY
+            data=mocker.ANY,
+            timeout=mocker.ANY
         )
-        assert attr == mock_requests_put.return_value
\ No newline at end of file
+        assert bodies == [b'file content']
+        assert progress[-1] == (12, 12)
+        assert attr.status_code == 200
+
+    def test_upload_file_retries_and_checksum(self, mocker, tmp_path):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.retry_policy.time.sleep')
+        client = LargeSegmentDefinitionMicroClient(mocker.Mock(spec=BaseHttpClient))
+        file_path = tmp_path / 'file.csv'
+        file_path.write_bytes(b'key1\nkey2\n')
+        result = {'transactionMetadata': {
+            'headers': {'Host': ['example.com']}, 'url': 'http://example.com/upload'
+        }}
+        responses = [
+            requests.ConnectionError('reset'),
+            mocker.Mock(status_code=200, headers={'ETag': '"%s"' % ('0' * 32)}),
+        ]
+
+        def put(url, headers, data, timeout):
+            b''.join(data)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        mocker.patch('requests.put', side_effect=put)
+
+        with pytest.raises(UploadIntegrityError):
+            client.upload_file(result, str(file_path), verify_checksum=True)
+        assert responses == []
+
+    def test_upload_file_uses_client_session(self, mocker, tmp_path):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        client = LargeSegmentDefinitionMicroClient(sc)
+        file_path = tmp_path / 'file.csv'
+        file_path.write_bytes(b'key1\n')
+        result = {'transactionMetadata': {
+            'headers': {'Host': ['example.com']}, 'url': 'http://example.com/upload'
+        }}
+        # An ETag that isn't the MD5 (e.g. SSE-KMS) doesn't fail by default
+        response = mocker.Mock(status_code=200, headers={'ETag': '"%s"' % ('0' * 32)})
+        session_put = mocker.patch.object(sc.session, 'put', return_value=response)
+        requests_put = mocker.patch('requests.put')
+
+        assert client.upload_file(result, str(file_path)) is response
+        session_put.assert_called_once()
+        requests_put.assert_not_called()
+
+    def test_prepare_file(self, mocker, tmp_path):
+        '''
+        '''
+        client = LargeSegmentDefinitionMicroClient(mocker.Mock(spec=BaseHttpClient))
+        source = tmp_path / 'keys.csv'
+        destination = str(tmp_path / 'prepared.csv')
+        source.write_text('k1\nk2\nk1\n')
+        report = client.prepare_file(str(source), destination)
+        assert report.unique == 2
+        assert report.duplicates == 1
+
+        source.write_text('k1\n%s\n' % ('x' * 300))
+        with pytest.raises(InvalidArgumentException):
+            client.prepare_file(str(source), destination)
+        assert client.prepare_file(str(source), destination, strict=False).unique == 1
+
+        source.write_text('\n\n')
+        with pytest.raises(InvalidArgumentException):
+            client.prepare_file(str(source), destination)
@@ -95,6 +95,7 @@ class TestLargeSegmentDefinitionMicroClient:
         mock_requests_put.assert_called_once_with(
             'http://example.com/upload',
             headers={'Host': 'example.com'},
-            data=mocker.ANY
+            data=mocker.ANY,
+            timeout=mocker.ANY
         )
         assert attr == mock_requests_put.return_value
\ No newline at end of file
@@ -120,3 +120,133 @@ class TestSegmentDefinitionMicroClient:
         
         # Verify the result matches the expected count
         assert result == 5
+
+    def test_find_name_index(self, mocker):
+        '''
+        '''
+        from splitapiclient.util.cache import TTLCache
+        from splitapiclient.microclients import SegmentMicroClient
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        cache = TTLCache()
+        smc = SegmentDefinitionMicroClient(sc, cache=cache)
+        SyncHttpClient.make_request.return_value = {
+            'objects': [{'name': 'seg1'}, {'name': 'seg2'}],
+            'offset': 0,
+            'totalCount': 2,
+            'limit': 50
+        }
+        assert smc.find('seg1', 'env_id', 'ws_id').name == 'seg1'
+        assert smc.find('seg2', 'env_id', 'ws_id').name == 'seg2'
+        assert smc.find('seg3', 'env_id', 'ws_id') is None
+        assert SyncHttpClient.make_request.call_count == 1
+
+        SegmentMicroClient(sc, cache=cache).remove_from_environment('seg1', 'env_id')
+        smc.find('seg2', 'env_id', 'ws_id')
+        assert SyncHttpClient.make_request.call_count == 3
+
+    def test_bulk_import_keys(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SegmentDefinitionMicroClient(sc)
+        calls = []
+
+        def import_keys(segment_name, environment_id, replace_keys, data):
+            calls.append((replace_keys, len(data['keys']), data['comment']))
+            return True
+        mocker.patch.object(smc, 'import_keys_from_json', side_effect=import_keys)
+
+        keys = ('key%d' % i for i in range(25))
+        result = smc.bulk_import_keys(
+            'seg1', 'env_id', keys, replace_keys=True,
+            data={'comment': 'c', 'keys': ['ignored']}, batch_size=10
+        )
+        assert result.success
+        assert calls[0] == (True, 10, 'c')
+        assert sorted(calls[1:]) == [(False, 5, 'c'), (False, 10, 'c')]
+
+        calls[:] = []
+        result = smc.bulk_import_keys('seg1', 'env_id', [], replace_keys=True,
+                                      data={'comment': 'c'})
+        assert calls == [(True, 0, 'c')]
+
+    def test_export_keys_to_csv_resume(self, mocker, tmp_path):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SegmentDefinitionMicroClient(sc)
+        keys = ['key%d' % i for i in range(6)]
+        failing = {'offset': 4}
+
+        def get_keys(endpoint, environmentId, segmentName, offset):
+            if offset == failing['offset']:
+                raise Exception('connection reset')
+            return {
+                'keys': [{'key': k} for k in keys[offset:offset + 2]],
+                'offset': offset, 'limit': 2, 'count': len(keys),
+            }
+        mocker.patch.object(sc, 'make_request', side_effect=get_keys)
+
+        path = str(tmp_path / 'keys.csv')
+        try:
+            smc.export_keys_to_csv('seg1', 'env_id', path, checkpoint_every=1)
+            assert False
+        except Exception:
+            pass
+        with open(path + '.checkpoint') as checkpoint_file:
+            assert '"offset": 4' in checkpoint_file.read()
+
+        failing['offset'] = None
+        written = smc.export_keys_to_csv('seg1', 'env_id', path, resume=True)
+        assert written == 2
+        with open(path) as keys_file:
+            assert keys_file.read().split() == keys
+        assert not (tmp_path / 'keys.csv.checkpoint').exists()
+
+    def test_export_keys_to_csv_resume_without_csv(self, mocker, tmp_path):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SegmentDefinitionMicroClient(sc)
+        keys = ['key%d' % i for i in range(3)]
+        mocker.patch.object(sc, 'make_request', side_effect=lambda endpoint, environmentId, segmentName, offset: {
+            'keys': [{'key': k} for k in keys[offset:offset + 2]],
+            'offset': offset, 'limit': 2, 'count': len(keys),
+        })
+        path = str(tmp_path / 'keys.csv')
+        with open(path + '.checkpoint', 'w') as checkpoint_file:
+            checkpoint_file.write('{"segment": "seg1", "environment": "env_id", "offset": 2, "bytes": 12}')
+
+        # The csv was deleted: the export starts over
+        assert smc.export_keys_to_csv('seg1', 'env_id', path, resume=True) == 3
+        with open(path) as keys_file:
+            assert keys_file.read().split() == keys
+        assert not (tmp_path / 'keys.csv.checkpoint').exists()
+
+    def test_sync_keys(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SegmentDefinitionMicroClient(sc)
+        mocker.patch.object(smc, 'iter_keys', return_value=iter(['a', 'b', 'c']))
+        imported = []
+        removed = []
+        mocker.patch.object(
+            smc, 'import_keys_from_json',
+            side_effect=lambda s, e, r, data: imported.append((r, data))
+        )
+        mocker.patch.object(
+            smc, 'remove_keys',
+            side_effect=lambda s, e, data: removed.append(data)
+        )
+
+        result = smc.sync_keys('seg1', 'env_id', ['b', 'c', 'd'],
+                               data={'comment': 'daily'})
+        assert result.success
+        assert result.metadata['added'] == 1
+        assert result.metadata['removed'] == 1
+        assert result.metadata['unchanged'] == 2
+        assert imported == [(False, {'comment': 'daily', 'keys': ['d']})]
+        assert removed == [{'comment': 'daily', 'keys': ['a']}]
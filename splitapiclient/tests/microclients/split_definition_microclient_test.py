@@ -1,9 +1,13 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
 
-from splitapiclient.microclients import SplitDefinitionMicroClient
+from splitapiclient.microclients import SplitDefinitionMicroClient, SplitMicroClient
 from splitapiclient.http_clients.sync_client import SyncHttpClient
-from splitapiclient.resources import Environment
+from splitapiclient.resources import Environment, SplitDefinition
+from splitapiclient.util.exceptions import HTTPResponseError, \
+    HTTPTooManyRequestsError
+from splitapiclient.util.cache import TTLCache
+from splitapiclient.util.deadline import current_options
 def object_to_stringified_dict(obj):
     """
     Recursively converts an object and its nested objects to a stringified dictionary.
@@ -161,4 +165,171 @@ class TestSplitDefinitionMicroClient:
                 'flagSets': None,
                 'impressionsDisabled': False
             }
-        assert object_to_stringified_dict(result) == data
\ No newline at end of file
+        assert object_to_stringified_dict(result) == data
+    def test_find_uses_get_definition(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitDefinitionMicroClient(sc)
+        SyncHttpClient.make_request.return_value = {'name': 'sp1', 'rules': [], 'defaultRule': []}
+        assert smc.find('sp1', 'env_id', 'ws_id').name == 'sp1'
+        SyncHttpClient.make_request.assert_called_once_with(
+            SplitDefinitionMicroClient._endpoint['get_definition'],
+            workspaceId = 'ws_id',
+            environmentId = 'env_id',
+            splitName = 'sp1'
+        )
+
+    def test_update_definitions(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitDefinitionMicroClient(sc)
+
+        def update(endpoint, body, environmentId, workspaceId, splitName):
+            return {'name': splitName, 'rules': [], 'defaultRule': body['defaultRule']}
+        mocker.patch.object(sc, 'make_request', side_effect=update)
+
+        definition = {'treatments': [], 'rules': [], 'defaultRule': [{'treatment': 'on', 'size': 100}]}
+        updates = [(split, env, definition) for split in ('sp1', 'sp2') for env in ('e1', 'e2')]
+        result = smc.update_definitions(updates, 'ws_id', max_workers=4)
+        assert result.success
+        assert [r.item[:2] for r in result.successful] == [u[:2] for u in updates]
+        assert [r.value.name for r in result.successful] == ['sp1', 'sp1', 'sp2', 'sp2']
+        assert sc.make_request.call_count == 4
+
+    def test_update_definitions_not_retried_on_server_errors(self, mocker):
+        '''
+        '''
+        sleep = mocker.patch('splitapiclient.util.bulk.time.sleep')
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitDefinitionMicroClient(sc)
+        mocker.patch.object(sc, 'make_request', side_effect=HTTPResponseError(
+            'HTTP 503', mocker.Mock(status_code=503)
+        ))
+
+        # The retry policy already retried the request
+        result = smc.update_definitions([('sp1', 'e1', {})], 'ws_id')
+        assert sc.make_request.call_count == 1
+        assert result.failed[0].attempts == 1
+        sleep.assert_not_called()
+
+    def test_kill_many(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        cache = TTLCache()
+        smc = SplitDefinitionMicroClient(sc, cache=cache)
+        killed = []
+
+        def request(endpoint, **kwargs):
+            if endpoint == SplitDefinitionMicroClient._endpoint['kill']:
+                assert current_options().priority
+                killed.append((kwargs['splitName'], kwargs['environmentId']))
+                return True
+            if endpoint == SplitDefinitionMicroClient._endpoint['all_items']:
+                return {'objects': [
+                    {'name': 'sp2', 'rules': [], 'defaultRule': [], 'flagSets': [{'name': 'checkout'}]},
+                    {'name': 'sp3', 'rules': [], 'defaultRule': []},
+                ], 'offset': 0, 'limit': 20, 'totalCount': 2}
+            return {'objects': [{'name': 'sp4'}], 'offset': 0, 'limit': 20, 'totalCount': 1}
+        mocker.patch.object(sc, 'make_request', side_effect=request)
+
+        result = smc.kill_many('ws_id', ['e1', 'e2'], names=['sp1'], tags=['incident'],
+                               flag_sets=['checkout'])
+        expected = [(name, env) for name in ('sp1', 'sp2', 'sp4') for env in ('e1', 'e2')]
+        assert sorted(killed) == expected
+        assert [r.item for r in result.successful] == expected
+        assert all(r.elapsed >= 0 for r in result.successful)
+        assert result.success
+        assert len(cache) == 0
+
+    def test_kill_many_after_writes(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        cache = TTLCache()
+        smc = SplitDefinitionMicroClient(sc, cache=cache)
+        split_client = SplitMicroClient(sc, cache=cache)
+        flag_sets = {'sp1': [{'name': 'checkout'}], 'sp2': []}
+        killed = []
+
+        def request(endpoint, **kwargs):
+            if endpoint == SplitDefinitionMicroClient._endpoint['kill']:
+                killed.append(kwargs['splitName'])
+                return True
+            if endpoint == SplitDefinitionMicroClient._endpoint['all_items']:
+                objects = [{'name': name, 'rules': [], 'defaultRule': [], 'flagSets': sets}
+                           for name, sets in sorted(flag_sets.items())]
+                return {'objects': objects, 'offset': 0, 'limit': 20, 'totalCount': len(objects)}
+            # Writes move sp2 into the flag set
+            flag_sets['sp2'] = [{'name': 'checkout'}]
+            return {'name': kwargs.get('splitName'), 'rules': [], 'defaultRule': []}
+        mocker.patch.object(sc, 'make_request', side_effect=request)
+
+        writes = [
+            lambda: smc.update_definition('sp2', 'e1', 'ws_id', {}),
+            lambda: smc.restore('sp2', 'e1', 'ws_id'),
+            lambda: split_client.add_to_environment('sp2', 'e1', 'ws_id', {}),
+            lambda: split_client.remove_from_environment('sp2', 'e1', 'c', 't', 'ws_id'),
+            lambda: split_client.delete('sp2', 'ws_id'),
+        ]
+        for write in writes:
+            flag_sets['sp2'] = []
+            cache.clear()
+            # Loads the definitions into the cache
+            assert smc.resolve_targets('ws_id', 'e1', flag_sets=['checkout']) == [('sp1', 'e1')]
+            write()
+            killed[:] = []
+            smc.kill_many('ws_id', 'e1', flag_sets=['checkout'])
+            assert sorted(killed) == ['sp1', 'sp2']
+
+    def test_kill_many_rate_limited(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitDefinitionMicroClient(sc)
+        sleep = mocker.patch('splitapiclient.util.bulk.time.sleep')
+        error = HTTPTooManyRequestsError('HTTP 429', mocker.Mock(status_code=429))
+        mocker.patch.object(sc, 'make_request', side_effect=error)
+
+        # The retry policy already retried each request, kills aren't run again
+        result = smc.kill_many('ws_id', ['e1', 'e2'], names=['sp1'])
+        assert sc.make_request.call_count == 2
+        assert [r.attempts for r in result.failed] == [1, 1]
+        sleep.assert_not_called()
+
+        sc.make_request.reset_mock()
+        result = smc.restore_many('ws_id', 'e1', names=['sp1'], attempts=2)
+        assert sc.make_request.call_count == 2
+        assert result.failed[0].attempts == 2
+
+    def test_sync(self, mocker):
+        '''
+        '''
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitDefinitionMicroClient(sc)
+        listings = {
+            'e1': [{'name': 'sp1', 'rules': [], 'defaultRule': [], 'lastUpdateTime': 1}],
+            'e2': [{'name': 'sp2', 'rules': [], 'defaultRule': [], 'lastUpdateTime': 2}],
+        }
+
+        def request(endpoint, **kwargs):
+            if kwargs['environmentId'] == 'e3':
+                raise HTTPResponseError('forbidden')
+            objects = listings[kwargs['environmentId']]
+            return {'objects': objects, 'offset': 0, 'limit': 20, 'totalCount': len(objects)}
+        mocker.patch.object(sc, 'make_request', side_effect=request)
+
+        changes, state = smc.sync(['e1', 'e2', 'e3'], 'ws_id')
+        assert sorted(changes) == ['e1', 'e2']
+        assert [d.name for d in changes['e1'].added] == ['sp1']
+        assert isinstance(changes['e2'].added[0], SplitDefinition)
+        assert state.environments['e2']['definitions']['sp2'][0] == 2
+
+        listings['e1'] = [{'name': 'sp1', 'rules': [{'treatment': 'on'}], 'defaultRule': [],
+                           'lastUpdateTime': 3}]
+        changes, state = smc.sync(['e1', 'e2'], 'ws_id', state=state)
+        assert [d.name for d in changes['e1'].changed] == ['sp1']
+        assert not changes['e2']
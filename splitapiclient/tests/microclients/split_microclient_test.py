@@ -3,6 +3,8 @@ from __future__ import absolute_import, division, print_function, \
 
 from splitapiclient.microclients import SplitMicroClient
 from splitapiclient.http_clients.sync_client import SyncHttpClient
+from splitapiclient.util.exceptions import OperationTimeoutError, \
+    HTTPTooManyRequestsError
 
 
 class TestSplitMicroClient:
@@ -112,3 +114,100 @@ class TestSplitMicroClient:
             'id': None
         }
         assert result.to_dict() == data
+
+    def test_list_parallel(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        emc = SplitMicroClient(sc)
+
+        def make_request(endpoint, workspaceId, offset, tags):
+            return {
+                'objects': [{'name': 'sp%d' % i} for i in range(offset, min(offset + 20, 95))],
+                'offset': offset,
+                'totalCount': 95,
+                'limit': 20
+            }
+
+        SyncHttpClient.make_request.side_effect = make_request
+        result = emc.list('ws_id', parallel=3)
+        assert SyncHttpClient.make_request.call_count == 5
+        assert [s.name for s in result] == ['sp%d' % i for i in range(95)]
+
+    def test_iter_list(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        emc = SplitMicroClient(sc)
+
+        def make_request(endpoint, workspaceId, offset, tags):
+            return {
+                'objects': [{'name': 'sp%d' % i} for i in range(offset, min(offset + 20, 50))],
+                'offset': offset,
+                'totalCount': 50,
+                'limit': 20
+            }
+
+        SyncHttpClient.make_request.side_effect = make_request
+        splits = emc.iter_list('ws_id')
+        assert next(splits).name == 'sp0'
+        assert SyncHttpClient.make_request.call_count == 1
+        assert [s.name for s in splits] == ['sp%d' % i for i in range(1, 50)]
+        assert SyncHttpClient.make_request.call_count == 3
+
+    def test_find_uses_get(self, mocker):
+        '''
+        '''
+        from splitapiclient.util.exceptions import HTTPNotFoundError
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitMicroClient(sc)
+        SyncHttpClient.make_request.return_value = {'name': 'sp1', 'id': 'sp1'}
+        assert smc.find('sp1', 'ws_id').name == 'sp1'
+        SyncHttpClient.make_request.assert_called_once_with(
+            SplitMicroClient._endpoint['get'],
+            workspaceId = 'ws_id',
+            splitName = 'sp1'
+        )
+
+        SyncHttpClient.make_request.side_effect = HTTPNotFoundError()
+        assert smc.find('missing', 'ws_id') is None
+
+    def test_find_with_tags_stops_at_match(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitMicroClient(sc)
+
+        def fetch(endpoint, workspaceId, offset, tags):
+            return {
+                'objects': [{'name': 'sp%d' % i} for i in range(offset, offset + 20)],
+                'offset': offset,
+                'totalCount': 100,
+                'limit': 20
+            }
+        SyncHttpClient.make_request.side_effect = fetch
+        assert smc.find('sp25', 'ws_id', ['tag1']).name == 'sp25'
+        assert SyncHttpClient.make_request.call_count == 2
+
+    def test_add_to_environments_is_not_repeated(self, mocker):
+        '''
+        '''
+        sleep = mocker.patch('splitapiclient.util.bulk.time.sleep')
+        sc = SyncHttpClient('abc', 'abc')
+        smc = SplitMicroClient(sc)
+        mocker.patch.object(sc, 'make_request', side_effect=OperationTimeoutError('read timeout'))
+
+        # A timed out POST may have been applied, it's never sent again
+        result = smc.add_to_environments([('sp1', 'e1', {})], 'ws_id', attempts=3)
+        assert sc.make_request.call_count == 1
+        assert result.failed[0].attempts == 1
+        sleep.assert_not_called()
+
+        sc.make_request.reset_mock()
+        sc.make_request.side_effect = HTTPTooManyRequestsError('slow down', mocker.Mock(status_code=429))
+        result = smc.add_to_environments([('sp1', 'e1', {})], 'ws_id')
+        assert sc.make_request.call_count == 1
@@ -107,3 +107,34 @@ class TestWorkspaceMicroClient:
             'requiresTitleAndComments': None
         }
         assert response == result.to_dict()
+
+    def test_find_cached(self, mocker):
+        '''
+        '''
+        from splitapiclient.util.cache import TTLCache
+        mocker.patch('splitapiclient.http_clients.sync_client.SyncHttpClient.make_request')
+        sc = SyncHttpClient('abc', 'abc')
+        cache = TTLCache()
+        wmc = WorkspaceMicroClient(sc, cache=cache)
+        SyncHttpClient.make_request.return_value = {
+            'objects': [{'id': 'ws1', 'name': 'one'}, {'id': 'ws2', 'name': 'two'}],
+            'offset': 0,
+            'totalCount': 2,
+            'limit': 20
+        }
+        assert wmc.find('one').id == 'ws1'
+        assert wmc.find('two').id == 'ws2'
+        assert wmc.find('three') is None
+        assert SyncHttpClient.make_request.call_count == 1
+
+        cache.set(('environments', 'ws1'), [])
+        cache.set(('environments', 'ws2'), [])
+        cache.set(('segment_definitions', 'env1', 'ws1'), [])
+        cache.set(('split_definitions', 'env1', 'ws1'), [])
+        wmc.delete('ws1')
+        assert cache.get(('environments', 'ws1')) is None
+        assert cache.get(('segment_definitions', 'env1', 'ws1')) is None
+        assert cache.get(('split_definitions', 'env1', 'ws1')) is None
+        assert cache.get(('environments', 'ws2')) == []
+        wmc.find('one')
+        assert SyncHttpClient.make_request.call_count == 3
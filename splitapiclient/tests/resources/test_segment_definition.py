@@ -7,6 +7,8 @@ from splitapiclient.http_clients.base_client import BaseHttpClient
 from splitapiclient.main import get_client
 from splitapiclient.microclients import SegmentDefinitionMicroClient
 from splitapiclient.microclients import ChangeRequestMicroClient
+from splitapiclient.util.exceptions import HTTPResponseError
+import pytest
 class TestSegmentDefinition:
     '''
     Tests for the SegmentDefinition class' methods
@@ -108,15 +110,36 @@ class TestSegmentDefinition:
         )
         assert attr == True
 
+    def test_import_keys_from_json_raises(self, mocker):
+        '''
+        '''
+        error = HTTPResponseError('unauthorized')
+        http_client_mock = mocker.Mock(spec=BaseHttpClient)
+        http_client_mock.make_request.side_effect = error
+        seg = SegmentDefinition(
+            {
+                'name': 'name',
+                'environment': {
+                    'id': '1',
+                    'name': 'env'
+                },
+                'trafficType': {},
+            },
+            http_client_mock
+        )
+        with pytest.raises(HTTPResponseError) as raised:
+            seg.import_keys_from_json(False, {"keys": ["id1"]})
+        assert raised.value is error
+
     def test_import_keys_from_json_large_batch(self, mocker):
         """Test importing more than 10,000 keys to verify batch processing"""
         # Create a large list of keys (e.g., 25,000)
         large_key_list = [f"id{i}" for i in range(25000)]
         data = {"keys": large_key_list, "comment": "large batch test"}
         
-        # Mock the microclient
-        mock_imc = mocker.Mock()
-        mock_imc.import_keys_from_json.return_value = True
+        # Mock the microclient's single batch upload
+        mock_imc = SegmentDefinitionMicroClient(mocker.Mock(spec=BaseHttpClient))
+        mocker.patch.object(mock_imc, 'import_keys_from_json', return_value=True)
         
         # Mock the require_client function to return our mock
         mocker.patch('splitapiclient.resources.segment_definition.require_client', 
@@ -142,11 +165,11 @@ class TestSegmentDefinition:
         # Verify the microclient was called 3 times (for 25,000 keys)
         assert mock_imc.import_keys_from_json.call_count == 3
         
-        # Verify each batch had the correct number of keys
+        # Verify each batch had the correct number of keys (batches are
+        # uploaded concurrently, so calls may come in any order)
         calls = mock_imc.import_keys_from_json.call_args_list
-        assert len(calls[0][0][3]['keys']) == 10000  # First batch
-        assert len(calls[1][0][3]['keys']) == 10000  # Second batch
-        assert len(calls[2][0][3]['keys']) == 5000   # Last batch
+        assert sorted(len(c[0][3]['keys']) for c in calls) == [5000, 10000, 10000]
+        assert all(c[0][3]['comment'] == 'large batch test' for c in calls)
     
     def test_remove_keys(self, mocker):
         '''
@@ -270,3 +293,23 @@ class TestSegmentDefinition:
         }
 
         assert attr.to_dict() == data1
+
+    def test_import_keys_from_file(self, mocker, tmp_path):
+        """Keys are streamed from the file, de-duplicated and batched"""
+        keys_file = tmp_path / 'keys.txt'
+        keys_file.write_text('\n'.join(['id%d' % (i % 15) for i in range(30)]))
+
+        imc = SegmentDefinitionMicroClient(mocker.Mock(spec=BaseHttpClient))
+        mocker.patch.object(imc, 'import_keys_from_json', return_value=True)
+        mocker.patch('splitapiclient.resources.segment_definition.require_client',
+                     return_value=imc)
+        seg = SegmentDefinition({'name': 'name', 'environment': {'id': '1', 'name': 'env'}})
+
+        result = seg.import_keys_from_file(str(keys_file), replace_keys=True,
+                                           data={'comment': 'c'}, batch_size=10)
+        assert result.success
+        calls = imc.import_keys_from_json.call_args_list
+        assert calls[0][0][2] is True
+        assert sorted(len(c[0][3]['keys']) for c in calls) == [5, 10]
+        uploaded = [k for c in calls for k in c[0][3]['keys']]
+        assert sorted(uploaded) == sorted('id%d' % i for i in range(15))
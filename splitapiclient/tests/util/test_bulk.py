@@ -0,0 +1,101 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import threading
+from splitapiclient.util.bulk import iter_batches, run_batches, run_each
+from splitapiclient.util.exceptions import HTTPResponseError, \
+    HTTPNotFoundError, SplitBackendUnreachableError
+from splitapiclient.util.bulk_result import BulkOperationResult
+
+
+class TestBulk:
+    '''
+    '''
+
+    def test_iter_batches(self):
+        '''
+        '''
+        consumed = []
+
+        def keys():
+            for i in range(25):
+                consumed.append(i)
+                yield i
+
+        batches = iter_batches(keys(), 10)
+        start, batch = next(batches)
+        assert (start, batch) == (0, list(range(10)))
+        assert len(consumed) == 10
+        assert [(s, len(b)) for s, b in batches] == [(10, 10), (20, 5)]
+        assert list(iter_batches([], 10)) == []
+
+    def test_run_batches(self):
+        '''
+        '''
+        lock = threading.Lock()
+        seen = []
+
+        def operation(index, items):
+            with lock:
+                seen.append(index)
+            if index == 2:
+                raise ValueError('boom')
+            return len(items)
+
+        result = run_batches(iter_batches(range(95), 10), operation, max_workers=3)
+        assert isinstance(result, BulkOperationResult)
+        assert sorted(seen) == list(range(10))
+        assert not result.success
+        assert [b.index for b in result.successful] == [0, 1, 3, 4, 5, 6, 7, 8, 9]
+        assert result.successful[-1].value == 5
+        assert result.failed_ranges == [(20, 30)]
+        assert list(result.failed_items()) == list(range(20, 30))
+        assert isinstance(result.failed[0].error, ValueError)
+
+    def test_first_alone(self):
+        '''
+        '''
+        order = []
+
+        def operation(index, items):
+            order.append(index)
+            return True
+
+        result = run_batches(iter_batches(range(50), 10), operation, first_alone=True)
+        assert order[0] == 0
+        assert result.success
+        assert len(result.successful) == 5
+
+        def failing(index, items):
+            raise ValueError('boom')
+
+        result = run_batches(iter_batches(range(50), 10), failing, first_alone=True)
+        assert not result.success
+        assert result.metadata['aborted']
+        assert result.failed_ranges == [(0, 10)]
+
+    def test_run_each(self, mocker):
+        '''
+        '''
+        sleep = mocker.patch('splitapiclient.util.bulk.time.sleep')
+        calls = {}
+
+        def operation(item):
+            calls[item] = calls.get(item, 0) + 1
+            if item == 'flaky' and calls[item] < 3:
+                raise SplitBackendUnreachableError('reset')
+            if item == 'missing':
+                raise HTTPNotFoundError('HTTP 404', mocker.Mock(status_code=404))
+            if item == 'down':
+                raise HTTPResponseError('HTTP 503', mocker.Mock(status_code=503))
+            return item.upper()
+
+        result = run_each(['a', 'flaky', 'missing', 'down', 'b'], operation,
+                          max_workers=2, attempts=3)
+        assert [r.value for r in result.successful] == ['A', 'FLAKY', 'B']
+        assert [r.item for r in result.failed] == ['missing', 'down']
+        assert [r.attempts for r in result.failed] == [1, 3]
+        assert result.successful[1].attempts == 3
+        assert list(result.failed_items()) == ['missing', 'down']
+        assert sleep.call_count == 4
+        assert 'elapsed' in result.metadata
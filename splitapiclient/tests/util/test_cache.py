@@ -0,0 +1,69 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+from splitapiclient.util import cache as cache_module
+from splitapiclient.util.cache import TTLCache
+
+
+class TestTTLCache:
+    '''
+    '''
+
+    def test_ttl(self, mocker):
+        '''
+        '''
+        now = [100.0]
+        mocker.patch.object(cache_module.time, 'monotonic', side_effect=lambda: now[0])
+        c = TTLCache(ttl=10)
+        c.set('a', 1)
+        assert c.get('a') == 1
+        now[0] += 11
+        assert c.get('a') is None
+        stats = c.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['expirations'] == 1
+        assert stats['size'] == 0
+
+    def test_lru_eviction(self):
+        '''
+        '''
+        c = TTLCache(maxsize=2)
+        c.set('a', 1)
+        c.set('b', 2)
+        c.get('a')
+        c.set('c', 3)
+        assert c.get('b') is None
+        assert c.get('a') == 1
+        assert c.get('c') == 3
+        assert c.stats()['evictions'] == 1
+
+    def test_get_or_load_and_invalidate(self):
+        '''
+        '''
+        c = TTLCache()
+        loader = [0]
+
+        def load():
+            loader[0] += 1
+            return ['x']
+
+        assert c.get_or_load(('env', 'ws1'), load) == ['x']
+        assert c.get_or_load(('env', 'ws1'), load) == ['x']
+        assert loader[0] == 1
+        c.set(('env', 'ws2'), [])
+        c.set(('tt', 'ws1'), [])
+        c.invalidate_where(lambda key: key[1] == 'ws1')
+        assert len(c) == 1
+        c.clear()
+        assert c.stats()['invalidations'] == 3
+        assert c.stats()['hit_ratio'] == 0.5
+
+    def test_from_config(self):
+        '''
+        '''
+        assert TTLCache.from_config({}) is None
+        assert TTLCache.from_config({'lookup_cache': True}).ttl == 300
+        assert TTLCache.from_config({'lookup_cache': {'ttl': 5}}).ttl == 5
+        c = TTLCache()
+        assert TTLCache.from_config({'lookup_cache': c}) is c
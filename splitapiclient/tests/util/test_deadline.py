@@ -0,0 +1,125 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import json
+import time
+import pytest
+import requests
+from splitapiclient.http_clients.sync_client import SyncHttpClient
+from splitapiclient.http_clients.retry_policy import RetryPolicy
+from splitapiclient.microclients import SplitMicroClient
+from splitapiclient.util.deadline import Deadline, request_options, \
+    current_options
+from splitapiclient.util.exceptions import OperationTimeoutError, \
+    SplitBackendUnreachableError
+
+
+class FakeResponse:
+    '''
+    Simple class to mock returned Response objects from the requests module.
+    '''
+    def __init__(self, status, text, headers=None):
+        self.status_code = status
+        self.text = text
+        self.headers = headers or {}
+
+
+ENDPOINT = {
+    'method': 'GET',
+    'url_template': 'abc',
+    'headers': [],
+    'query_string': [],
+    'response': True
+}
+
+
+class TestDeadline:
+    '''
+    '''
+
+    def test_cap(self):
+        '''
+        '''
+        deadline = Deadline(5)
+        assert deadline.cap((10, 60))[1] <= 5
+        assert deadline.cap((1, None))[0] == 1
+        assert deadline.cap(2) == 2
+        assert 0 < deadline.cap(None) <= 5
+        assert not deadline.expired()
+        deadline.check()
+        with pytest.raises(OperationTimeoutError):
+            Deadline(0).check()
+
+    def test_request_options_nesting(self):
+        '''
+        '''
+        assert current_options() is None
+        with request_options(timeout=3, deadline=100) as outer:
+            with request_options(deadline=1000) as inner:
+                assert inner.timeout == 3
+                assert inner.deadline is outer.deadline
+            with request_options(timeout=7, deadline=1) as inner:
+                assert inner.timeout == 7
+                assert inner.deadline.seconds == 1
+            assert current_options() is outer
+        assert current_options() is None
+
+    def test_timeouts_passed_to_requests(self, mocker):
+        '''
+        '''
+        c1 = SyncHttpClient('http://a.b.com', 'fake_api_key', timeout=(1, 2))
+        mocker.patch.object(c1.session, 'get')
+        c1.session.get.return_value = FakeResponse(200, '{}')
+        c1.make_request(ENDPOINT)
+        assert c1.session.get.call_args[1]['timeout'] == (1, 2)
+
+        with request_options(timeout=5):
+            c1.make_request(ENDPOINT)
+        assert c1.session.get.call_args[1]['timeout'] == 5
+
+        with request_options(timeout=(3, 30), deadline=10):
+            c1.make_request(ENDPOINT)
+        connect, read = c1.session.get.call_args[1]['timeout']
+        assert connect == 3 and read <= 10
+
+    def test_timeout_error(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.http_clients.retry_policy.time.sleep')
+        c1 = SyncHttpClient('http://a.b.com', 'fake_api_key',
+                            retry_policy=RetryPolicy(max_attempts=2))
+        mocker.patch.object(c1.session, 'get')
+        c1.session.get.side_effect = requests.exceptions.ReadTimeout()
+        with pytest.raises(OperationTimeoutError):
+            c1.make_request(ENDPOINT)
+        assert c1.session.get.call_count == 2
+        assert issubclass(OperationTimeoutError, SplitBackendUnreachableError)
+
+    def test_deadline_spans_pagination(self, mocker):
+        '''
+        '''
+        c1 = SyncHttpClient('http://a.b.com', 'fake_api_key')
+        mocker.patch.object(c1.session, 'get')
+
+        def slow_page(url, headers, timeout):
+            time.sleep(0.05)
+            offset = int(url.split('offset=')[1].split('&')[0])
+            return FakeResponse(200, json.dumps({
+                'objects': [{'name': 'sp%d' % offset}],
+                'offset': offset,
+                'totalCount': 1000,
+                'limit': 1,
+            }))
+        c1.session.get.side_effect = slow_page
+
+        smc = SplitMicroClient(c1)
+        with pytest.raises(OperationTimeoutError):
+            with request_options(deadline=0.2):
+                smc.list('ws_id')
+        assert c1.session.get.call_count < 10
+
+        c1.session.get.reset_mock()
+        with pytest.raises(OperationTimeoutError):
+            with request_options(deadline=0.2):
+                smc.list('ws_id', parallel=4)
+        assert c1.session.get.call_count < 50
@@ -0,0 +1,57 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+from splitapiclient.util import endpoints as endpoints_module
+from splitapiclient.util.endpoints import compile_template, scoped_endpoint
+
+
+class TestEndpoints:
+    '''
+    '''
+
+    def test_compile_template(self):
+        '''
+        '''
+        compiled = compile_template('/items/{itemId}?account={account}&page={page}&id={itemId}')
+        assert compiled is compile_template('/items/{itemId}?account={account}&page={page}&id={itemId}')
+        assert compiled.params == ('account', 'itemId', 'page')
+        assert compiled.render({'itemId': 'i1', 'account': 'a', 'page': 2, 'extra': 'x'}) == \
+            '/items/i1?account=a&page=2&id=i1'
+        assert compile_template('/static').render({}) == '/static'
+
+    def test_scoped_endpoint(self):
+        '''
+        '''
+        endpoint = {
+            'method': 'GET',
+            'url_template': '/roles?accountIdentifier={accountIdentifier}'
+                            '&orgIdentifier={orgIdentifier}&projectIdentifier={projectIdentifier}',
+        }
+        assert scoped_endpoint(endpoint, orgIdentifier='o', projectIdentifier='p') is endpoint
+
+        account = scoped_endpoint(endpoint, orgIdentifier=None, projectIdentifier=None)
+        assert account['url_template'] == '/roles?accountIdentifier={accountIdentifier}'
+        assert account['method'] == 'GET'
+        assert scoped_endpoint(endpoint, projectIdentifier=None, orgIdentifier=None) is account
+
+        org = scoped_endpoint(endpoint, orgIdentifier='o', projectIdentifier=None)
+        assert org['url_template'] == '/roles?accountIdentifier={accountIdentifier}&orgIdentifier={orgIdentifier}'
+        # The original endpoint is left untouched
+        assert '{projectIdentifier}' in endpoint['url_template']
+
+        # Endpoints sharing a template keep their own variants
+        deleted = scoped_endpoint(dict(endpoint, method='DELETE'), orgIdentifier=None, projectIdentifier=None)
+        assert deleted['method'] == 'DELETE'
+        assert scoped_endpoint(endpoint, orgIdentifier=None, projectIdentifier=None) is account
+
+    def test_scoped_endpoint_cache_is_bounded(self, mocker):
+        '''
+        '''
+        mocker.patch('splitapiclient.util.endpoints.VARIANT_CACHE_SIZE', 2)
+        endpoints = [{'url_template': '/items?a={a}&org={org}', 'n': n} for n in range(4)]
+        variants = [scoped_endpoint(e, org=None) for e in endpoints]
+        assert len(endpoints_module._variants) <= 2
+        assert all(v['url_template'] == '/items?a={a}' for v in variants)
+        # The most recent ones are still shared, evicted ones are rebuilt
+        assert scoped_endpoint(endpoints[3], org=None) is variants[3]
+        assert scoped_endpoint(endpoints[0], org=None) == variants[0]
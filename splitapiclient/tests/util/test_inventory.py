@@ -0,0 +1,162 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import json
+from types import SimpleNamespace
+from splitapiclient.resources.harness import HarnessProject, HarnessUser, \
+    HarnessGroup, Role, RoleAssignment
+from splitapiclient.util.exceptions import HTTPResponseError
+from splitapiclient.util.inventory import crawl_rbac, INVENTORY_KINDS
+from splitapiclient.http_clients.base_client import BaseHttpClient
+from splitapiclient.microclients.harness import HarnessProjectMicroClient, \
+    HarnessUserMicroClient, HarnessGroupMicroClient, RoleMicroClient, \
+    ResourceGroupMicroClient, RoleAssignmentMicroClient, ServiceAccountMicroClient
+
+
+class TestRBACInventory:
+    '''
+    '''
+
+    def make_client(self, mocker):
+        client = mocker.Mock()
+        client.harness_project.list_scope.return_value = [
+            HarnessProject({'orgIdentifier': 'o1', 'identifier': 'p1'}),
+            HarnessProject({'orgIdentifier': 'o1', 'identifier': 'p2'}),
+        ]
+        client.harness_user.list_scope.return_value = [
+            HarnessUser({'uuid': 'u1', 'email': 'u1@example.com'}),
+            HarnessUser({'uuid': 'u1', 'email': 'u1@example.com'}),
+        ]
+
+        def assignments(acc, org, project):
+            if project == 'p2':
+                raise HTTPResponseError('forbidden')
+            if project is None:
+                return []
+            return [
+                RoleAssignment({
+                    'identifier': 'ra1', 'roleIdentifier': '_project_viewer',
+                    'resourceGroupIdentifier': 'rg1',
+                    'roleReference': {'identifier': '_project_viewer', 'scopeLevel': 'project'},
+                    'principal': {'identifier': 'u1', 'type': 'USER'},
+                }),
+                RoleAssignment({
+                    'identifier': 'ra2', 'roleIdentifier': 'auditor',
+                    'resourceGroupIdentifier': 'rg1',
+                    'roleReference': {'identifier': 'auditor', 'scopeLevel': 'account'},
+                    'principal': {'identifier': 'g1', 'type': 'USER_GROUP', 'scopeLevel': 'organization'},
+                }),
+            ]
+        client.role_assignment.list_scope.side_effect = assignments
+        client.harness_group.list_scope.side_effect = lambda acc, org, project: (
+            [HarnessGroup({'identifier': 'g1', 'users': ['u2', 'u1']})]
+            if org == 'o1' and project is None else []
+        )
+        client.service_account.list_scope.return_value = []
+        client.role.list_scope.side_effect = lambda acc, org, project: (
+            [Role({'identifier': 'auditor'})] if org is None else []
+        )
+        client.resource_group.list_scope.return_value = []
+        return client
+
+    def test_crawl(self, mocker, tmp_path):
+        '''
+        '''
+        mocker.patch('splitapiclient.util.bulk.time.sleep')
+        client = self.make_client(mocker)
+        inventory = crawl_rbac(client, 'acc', max_workers=4)
+
+        assert inventory.scopes == ['account', 'o1', 'o1/p1', 'o1/p2']
+        assert list(inventory.users) == ['u1']
+        assert inventory.groups['o1:g1']['users'] == ['u1', 'u2']
+        assert list(inventory.roles) == ['account:auditor']
+        assert inventory.assignments['o1/p1:ra1']['principal'] == 'u1'
+        assert inventory.assignments['o1/p1:ra1']['role'] == 'o1/p1:_project_viewer'
+        assignment = inventory.assignments['o1/p1:ra2']
+        assert assignment['principal'] == 'o1:g1'
+        assert assignment['role'] == 'account:auditor'
+        assert assignment['resource_group'] == 'o1/p1:rg1'
+        assert inventory.errors == [
+            {'kind': 'role_assignments', 'scope': 'o1/p2', 'error': 'forbidden'},
+        ]
+        client.role_assignment.list_scope.assert_any_call('acc', 'o1', 'p1')
+
+        path = str(tmp_path / 'inventory.json')
+        inventory.write(path)
+        with open(path) as stored:
+            assert json.load(stored)['assignments']['o1/p1:ra2']['principal'] == 'o1:g1'
+
+    def make_microclients(self, http_client, *defaults):
+        return SimpleNamespace(
+            harness_project=HarnessProjectMicroClient(http_client, *defaults),
+            harness_user=HarnessUserMicroClient(http_client, *defaults),
+            harness_group=HarnessGroupMicroClient(http_client, *defaults),
+            role=RoleMicroClient(http_client, *defaults),
+            resource_group=ResourceGroupMicroClient(http_client, *defaults),
+            role_assignment=RoleAssignmentMicroClient(http_client, *defaults),
+            service_account=ServiceAccountMicroClient(http_client, *defaults),
+        )
+
+    def test_crawl_reports_forbidden_scopes(self, mocker):
+        '''
+        '''
+        http_client = mocker.Mock(spec=BaseHttpClient)
+
+        def request(endpoint, **kwargs):
+            if kwargs.get('projectIdentifier') == 'p2':
+                raise HTTPResponseError('HTTP 403: forbidden', mocker.Mock(status_code=403))
+            if endpoint['url_template'].startswith('/ng/api/serviceaccount'):
+                return {'data': [{'identifier': 'sa1'}]}
+            if endpoint['url_template'].startswith('/ng/api/projects'):
+                return {'data': {'content': [
+                    {'project': {'orgIdentifier': 'o1', 'identifier': 'p1'}},
+                    {'project': {'orgIdentifier': 'o1', 'identifier': 'p2'}},
+                ], 'totalPages': 1}}
+            return {'data': {'content': [], 'totalPages': 1}}
+        http_client.make_request.side_effect = request
+        client = self.make_microclients(http_client)
+
+        inventory = crawl_rbac(client, 'acc', max_workers=4)
+        assert inventory.scopes == ['account', 'o1', 'o1/p1', 'o1/p2']
+        # The forbidden project is reported, not shown as empty
+        assert sorted(error['kind'] for error in inventory.errors) == sorted(INVENTORY_KINDS)
+        assert all(error['scope'] == 'o1/p2' for error in inventory.errors)
+        assert all('403' in error['error'] for error in inventory.errors)
+        assert 'o1/p1:sa1' in inventory.service_accounts
+        assert 'o1/p2:sa1' not in inventory.service_accounts
+
+    def test_crawl_ignores_client_default_scope(self, mocker):
+        '''
+        '''
+        http_client = mocker.Mock(spec=BaseHttpClient)
+        queried = []
+
+        def request(endpoint, **kwargs):
+            scope = (kwargs.get('orgIdentifier'), kwargs.get('projectIdentifier'))
+            for name, value in zip(('orgIdentifier', 'projectIdentifier'), scope):
+                # Omitted parameters must also be left out of the url
+                assert (value is None) == ('{%s}' % name not in endpoint['url_template'])
+            template = endpoint['url_template']
+            queried.append((template.split('?')[0], scope))
+            if template.startswith('/ng/api/projects'):
+                return {'data': {'content': [
+                    {'project': {'orgIdentifier': 'o1', 'identifier': 'p1'}},
+                    {'project': {'orgIdentifier': 'o2', 'identifier': 'p3'}},
+                ], 'totalPages': 1}}
+            if template.startswith('/ng/api/serviceaccount'):
+                return {'data': [{'identifier': 'sa-%s-%s' % scope}]}
+            return {'data': {'content': [], 'totalPages': 1}}
+        http_client.make_request.side_effect = request
+        # The client defaults to o1/p1, the crawl must not inherit them
+        client = self.make_microclients(http_client, 'acc', 'o1', 'p1')
+
+        inventory = crawl_rbac(client, 'acc', max_workers=4)
+        assert inventory.scopes == ['account', 'o1', 'o2', 'o1/p1', 'o2/p3']
+        assert inventory.errors == []
+        assert ('/ng/api/projects', (None, None)) in queried
+        scopes = set(scope for path, scope in queried if not path.startswith('/ng/api/projects'))
+        assert scopes == set([(None, None), ('o1', None), ('o2', None), ('o1', 'p1'), ('o2', 'p3')])
+        assert sorted(inventory.service_accounts) == [
+            'account:sa-None-None', 'o1/p1:sa-o1-p1', 'o1:sa-o1-None',
+            'o2/p3:sa-o2-p3', 'o2:sa-o2-None',
+        ]
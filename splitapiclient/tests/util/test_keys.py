@@ -0,0 +1,100 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import pytest
+from splitapiclient.util.keys import iter_keys_from_file, dedupe_keys, \
+    key_file_format, diff_keys, KeySpool, unique_keys, prepare_key_file
+from splitapiclient.util.exceptions import InvalidArgumentException
+
+
+class TestKeys:
+    '''
+    '''
+
+    def test_formats(self, tmp_path):
+        '''
+        '''
+        csv_file = tmp_path / 'keys.csv'
+        csv_file.write_text('k1\nk2\n|k,3|\n\n')
+        assert list(iter_keys_from_file(str(csv_file))) == ['k1', 'k2', 'k,3']
+
+        csv_file.write_text('id,key\n1,k1\n2,k2\n')
+        assert list(iter_keys_from_file(str(csv_file), column='key')) == ['k1', 'k2']
+        with pytest.raises(InvalidArgumentException):
+            list(iter_keys_from_file(str(csv_file), column='missing'))
+
+        ndjson_file = tmp_path / 'keys.ndjson'
+        ndjson_file.write_text('"k1"\n{"key": "k2"}\n\n{"other": 1}\n42\n')
+        assert list(iter_keys_from_file(str(ndjson_file))) == ['k1', 'k2', '42']
+
+        txt_file = tmp_path / 'keys.dat'
+        txt_file.write_text(' k1 \n\nk2\n')
+        assert list(iter_keys_from_file(str(txt_file))) == ['k1', 'k2']
+
+        assert key_file_format('a.JSONL') == 'ndjson'
+        with pytest.raises(InvalidArgumentException):
+            key_file_format('a.csv', 'xml')
+
+    def test_dedupe_keys(self):
+        '''
+        '''
+        keys = ['a', 'b', 'a', 'c', 'b', 'd', 'a']
+        assert list(dedupe_keys(keys, window=None)) == ['a', 'b', 'c', 'd']
+        assert list(dedupe_keys(keys, window=10)) == ['a', 'b', 'c', 'd']
+        # 'a' falls out of a 2 keys window before it shows up again
+        assert list(dedupe_keys(['a', 'b', 'c', 'a'], window=2)) == ['a', 'b', 'c', 'a']
+
+    def test_diff_keys(self):
+        '''
+        '''
+        current = ['a', 'b', 'c', 'd']
+        desired = ['c', 'd', 'e', 'e', 'f']
+        with diff_keys(iter(current), iter(desired)) as diff:
+            assert sorted(diff.to_add) == ['e', 'f']
+            assert sorted(diff.to_remove) == ['a', 'b']
+            assert diff.unchanged == 2
+
+    def test_diff_keys_spilled(self):
+        '''
+        '''
+        current = ('k%d' % i for i in range(0, 300))
+        desired = ('k%d' % i for i in range(100, 400))
+        with diff_keys(current, desired, max_keys_in_memory=20, partitions=4) as diff:
+            assert diff.to_add._file is not None
+            assert sorted(diff.to_add) == sorted('k%d' % i for i in range(300, 400))
+            assert sorted(diff.to_remove) == sorted('k%d' % i for i in range(0, 100))
+            assert diff.unchanged == 200
+
+    def test_key_spool(self):
+        '''
+        '''
+        spool = KeySpool(limit=2)
+        for key in ['a', 'b', 'c\nd', 'e']:
+            spool.append(key)
+        assert len(spool) == 4
+        assert list(spool) == ['a', 'b', 'c\nd', 'e']
+        spool.append('f')
+        assert list(spool) == ['a', 'b', 'c\nd', 'e', 'f']
+        spool.close()
+
+    def test_unique_keys(self):
+        '''
+        '''
+        keys = ['k%d' % (i % 50) for i in range(200)]
+        assert sorted(unique_keys(keys)) == sorted(set(keys))
+        assert sorted(unique_keys(iter(keys), max_keys_in_memory=8)) == sorted(set(keys))
+
+    def test_prepare_key_file(self, tmp_path):
+        '''
+        '''
+        source = tmp_path / 'keys.txt'
+        source.write_text(' a \nb\na\n%s\nc\nb\nd|e\n' % ('x' * 300))
+        destination = str(tmp_path / 'keys.csv')
+        report = prepare_key_file(str(source), destination)
+        assert (report.total, report.unique, report.duplicates, report.invalid) == (7, 3, 2, 2)
+        assert report.duplicate_rate == 0.4
+        assert [reason for _, reason in report.invalid_samples] == [
+            'longer than 250 characters', 'contains csv delimiter or quote characters'
+        ]
+        with open(destination) as prepared:
+            assert sorted(prepared.read().split('\n')) == ['', 'a', 'b', 'c']
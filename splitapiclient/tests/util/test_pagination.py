@@ -0,0 +1,148 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import threading
+from splitapiclient.util import pagination
+from splitapiclient.util.pagination import offset_pages, marker_pages, \
+    limit_pages, index_pages, page_workers
+
+
+def _fake_endpoint(total, limit, calls, items_key='objects', total_key='totalCount'):
+    '''
+    Returns a fetch_page function serving `total` sequential integers.
+    '''
+    lock = threading.Lock()
+
+    def fetch_page(offset):
+        with lock:
+            calls.append(offset)
+        return {
+            items_key: list(range(offset, min(offset + limit, total))),
+            'offset': offset,
+            total_key: total,
+            'limit': limit,
+        }
+    return fetch_page
+
+
+class TestPagination:
+    '''
+    '''
+
+    def test_page_workers(self):
+        '''
+        '''
+        assert page_workers(False) == 1
+        assert page_workers(None) == 1
+        assert page_workers(True) == pagination.DEFAULT_PAGE_WORKERS
+        assert page_workers(3) == 3
+
+    def test_sequential(self):
+        '''
+        '''
+        calls = []
+        pages = list(offset_pages(_fake_endpoint(45, 20, calls)))
+        assert calls == [0, 20, 40]
+        assert [i for p in pages for i in p] == list(range(45))
+
+    def test_parallel_keeps_order(self):
+        '''
+        '''
+        calls = []
+        pages = list(offset_pages(_fake_endpoint(1005, 20, calls), parallel=4))
+        assert sorted(calls) == list(range(0, 1005, 20))
+        assert calls[0] == 0
+        assert [i for p in pages for i in p] == list(range(1005))
+
+    def test_custom_keys(self):
+        '''
+        '''
+        calls = []
+        fetch = _fake_endpoint(250, 100, calls, items_key='keys', total_key='count')
+        pages = list(offset_pages(fetch, items_key='keys', total_key='count', parallel=True))
+        assert [len(p) for p in pages] == [100, 100, 50]
+
+    def test_single_page(self):
+        '''
+        '''
+        calls = []
+        pages = list(offset_pages(_fake_endpoint(5, 20, calls), parallel=True))
+        assert calls == [0]
+        assert pages == [[0, 1, 2, 3, 4]]
+
+    def test_marker_pages(self):
+        '''
+        '''
+        responses = {
+            None: {'data': [1, 2], 'nextMarker': 'a'},
+            'a': {'data': [3], 'nextMarker': 'b'},
+            'b': {'data': [4], 'nextMarker': None},
+        }
+        calls = []
+
+        def fetch_page(marker):
+            calls.append(marker)
+            return responses[marker]
+
+        assert list(marker_pages(fetch_page)) == [[1, 2], [3], [4]]
+        assert calls == [None, 'a', 'b']
+
+    def test_limit_pages(self):
+        '''
+        '''
+        calls = []
+
+        def fetch_page(offset):
+            calls.append(offset)
+            return list(range(offset, min(offset + 2, 5)))
+
+        assert list(limit_pages(fetch_page, 2)) == [[0, 1], [2, 3], [4]]
+        assert calls == [0, 2, 4]
+
+    def test_pages_are_lazy(self):
+        '''
+        '''
+        calls = []
+        pages = offset_pages(_fake_endpoint(100, 20, calls))
+        assert next(pages) == list(range(20))
+        assert calls == [0]
+
+    def test_index_pages(self):
+        '''
+        '''
+        lock = threading.Lock()
+        calls = []
+
+        def fetch_page(page_index):
+            with lock:
+                calls.append(page_index)
+            return {
+                'content': list(range(page_index * 10, min(page_index * 10 + 10, 95))),
+                'pageIndex': page_index, 'pageSize': 10, 'totalItems': 95, 'totalPages': 10,
+            }
+
+        pages = list(index_pages(fetch_page, parallel=3))
+        assert [item for page in pages for item in page] == list(range(95))
+        # No trailing empty page is requested
+        assert sorted(calls) == list(range(10))
+
+        del calls[:]
+        assert len(list(index_pages(fetch_page))) == 10
+        assert calls == list(range(10))
+
+    def test_index_pages_without_page_count(self):
+        '''
+        '''
+        calls = []
+
+        def fetch_page(page_index):
+            calls.append(page_index)
+            return {'content': [page_index] if page_index < 2 else []}
+
+        assert list(index_pages(fetch_page, parallel=True)) == [[0], [1]]
+        assert calls == [0, 1, 2]
+
+        # Stops when the endpoint ignores the page index
+        del calls[:]
+        assert list(index_pages(lambda page_index: calls.append(page_index) or {'content': [1]})) == [[1]]
+        assert calls == [0, 1]
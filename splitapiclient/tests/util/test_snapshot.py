@@ -0,0 +1,99 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import pytest
+from splitapiclient.resources import SplitDefinition, Environment
+from splitapiclient.util.snapshot import WorkspaceSnapshot
+from splitapiclient.util.exceptions import InvalidArgumentException
+
+
+def definition(name, updated):
+    return {'name': name, 'rules': [], 'defaultRule': [], 'lastUpdateTime': updated}
+
+
+class TestWorkspaceSnapshot:
+    '''
+    '''
+
+    def make_client(self, mocker, definitions):
+        client = mocker.Mock()
+        client.environments.iter_raw.return_value = [{'id': 'e1', 'name': 'prod'}]
+        client.splits.iter_raw.return_value = [{'name': 'sp1'}, {'name': 'sp2'}]
+        client.segments.iter_raw.return_value = []
+        client.rule_based_segments.iter_raw.return_value = []
+        client.flag_sets.iter_raw.return_value = [{'id': 'f1', 'name': 'fs1'}]
+        client.split_definitions.iter_raw.side_effect = lambda env, ws, parallel: list(definitions)
+        client.segment_definitions.iter_raw.return_value = [{'name': 'seg1'}]
+        return client
+
+    def test_refresh_and_offline_queries(self, mocker, tmp_path):
+        '''
+        '''
+        definitions = [definition('sp1', 1), definition('sp2', 1)]
+        client = self.make_client(mocker, definitions)
+        path = str(tmp_path / 'ws.db')
+        with WorkspaceSnapshot(client, 'ws1', path) as snapshot:
+            summary = snapshot.refresh()
+            assert summary['split_definitions'] == {'added': 2, 'changed': 0, 'removed': 0}
+            assert summary['errors'] == []
+            client.split_definitions.iter_raw.assert_called_once_with('e1', 'ws1', parallel=True)
+
+        # Reopened offline, no requests needed
+        offline = WorkspaceSnapshot(mocker.Mock(), 'ws1', path)
+        assert offline.refreshed_at is not None
+        assert [e.name for e in offline.list('environments')] == ['prod']
+        assert isinstance(offline.find('environments', 'prod'), Environment)
+        found = offline.find('split_definitions', 'sp2', 'e1')
+        assert isinstance(found, SplitDefinition)
+        assert found.last_update_time == 1
+        assert offline.find('split_definitions', 'sp3', 'e1') is None
+        assert offline.find('segment_definitions', 'seg1', 'e1').environment['id'] == 'e1'
+        with pytest.raises(InvalidArgumentException):
+            offline.list('split_definitions')
+        offline.close()
+
+    def test_incremental_refresh(self, mocker):
+        '''
+        '''
+        definitions = [definition('sp1', 1), definition('sp2', 1)]
+        client = self.make_client(mocker, definitions)
+        snapshot = WorkspaceSnapshot(client, 'ws1')
+        snapshot.refresh()
+
+        definitions[:] = [definition('sp1', 1), definition('sp2', 5), definition('sp3', 5)]
+        client.splits.iter_raw.return_value = [{'name': 'sp1'}]
+        summary = snapshot.refresh()
+        assert summary['split_definitions'] == {'added': 1, 'changed': 1, 'removed': 0}
+        assert summary['splits'] == {'added': 0, 'changed': 0, 'removed': 1}
+        assert summary['flag_sets'] == {'added': 0, 'changed': 0, 'removed': 0}
+
+        client.segments.iter_raw.side_effect = Exception('down')
+        summary = snapshot.refresh(kinds=['segments', 'split_definitions'])
+        assert summary['errors'][0][0] == ('segments', None)
+        assert [d.name for d in snapshot.list('split_definitions', 'e1')] == ['sp1', 'sp2', 'sp3']
+
+    def test_refresh_purges_deleted_environments(self, mocker):
+        '''
+        '''
+        client = self.make_client(mocker, [definition('sp1', 1)])
+        client.environments.iter_raw.return_value = [
+            {'id': 'e1', 'name': 'prod'}, {'id': 'e2', 'name': 'staging'}
+        ]
+        snapshot = WorkspaceSnapshot(client, 'ws1')
+        snapshot.refresh()
+        assert [d.name for d in snapshot.list('split_definitions', 'e2')] == ['sp1']
+
+        # A failed environments listing keeps every environment's objects
+        client.environments.iter_raw.side_effect = Exception('down')
+        summary = snapshot.refresh(kinds=['split_definitions'])
+        assert summary['errors'][0][0] == ('environments', None)
+        assert snapshot.find('segment_definitions', 'seg1', 'e2') is not None
+
+        client.environments.iter_raw.side_effect = None
+        client.environments.iter_raw.return_value = [{'id': 'e1', 'name': 'prod'}]
+        summary = snapshot.refresh(kinds=['split_definitions'])
+        assert summary['environments']['removed'] == 1
+        assert summary['split_definitions']['removed'] == 1
+        assert snapshot.list('split_definitions', 'e2') == []
+        assert snapshot.list('segment_definitions', 'e2') == []
+        assert [d.name for d in snapshot.list('split_definitions', 'e1')] == ['sp1']
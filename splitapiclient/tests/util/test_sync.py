@@ -0,0 +1,89 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+from splitapiclient.util.sync import content_digest, DefinitionSyncState
+
+
+def definition(name, updated, **fields):
+    data = {'name': name, 'rules': [], 'defaultRule': [], 'lastUpdateTime': updated}
+    data.update(fields)
+    return data
+
+
+def pairs(items):
+    return [(item, item['name']) for item in items]
+
+
+class TestContentDigest:
+    '''
+    '''
+
+    def test_digest_ignores_key_order_and_volatile_fields(self):
+        '''
+        '''
+        a = {'name': 'sp1', 'rules': [1], 'lastTrafficReceivedAt': 1}
+        b = {'rules': [1], 'name': 'sp1', 'lastTrafficReceivedAt': 2}
+        assert content_digest(a) == content_digest(b)
+        assert content_digest(a, exclude=()) != content_digest(b, exclude=())
+        assert content_digest(a) != content_digest(dict(a, rules=[2]))
+
+
+class TestDefinitionSyncState:
+    '''
+    '''
+
+    def test_apply_reports_differences(self):
+        '''
+        '''
+        state = DefinitionSyncState()
+        changes = state.apply('e1', pairs([definition('sp1', 1), definition('sp2', 5)]))
+        assert changes.added == ['sp1', 'sp2']
+        assert sorted(state.environments['e1']['definitions']) == ['sp1', 'sp2']
+
+        changes = state.apply('e1', pairs([
+            definition('sp1', 1),
+            definition('sp2', 7, rules=[{'treatment': 'on'}]),
+            definition('sp3', 6),
+        ]))
+        assert changes.added == ['sp3']
+        assert changes.changed == ['sp2']
+        assert changes.removed == []
+
+        # Traffic alone isn't reported as a change
+        changes = state.apply('e1', pairs([
+            definition('sp2', 7, rules=[{'treatment': 'on'}]),
+            definition('sp3', 6),
+            definition('sp4', None),
+        ]))
+        assert changes.added == ['sp4']
+        assert changes.removed == ['sp1']
+        changes = state.apply('e1', pairs([
+            definition('sp2', 7, rules=[{'treatment': 'on'}]),
+            definition('sp3', 6),
+            definition('sp4', None, lastTrafficReceivedAt=9),
+        ]))
+        assert not changes
+        assert 'e2' not in state.environments
+
+    def test_unchanged_definitions_are_not_hashed(self, mocker):
+        '''
+        '''
+        state = DefinitionSyncState()
+        state.apply('e1', pairs([definition('sp1', 1)]))
+        digest = mocker.patch('splitapiclient.util.sync.content_digest')
+        changes = state.apply('e1', pairs([definition('sp1', 1)]))
+        assert not changes
+        digest.assert_not_called()
+
+    def test_save_and_load(self, tmp_path):
+        '''
+        '''
+        path = str(tmp_path / 'state.json')
+        assert DefinitionSyncState.load(path).environments == {}
+        state = DefinitionSyncState()
+        state.apply('e1', pairs([definition('sp1', 1)]))
+        state.save(path)
+
+        loaded = DefinitionSyncState.load(path)
+        assert loaded.environments == state.environments
+        assert not loaded.apply('e1', pairs([definition('sp1', 1)]))
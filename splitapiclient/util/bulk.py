@@ -0,0 +1,211 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from itertools import islice
+from splitapiclient.util.bulk_result import BatchResult, BulkOperationResult, \
+    ItemResult
+from splitapiclient.util.exceptions import HTTPResponseError, \
+    SplitBackendUnreachableError
+from splitapiclient.util.logger import LOGGER
+
+
+DEFAULT_BULK_WORKERS = 4
+DEFAULT_ITEM_ATTEMPTS = 3
+# Runs per item of bulk writes. The http client's retry policy already
+# retries each request, so a write is only run again when it's still rate
+# limited afterwards (see is_rate_limited).
+DEFAULT_WRITE_ATTEMPTS = 1
+ITEM_RETRY_BACKOFF = 0.5
+
+
+def iter_batches(items, batch_size):
+    '''
+    Splits any iterable (including generators) into lists of at most
+    `batch_size` items without materializing the whole input.
+
+    :param items: iterable. Items to split.
+    :param batch_size: int. Maximum batch length.
+
+    :rtype: generator(tuple(int, list))
+    :returns: (start position, batch items) tuples
+    '''
+    iterator = iter(items)
+    start = 0
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield start, batch
+        start += len(batch)
+
+
+def _run_batch(operation, index, start, items):
+    '''
+    Runs a single batch, capturing any error in its BatchResult.
+    '''
+    try:
+        return BatchResult(index, start, items, value=operation(index, items))
+    except Exception as e:
+        LOGGER.error('Batch %d (items %d to %d) failed: %s' % (
+            index, start, start + len(items), e
+        ))
+        return BatchResult(index, start, items, error=e)
+
+
+def run_batches(batches, operation, max_workers=DEFAULT_BULK_WORKERS,
+                first_alone=False, on_batch=None):
+    '''
+    Runs `operation` on every batch over a bounded worker pool and reports
+    the outcome of each one, in batch order. At most twice the number of
+    workers batches are pulled from `batches` at any time, so generators
+    are consumed lazily.
+    Workers run in a copy of the caller's context, so `request_options`
+    timeouts and deadlines apply to them.
+
+    :param batches: iterable of (start position, items) tuples, usually
+        produced by `iter_batches`.
+    :param operation: callable. Receives the batch index and its items.
+        Exceptions mark the batch as failed without stopping the others.
+    :param max_workers: int. Number of batches in flight.
+    :param first_alone: bool. Run the first batch before any other one and
+        abort the operation if it fails (e.g. when it replaces existing
+        data). Aborted results have metadata['aborted'] set.
+    :param on_batch: callable. Receives every BatchResult, in batch order,
+        as it completes. When given, batches aren't kept in the result, so
+        their items and values can be released as the operation goes.
+
+    :rtype: BulkOperationResult
+    '''
+    result = BulkOperationResult()
+    add_batch = on_batch if on_batch is not None else result.add_batch
+    batches = iter(batches)
+    index = 0
+    if first_alone:
+        first = next(batches, None)
+        if first is None:
+            return result
+        batch = _run_batch(operation, 0, *first)
+        add_batch(batch)
+        if not batch.success:
+            result.metadata['aborted'] = True
+            return result
+        index = 1
+
+    def calls():
+        for position, (start, items) in enumerate(batches, index):
+            yield _run_batch, (operation, position, start, items)
+
+    for batch in _bounded_map(calls(), max_workers):
+        add_batch(batch)
+    return result
+
+
+def _bounded_map(calls, max_workers):
+    '''
+    Runs (function, args) calls over a pool of `max_workers` threads and
+    yields their results in submission order. At most twice the number of
+    workers calls are pulled from `calls` at any time, and each one runs in
+    a copy of the caller's context so `request_options` apply to it.
+    '''
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    in_flight = deque()
+    try:
+        for function, args in calls:
+            in_flight.append(executor.submit(copy_context().run, function, *args))
+            while len(in_flight) >= max_workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+    finally:
+        executor.shutdown(wait=True)
+
+
+def is_retryable_error(error):
+    '''
+    Tells whether a failed call is worth repeating: connection problems,
+    timeouts, rate limiting and server errors are; client errors (bad
+    parameters, not found, unauthorized) aren't.
+
+    :param error: Exception raised by the call.
+
+    :rtype: bool
+    '''
+    if isinstance(error, SplitBackendUnreachableError):
+        return True
+    if isinstance(error, HTTPResponseError):
+        status = getattr(getattr(error, '_error', None), 'status_code', None)
+        return status is None or status == 429 or status >= 500
+    return False
+
+
+def is_rate_limited(error):
+    '''
+    Tells whether a call was rejected by rate limiting, meaning the server
+    didn't act on it. Safe to repeat even for non idempotent calls.
+
+    :param error: Exception raised by the call.
+
+    :rtype: bool
+    '''
+    if isinstance(error, HTTPResponseError):
+        return getattr(getattr(error, '_error', None), 'status_code', None) == 429
+    return False
+
+
+def _run_item(operation, index, item, attempts, retryable):
+    '''
+    Runs the operation on a single item, repeating it with exponential
+    backoff while it fails with a retryable error.
+    '''
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            value = operation(item)
+        except Exception as e:
+            if attempt < attempts and retryable(e):
+                LOGGER.warning('Item %d failed on attempt %d, retrying: %s' % (index, attempt, e))
+                time.sleep(ITEM_RETRY_BACKOFF * 2 ** (attempt - 1))
+                continue
+            LOGGER.error('Item %d failed: %s' % (index, e))
+            return ItemResult(index, item, error=e, attempts=attempt,
+                              elapsed=time.monotonic() - started)
+        return ItemResult(index, item, value=value, attempts=attempt,
+                          elapsed=time.monotonic() - started)
+
+
+def run_each(items, operation, max_workers=DEFAULT_BULK_WORKERS,
+             attempts=DEFAULT_ITEM_ATTEMPTS, retryable=is_retryable_error):
+    '''
+    Runs `operation` on every item over a bounded worker pool, reporting
+    the outcome, attempts and duration of each one in input order. Items
+    failing with a retryable error (see `is_retryable_error`) are repeated
+    up to `attempts` times; this is on top of the request level retries of
+    the http client.
+
+    :param items: iterable of items, consumed lazily.
+    :param operation: callable. Receives an item. Exceptions mark the item
+        as failed without stopping the others.
+    :param max_workers: int. Number of items in flight.
+    :param attempts: int. Maximum number of runs per item.
+    :param retryable: callable. Tells whether an exception is worth another
+        attempt; use `is_rate_limited` for operations that aren't idempotent.
+
+    :rtype: BulkOperationResult
+    :returns: result holding ItemResult objects, with the total 'elapsed'
+        seconds in its metadata.
+    '''
+    started = time.monotonic()
+    result = BulkOperationResult()
+    calls = (
+        (_run_item, (operation, index, item, attempts, retryable))
+        for index, item in enumerate(items)
+    )
+    for item_result in _bounded_map(calls, max_workers):
+        result.add_batch(item_result)
+    result.metadata['elapsed'] = time.monotonic() - started
+    return result
@@ -20,3 +20,128 @@ class BulkOperationResult:
     @property
     def metadata(self):
         return self._metadata
+
+    @property
+    def success(self):
+        '''
+        True when nothing failed and the operation wasn't aborted.
+
+        :rtype: bool
+        '''
+        return not self._failed and not self._metadata.get('aborted', False)
+
+    def add_batch(self, batch):
+        '''
+        Records the outcome of a batch of a batched operation, or of an item
+        of a per item operation, in which case successful and failed hold
+        BatchResult or ItemResult objects.
+
+        :param batch: BatchResult/ItemResult
+        '''
+        if batch.success:
+            self._successful.append(batch)
+        else:
+            self._failed.append(batch)
+
+    @property
+    def failed_ranges(self):
+        '''
+        Input ranges [start, end) of the failed batches, or [index, index + 1)
+        of the failed items. Failed items reported as {'object', 'status',
+        'message'} are only covered when they carry their input 'index'.
+
+        :rtype: list(tuple)
+        '''
+        ranges = []
+        for failure in self._failed:
+            if isinstance(failure, BatchResult):
+                ranges.append((failure.start, failure.end))
+                continue
+            index = failure.index if isinstance(failure, ItemResult) else failure.get('index')
+            if index is not None:
+                ranges.append((index, index + 1))
+        return ranges
+
+    def failed_items(self):
+        '''
+        Yields the items of every failed batch, or the objects of failed
+        items reported as {'object', 'status', 'message'}, so they can be
+        retried.
+
+        :rtype: generator
+        '''
+        for failure in self._failed:
+            if isinstance(failure, BatchResult):
+                for item in failure.items:
+                    yield item
+            elif isinstance(failure, ItemResult):
+                yield failure.item
+            else:
+                yield failure['object']
+
+
+class BatchResult:
+    '''
+    Outcome of a single batch of a batched bulk operation, covering the
+    items in positions [start, end) of the operation's input.
+    '''
+
+    def __init__(self, index, start, items, value=None, error=None):
+        '''
+        :param index: position of the batch in the operation
+        :param start: position of the batch's first item in the input
+        :param items: items of the batch, only kept when it failed
+        :param value: value returned by the batch call
+        :param error: exception raised by the batch call, if any
+        '''
+        self.index = index
+        self.start = start
+        self.end = start + len(items)
+        self.value = value
+        self.error = error
+        self.items = items if error is not None else None
+
+    @property
+    def size(self):
+        return self.end - self.start
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def __repr__(self):
+        return 'BatchResult(index=%d, range=[%d, %d), success=%s)' % (
+            self.index, self.start, self.end, self.success
+        )
+
+
+class ItemResult:
+    '''
+    Outcome of a single item of a per item bulk operation.
+    '''
+
+    def __init__(self, index, item, value=None, error=None, attempts=1,
+                 elapsed=0.0):
+        '''
+        :param index: position of the item in the operation's input
+        :param item: the item itself
+        :param value: value returned by the item's call
+        :param error: exception raised by the last attempt, if any
+        :param attempts: number of times the call was made
+        :param elapsed: seconds spent on the item, retries included
+        '''
+        self.index = index
+        self.item = item
+        self.value = value
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def __repr__(self):
+        return 'ItemResult(index=%d, item=%r, success=%s, attempts=%d, elapsed=%.3f)' % (
+            self.index, self.item, self.success, self.attempts, self.elapsed
+        )
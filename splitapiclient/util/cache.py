@@ -0,0 +1,151 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_MAXSIZE = 1024
+
+
+class TTLCache:
+    '''
+    Thread safe in-process cache with per entry time-to-live and least
+    recently used eviction. Used by microclients to avoid listing a whole
+    collection every time a name has to be resolved to an object.
+    '''
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, maxsize=DEFAULT_CACHE_MAXSIZE):
+        '''
+        Class constructor.
+
+        :param ttl: float. Seconds an entry stays valid.
+        :param maxsize: int. Maximum number of entries kept; the least
+            recently used one is evicted when it is exceeded.
+        '''
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @classmethod
+    def from_config(cls, config):
+        '''
+        Builds the cache requested through the 'lookup_cache' key of the
+        `get_client` config: True for defaults, a dict of constructor
+        arguments or a TTLCache instance. Returns None when caching is off.
+
+        :param config: dict. Client configuration.
+
+        :rtype: TTLCache/None
+        '''
+        cache = config.get('lookup_cache')
+        if isinstance(cache, cls):
+            return cache
+        if not cache:
+            return None
+        if cache is True:
+            return cls()
+        return cls(**cache)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        '''
+        Returns the value cached under `key`, or `default` when it is
+        missing or expired.
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, value):
+        '''
+        Caches `value` under `key`, evicting the least recently used entries
+        if the cache is full.
+        '''
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(self, key, loader):
+        '''
+        Read-through access: returns the cached value or calls `loader`,
+        caches and returns its result.
+
+        :param key: hashable. Cache key.
+        :param loader: callable. Fetches the value on a miss.
+        '''
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        '''
+        Drops the entry cached under `key`, if any.
+        '''
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def invalidate_where(self, predicate):
+        '''
+        Drops every entry whose key matches `predicate`.
+
+        :param predicate: callable. Receives a key, returns a bool.
+        '''
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+                self._invalidations += 1
+
+    def clear(self):
+        '''
+        Drops every entry.
+        '''
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        '''
+        Returns hit/miss counters and the current size.
+
+        :rtype: dict
+        '''
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._invalidations,
+                'size': len(self._entries),
+            }
@@ -0,0 +1,175 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import contextvars
+import time
+from contextlib import contextmanager
+from splitapiclient.util.exceptions import OperationTimeoutError
+
+
+class Deadline:
+    '''
+    Point in time after which an operation (usually made of several http
+    requests, like a paginated listing) must stop.
+    '''
+
+    def __init__(self, seconds):
+        '''
+        Class constructor.
+
+        :param seconds: float. Time budget, starting now.
+        '''
+        self._seconds = float(seconds)
+        self._expires_at = time.monotonic() + self._seconds
+
+    @classmethod
+    def coerce(cls, value):
+        '''
+        Returns a Deadline from a number of seconds, or the value itself if it
+        already is a Deadline (or None).
+
+        :rtype: Deadline/None
+        '''
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @property
+    def seconds(self):
+        return self._seconds
+
+    def remaining(self):
+        '''
+        Seconds left before the deadline (never negative).
+
+        :rtype: float
+        '''
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self):
+        '''
+        :rtype: bool
+        '''
+        return self.remaining() <= 0
+
+    def check(self):
+        '''
+        Raises OperationTimeoutError if the deadline has passed.
+        '''
+        if self.expired():
+            raise OperationTimeoutError(
+                'Operation deadline of %.2f seconds exceeded' % self._seconds
+            )
+
+    def cap(self, timeout):
+        '''
+        Shrinks a requests timeout (a number or a (connect, read) tuple) so
+        that a single request can't outlive the deadline.
+
+        :rtype: float/tuple
+        '''
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(
+                remaining if t is None else min(t, remaining) for t in timeout
+            )
+        return min(timeout, remaining)
+
+    def earliest(self, other):
+        '''
+        Returns whichever of both deadlines expires first.
+
+        :rtype: Deadline
+        '''
+        if other is None:
+            return self
+        return self if self._expires_at <= other._expires_at else other
+
+
+class RequestOptions:
+    '''
+    Options applied to every http request made within a `request_options`
+    block.
+    '''
+
+    def __init__(self, timeout=None, deadline=None, priority=False):
+        '''
+        Class constructor.
+
+        :param timeout: float/tuple. Per request timeout override.
+        :param deadline: Deadline. Overall operation deadline.
+        :param priority: bool. Skip the client side rate limiter.
+        '''
+        self.timeout = timeout
+        self.deadline = deadline
+        self.priority = priority
+
+
+_current_options = contextvars.ContextVar(
+    'splitapiclient_request_options', default=None
+)
+
+
+def current_options():
+    '''
+    Returns the RequestOptions of the innermost active `request_options`
+    block, or None.
+
+    :rtype: RequestOptions/None
+    '''
+    return _current_options.get()
+
+
+def resolve_request_options(default_timeout):
+    '''
+    Returns the timeout and deadline that apply to a request sent now, given
+    the http client's default timeout.
+
+    :param default_timeout: float/tuple. Client level timeout.
+
+    :rtype: tuple(float/tuple, Deadline/None)
+    '''
+    options = _current_options.get()
+    if options is None:
+        return default_timeout, None
+    timeout = options.timeout if options.timeout is not None else default_timeout
+    return timeout, options.deadline
+
+
+@contextmanager
+def request_options(timeout=None, deadline=None, priority=None):
+    '''
+    Context manager overriding the request timeout and/or bounding the
+    total duration of every call made inside the block, including all the
+    pages of a listing and the retries of each request.
+
+        with request_options(timeout=(3, 10), deadline=60):
+            splits = client.splits.list(workspace_id, parallel=True)
+
+    Nested blocks keep the earliest deadline. The options follow the
+    context into pagination workers and async client calls.
+
+    :param timeout: float/tuple. Connect and read timeout in seconds, either
+        a single number or a (connect, read) tuple.
+    :param deadline: float/Deadline. Seconds the whole block may take.
+    :param priority: bool. Send the block's requests without waiting for
+        the retry policy's client side token bucket (server rate limits
+        still apply). Meant for urgent operations such as kill_many.
+    '''
+    parent = _current_options.get()
+    deadline = Deadline.coerce(deadline)
+    if parent is not None:
+        if deadline is None:
+            deadline = parent.deadline
+        elif parent.deadline is not None:
+            deadline = deadline.earliest(parent.deadline)
+        if timeout is None:
+            timeout = parent.timeout
+        if priority is None:
+            priority = parent.priority
+    token = _current_options.set(RequestOptions(timeout, deadline, bool(priority)))
+    try:
+        yield _current_options.get()
+    finally:
+        _current_options.reset(token)
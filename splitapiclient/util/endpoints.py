@@ -0,0 +1,100 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from string import Formatter
+
+
+class CompiledTemplate:
+    '''
+    URL template split once into literal parts and placeholders, so a URL is
+    built by joining them instead of parsing the template on every request.
+    '''
+
+    def __init__(self, template):
+        '''
+        :param template: string. URL template with {name} placeholders.
+        '''
+        self.template = template
+        self._parts = tuple(
+            (literal, field, spec or '')
+            for literal, field, spec, _ in Formatter().parse(template)
+        )
+        self.params = tuple(sorted(set(field for _, field, _ in self._parts if field)))
+
+    def render(self, values):
+        '''
+        Returns the template instantiated with `values`.
+
+        :param values: dict. Placeholder values, extra keys are ignored.
+
+        :rtype: string
+        '''
+        return ''.join(
+            literal + (format(values[field], spec) if field else '')
+            for literal, field, spec in self._parts
+        )
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template):
+    '''
+    Returns the CompiledTemplate of a URL template, parsing it only the first
+    time it's seen.
+
+    :rtype: CompiledTemplate
+    '''
+    return CompiledTemplate(template)
+
+
+VARIANT_CACHE_SIZE = 1024
+
+# (id(endpoint), omitted parameters): (endpoint, variant), least recently
+# used first. Keeping the endpoint in the entry means its id can't be
+# reused by another dict while the entry exists, and the identity check
+# on lookup rejects anything else.
+_variants = OrderedDict()
+_variants_lock = threading.Lock()
+
+
+def _without_parameters(template, omitted):
+    '''
+    Returns `template` without the '&name={name}' query parameters of the
+    `omitted` names.
+    '''
+    for name in omitted:
+        template = template.replace('&%s={%s}' % (name, name), '')
+    return template
+
+
+def scoped_endpoint(endpoint, **optional):
+    '''
+    Returns the variant of `endpoint` whose url template leaves out the
+    '&name={name}' query parameters of the `optional` arguments that are
+    None, e.g. scoped_endpoint(e, orgIdentifier=None, projectIdentifier='p').
+    Variants are built once per endpoint and combination of omitted
+    parameters and kept in a bounded cache; they are shared, so they must
+    not be modified.
+
+    :param endpoint: dict. Endpoint description.
+    :param optional: parameter name: value, only checked against None.
+
+    :rtype: dict
+    '''
+    omitted = tuple(sorted(name for name, value in optional.items() if value is None))
+    if not omitted:
+        return endpoint
+    key = (id(endpoint), omitted)
+    with _variants_lock:
+        cached = _variants.get(key)
+        if cached is not None and cached[0] is endpoint:
+            _variants.move_to_end(key)
+            return cached[1]
+    variant = dict(endpoint, url_template=_without_parameters(endpoint['url_template'], omitted))
+    with _variants_lock:
+        _variants[key] = (endpoint, variant)
+        _variants.move_to_end(key)
+        while len(_variants) > VARIANT_CACHE_SIZE:
+            _variants.popitem(last=False)
+    return variant
@@ -32,6 +32,14 @@ class HTTPIncorrectParametersError(HTTPResponseError):
     pass
 
 
+class HTTPTooManyRequestsError(HTTPResponseError):
+    '''
+    Exception to be thrown when a request is still rate limited after the
+    retry policy gave up.
+    '''
+    pass
+
+
 class EndpointNotImplemented(SplitException):
     '''
     Exception to be thrown when the requested endpoint is not available for
@@ -111,3 +119,27 @@ class HarnessDeprecatedEndpointError(SplitException):
     Exception to be thrown when attempting to access a deprecated endpoint in harness mode
     '''
     pass
+
+
+class OperationTimeoutError(SplitBackendUnreachableError):
+    '''
+    Exception to be thrown when a request times out or an operation runs past
+    the deadline set through `request_options`
+    '''
+    pass
+
+
+class UploadIntegrityError(SplitException):
+    '''
+    Exception to be thrown when the checksum reported by the server for an
+    uploaded file doesn't match the bytes that were sent
+    '''
+    pass
+
+
+class TokenSinkError(SplitException):
+    '''
+    Exception to be thrown when a token was rotated but its new value could
+    not be handed to the caller's sink
+    '''
+    pass
@@ -0,0 +1,208 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import json
+from splitapiclient.util.bulk import run_each
+from splitapiclient.util.logger import LOGGER
+
+
+DEFAULT_INVENTORY_WORKERS = 8
+
+ACCOUNT_SCOPE = 'account'
+
+# Harness scope levels, as found in principals and role references
+_SCOPE_LEVELS = ('account', 'organization', 'project')
+
+# kind: list(apiclient, account, org, project). list_scope() lists exactly
+# the given scope, ignoring the client's default org and project, and
+# raises HTTP errors so a scope that can't be read is reported instead of
+# showing up empty.
+INVENTORY_KINDS = {
+    'role_assignments': lambda c, acc, org, project: c.role_assignment.list_scope(acc, org, project),
+    'groups': lambda c, acc, org, project: c.harness_group.list_scope(acc, org, project),
+    'service_accounts': lambda c, acc, org, project: c.service_account.list_scope(acc, org, project),
+    'roles': lambda c, acc, org, project: c.role.list_scope(acc, org, project),
+    'resource_groups': lambda c, acc, org, project: c.resource_group.list_scope(acc, org, project),
+}
+
+
+def scope_name(org_identifier=None, project_identifier=None):
+    '''
+    Name of a scope in the inventory: 'account', '<org>' or '<org>/<project>'.
+
+    :rtype: string
+    '''
+    if org_identifier is None:
+        return ACCOUNT_SCOPE
+    if project_identifier is None:
+        return org_identifier
+    return '%s/%s' % (org_identifier, project_identifier)
+
+
+def _parent_scope(scope, level):
+    '''
+    Scope at `level` ('account', 'organization' or 'project') containing
+    `scope`, used to resolve the principals and roles assignments point to.
+    '''
+    parts = [] if scope == ACCOUNT_SCOPE else scope.split('/')
+    depth = _SCOPE_LEVELS.index(level.lower()) if level and level.lower() in _SCOPE_LEVELS else len(parts)
+    return scope_name(*parts[:depth]) if depth else ACCOUNT_SCOPE
+
+
+def _key(scope, identifier):
+    return '%s:%s' % (scope, identifier)
+
+
+class RBACInventory:
+    '''
+    Normalized graph of the users, groups, service accounts, roles, resource
+    groups and role assignments of a Harness account. Scoped objects are
+    keyed by '<scope>:<identifier>' and users by uuid, so an object listed
+    more than once is only kept once, and assignments point to those keys.
+    '''
+
+    def __init__(self, account_identifier=None):
+        '''
+        :param account_identifier: account the inventory belongs to
+        '''
+        self.account_identifier = account_identifier
+        self.scopes = []
+        self.users = {}
+        self.groups = {}
+        self.service_accounts = {}
+        self.roles = {}
+        self.resource_groups = {}
+        self.assignments = {}
+        self.errors = []
+
+    def add_users(self, users):
+        for user in users:
+            data = user.to_dict()
+            if data.get('uuid'):
+                self.users[data['uuid']] = data
+
+    def add(self, kind, scope, objects):
+        '''
+        Adds the objects of a kind listed at a scope.
+
+        :param kind: string. One of INVENTORY_KINDS.
+        :param scope: string. Scope name, see scope_name.
+        :param objects: list of resources returned by the microclient.
+        '''
+        for obj in objects:
+            data = obj.to_dict()
+            identifier = data.get('identifier')
+            if identifier is None:
+                continue
+            key = _key(scope, identifier)
+            if kind == 'role_assignments':
+                self.assignments[key] = self._assignment(scope, data)
+            elif kind == 'groups':
+                data['users'] = sorted(
+                    member.get('uuid') if isinstance(member, dict) else member
+                    for member in data.get('users') or []
+                )
+                self.groups[key] = dict(data, scope=scope)
+            else:
+                getattr(self, kind)[key] = dict(data, scope=scope)
+
+    @staticmethod
+    def _assignment(scope, data):
+        principal = data.get('principal') or {}
+        principal_type = principal.get('type')
+        if principal_type == 'USER':
+            principal_key = principal.get('identifier')
+        else:
+            principal_key = _key(
+                _parent_scope(scope, principal.get('scopeLevel')), principal.get('identifier')
+            )
+        role_scope = _parent_scope(scope, (data.get('roleReference') or {}).get('scopeLevel'))
+        return {
+            'identifier': data.get('identifier'),
+            'scope': scope,
+            'role': _key(role_scope, data.get('roleIdentifier')),
+            'resource_group': _key(scope, data.get('resourceGroupIdentifier')),
+            'principal_type': principal_type,
+            'principal': principal_key,
+            'disabled': bool(data.get('disabled')),
+            'managed': bool(data.get('managed')),
+        }
+
+    def to_dict(self):
+        return {
+            'account': self.account_identifier,
+            'scopes': self.scopes,
+            'users': self.users,
+            'groups': self.groups,
+            'service_accounts': self.service_accounts,
+            'roles': self.roles,
+            'resource_groups': self.resource_groups,
+            'assignments': self.assignments,
+            'errors': self.errors,
+        }
+
+    def write(self, path):
+        '''
+        Writes the inventory to `path` as JSON.
+        '''
+        with open(path, 'w') as output:
+            json.dump(self.to_dict(), output, indent=2, sort_keys=True, default=str)
+
+
+def crawl_rbac(apiclient, account_identifier=None, max_workers=DEFAULT_INVENTORY_WORKERS,
+               include_users=True):
+    '''
+    Builds the RBAC inventory of an account: lists its projects, then the
+    role assignments, groups, service accounts, roles and resource groups of
+    the account, of every organization holding a project and of every
+    project, running up to `max_workers` listings at once. Listings that
+    fail (e.g. 403 on a project) are recorded in the inventory's errors,
+    and a failure listing the projects is raised. Requests go
+    through the client's retry policy, so rate limits are honored across
+    all of them.
+
+    :param apiclient: HarnessApiClient.
+    :param account_identifier: string. Account to crawl, defaults to the
+        client's one.
+    :param max_workers: int. Listings in flight.
+    :param include_users: bool. Also list the account users.
+
+    :rtype: RBACInventory
+    '''
+    inventory = RBACInventory(account_identifier)
+    projects = apiclient.harness_project.list_scope(account_identifier, parallel=True)
+    project_scopes = set(
+        (data.get('orgIdentifier'), data.get('identifier'))
+        for data in (project.to_dict() for project in projects)
+        if data.get('orgIdentifier') and data.get('identifier')
+    )
+    scopes = [(None, None)]
+    scopes.extend(sorted(set((org, None) for org, _ in project_scopes)))
+    scopes.extend(sorted(project_scopes))
+    inventory.scopes = [scope_name(org, project) for org, project in scopes]
+
+    tasks = [(kind, org, project) for org, project in scopes for kind in INVENTORY_KINDS]
+    if include_users:
+        tasks.insert(0, ('users', None, None))
+
+    def fetch(task):
+        kind, org, project = task
+        if kind == 'users':
+            return apiclient.harness_user.list_scope(account_identifier)
+        return INVENTORY_KINDS[kind](apiclient, account_identifier, org, project)
+
+    result = run_each(tasks, fetch, max_workers=max_workers)
+    for item_result in result.successful:
+        kind, org, project = item_result.item
+        if kind == 'users':
+            inventory.add_users(item_result.value)
+        else:
+            inventory.add(kind, scope_name(org, project), item_result.value)
+    for item_result in result.failed:
+        kind, org, project = item_result.item
+        inventory.errors.append({
+            'kind': kind, 'scope': scope_name(org, project), 'error': str(item_result.error),
+        })
+    LOGGER.info('RBAC inventory of %d scopes built in %.1fs, %d listings failed' % (
+        len(scopes), result.metadata['elapsed'], len(result.failed)
+    ))
+    return inventory
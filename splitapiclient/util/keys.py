@@ -0,0 +1,475 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import csv
+import io
+import json
+import os
+import tempfile
+import zlib
+from collections import OrderedDict
+from itertools import chain, islice
+from splitapiclient.util.exceptions import InvalidArgumentException
+
+
+KEY_FILE_FORMATS = ('csv', 'ndjson', 'txt')
+DEFAULT_DEDUPE_WINDOW = 1000000
+READ_BUFFER_SIZE = 1024 * 1024
+DEFAULT_DIFF_MEMORY_KEYS = 1000000
+DEFAULT_DIFF_PARTITIONS = 64
+MAX_KEY_LENGTH = 250
+INVALID_KEY_SAMPLES = 10
+# Characters the upload service would read as csv delimiters or quotes
+_KEY_FILE_RESERVED = (',', '|', '"')
+
+_EXTENSION_FORMATS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.txt': 'txt',
+}
+
+
+def key_file_format(path, format=None):
+    '''
+    Returns the format of a key file, inferred from its extension when not
+    given explicitly ('txt' for unknown extensions).
+
+    :param path: string. File path.
+    :param format: string. One of KEY_FILE_FORMATS (optional).
+
+    :rtype: string
+    '''
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        return _EXTENSION_FORMATS.get(extension, 'txt')
+    if format not in KEY_FILE_FORMATS:
+        raise InvalidArgumentException(
+            'Unknown key file format %s, expected one of %s'
+            % (format, ', '.join(KEY_FILE_FORMATS))
+        )
+    return format
+
+
+def iter_keys_from_file(path, format=None, column=0, field='key'):
+    '''
+    Streams the keys stored in a file, reading it in buffered chunks so that
+    files far bigger than the available memory can be processed.
+
+        - csv: one key per row, in `column` (index or header name). The
+          dialect matches SegmentDefinition.export_keys_to_csv.
+        - ndjson: one JSON value per line, either a string or an object
+          holding the key under `field`.
+        - txt: one key per line.
+
+    Blank lines and empty keys are skipped.
+
+    :param path: string. File path.
+    :param format: string. One of KEY_FILE_FORMATS, inferred from the
+        extension when omitted.
+    :param column: int/string. CSV column holding the keys. A string is
+        looked up in the header row.
+    :param field: string. NDJSON object field holding the key.
+
+    :rtype: generator(string)
+    '''
+    format = key_file_format(path, format)
+    with io.open(path, mode='r', encoding='utf-8', newline='',
+                 buffering=READ_BUFFER_SIZE) as keys_file:
+        if format == 'csv':
+            reader = csv.reader(keys_file, delimiter=',', quotechar='|')
+            if not isinstance(column, int):
+                header = next(reader, [])
+                if column not in header:
+                    raise InvalidArgumentException(
+                        'Column %s not found in %s' % (column, path)
+                    )
+                column = header.index(column)
+            for row in reader:
+                if len(row) > column and row[column].strip():
+                    yield row[column].strip()
+        elif format == 'ndjson':
+            for line in keys_file:
+                line = line.strip()
+                if not line:
+                    continue
+                value = json.loads(line)
+                key = value.get(field) if isinstance(value, dict) else value
+                if key is not None and key != '':
+                    yield str(key)
+        else:
+            for line in keys_file:
+                key = line.strip()
+                if key:
+                    yield key
+
+
+def dedupe_keys(keys, window=DEFAULT_DEDUPE_WINDOW):
+    '''
+    Drops repeated keys while keeping memory bounded: only the last
+    `window` distinct keys are remembered, so duplicates further apart than
+    that are let through. That is harmless for segment uploads, which are
+    idempotent, and keeps memory constant whatever the input size.
+
+    :param keys: iterable of keys.
+    :param window: int. Number of distinct keys remembered. None remembers
+        every key (exact, unbounded).
+
+    :rtype: generator
+    '''
+    if window is None:
+        seen = set()
+        for key in keys:
+            if key not in seen:
+                seen.add(key)
+                yield key
+        return
+
+    recent = OrderedDict()
+    for key in keys:
+        if key in recent:
+            recent.move_to_end(key)
+            continue
+        recent[key] = None
+        if len(recent) > window:
+            recent.popitem(last=False)
+        yield key
+
+
+class ExportCheckpoint:
+    '''
+    Small JSON file recording how far a key export went, written atomically
+    so that a crash never leaves a truncated checkpoint behind.
+    '''
+
+    def __init__(self, path):
+        '''
+        Class constructor.
+
+        :param path: string. Checkpoint file path.
+        '''
+        self.path = path
+
+    def load(self):
+        '''
+        Returns the recorded state, or None when there is no (valid)
+        checkpoint.
+
+        :rtype: dict/None
+        '''
+        try:
+            with io.open(self.path, mode='r', encoding='utf-8') as checkpoint_file:
+                return json.load(checkpoint_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def save(self, state):
+        '''
+        Replaces the recorded state.
+
+        :param state: dict. JSON serializable state.
+        '''
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with io.open(fd, mode='w', encoding='utf-8') as checkpoint_file:
+            json.dump(state, checkpoint_file)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        '''
+        Deletes the checkpoint file, if any.
+        '''
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class KeySpool:
+    '''
+    Append-only sequence of keys kept in memory up to `limit` keys and
+    spilled to an anonymous temporary file beyond that.
+    '''
+
+    def __init__(self, limit=DEFAULT_DIFF_MEMORY_KEYS):
+        '''
+        Class constructor.
+
+        :param limit: int. Keys kept in memory before spilling to disk.
+        '''
+        self._limit = limit
+        self._keys = []
+        self._file = None
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, key):
+        '''
+        Adds a key at the end of the spool.
+        '''
+        self._count += 1
+        if self._file is None and len(self._keys) < self._limit:
+            self._keys.append(key)
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+        # One JSON string per line, so keys may hold any character
+        self._file.write(json.dumps(key))
+        self._file.write('\n')
+
+    def __iter__(self):
+        for key in self._keys:
+            yield key
+        if self._file is not None:
+            self._file.flush()
+            self._file.seek(0)
+            for line in self._file:
+                yield json.loads(line)
+            self._file.seek(0, os.SEEK_END)
+
+    def close(self):
+        '''
+        Releases the keys and the temporary file, if any.
+        '''
+        self._keys = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class KeyDiff:
+    '''
+    Keys to add to and remove from a key set to turn it into another one,
+    as computed by `diff_keys`. Use it as a context manager (or call
+    close()) to release any spilled temporary files.
+    '''
+
+    def __init__(self, to_add, to_remove, unchanged=0):
+        '''
+        Class constructor.
+
+        :param to_add: KeySpool. Desired keys missing from the current set.
+        :param to_remove: KeySpool. Current keys that aren't desired.
+        :param unchanged: int. Keys present in both sets.
+        '''
+        self.to_add = to_add
+        self.to_remove = to_remove
+        self.unchanged = unchanged
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.to_add.close()
+        self.to_remove.close()
+
+
+def _diff_in_memory(current, desired, to_add, to_remove):
+    '''
+    Hash-set difference holding only the desired keys in memory: current
+    keys are streamed and matched against them, and the desired keys left
+    unmatched at the end have to be added.
+    '''
+    matched = dict.fromkeys(desired, False)
+    unchanged = 0
+    for key in current:
+        seen = matched.get(key)
+        if seen is None:
+            to_remove.append(key)
+        elif not seen:
+            matched[key] = True
+            unchanged += 1
+    for key, seen in matched.items():
+        if not seen:
+            to_add.append(key)
+    return unchanged
+
+
+def _partition(keys, partitions, limit):
+    '''
+    Splits keys into `partitions` spools by hash, so that equal keys always
+    land in the same partition.
+    '''
+    spools = [KeySpool(limit) for _ in range(partitions)]
+    for key in keys:
+        spools[zlib.crc32(key.encode('utf-8')) % partitions].append(key)
+    return spools
+
+
+def diff_keys(current, desired, max_keys_in_memory=DEFAULT_DIFF_MEMORY_KEYS,
+              partitions=DEFAULT_DIFF_PARTITIONS):
+    '''
+    Computes which keys must be added to and removed from `current` to make
+    it equal to `desired`. Both inputs are streamed once.
+
+    When the desired keys fit in `max_keys_in_memory`, a hash-set of them is
+    matched against the streamed current keys. Larger inputs are hash
+    partitioned to temporary files first and each partition is diffed on
+    its own, so memory stays bounded by the partition size. The resulting
+    key lists spill to disk as well.
+
+    :param current: iterable of keys currently in the set.
+    :param desired: iterable of keys the set should hold.
+    :param max_keys_in_memory: int. Keys held in memory before spilling.
+    :param partitions: int. Number of partitions used when spilling.
+
+    :rtype: KeyDiff
+    '''
+    to_add = KeySpool(max_keys_in_memory)
+    to_remove = KeySpool(max_keys_in_memory)
+    desired = iter(desired)
+    head = list(islice(desired, max_keys_in_memory + 1))
+    if len(head) <= max_keys_in_memory:
+        unchanged = _diff_in_memory(current, head, to_add, to_remove)
+        return KeyDiff(to_add, to_remove, unchanged)
+
+    per_partition = max(1, max_keys_in_memory // partitions)
+    desired_parts = _partition(chain(head, desired), partitions, per_partition)
+    del head
+    current_parts = _partition(current, partitions, per_partition)
+    unchanged = 0
+    try:
+        for desired_part, current_part in zip(desired_parts, current_parts):
+            unchanged += _diff_in_memory(
+                current_part, desired_part, to_add, to_remove
+            )
+            desired_part.close()
+            current_part.close()
+    finally:
+        for spool in desired_parts + current_parts:
+            spool.close()
+    return KeyDiff(to_add, to_remove, unchanged)
+
+
+def unique_keys(keys, max_keys_in_memory=DEFAULT_DIFF_MEMORY_KEYS,
+                partitions=DEFAULT_DIFF_PARTITIONS):
+    '''
+    Exact de-duplication with bounded memory. Keys are collected in a set
+    while they fit in `max_keys_in_memory`; beyond that they are hash
+    partitioned to temporary files and each partition is de-duplicated on
+    its own. Output order is not preserved.
+
+    :param keys: iterable of keys.
+    :param max_keys_in_memory: int. Distinct keys held in memory.
+    :param partitions: int. Number of partitions used when spilling.
+
+    :rtype: generator
+    '''
+    keys = iter(keys)
+    seen = set()
+    for key in keys:
+        seen.add(key)
+        if len(seen) > max_keys_in_memory:
+            break
+    else:
+        for key in seen:
+            yield key
+        return
+
+    per_partition = max(1, max_keys_in_memory // partitions)
+    parts = _partition(chain(seen, keys), partitions, per_partition)
+    seen = None
+    try:
+        for part in parts:
+            for key in set(part):
+                yield key
+            part.close()
+    finally:
+        for part in parts:
+            part.close()
+
+
+class KeyFileReport:
+    '''
+    Outcome of preparing a key file for upload with `prepare_key_file`.
+    '''
+
+    def __init__(self, path):
+        '''
+        Class constructor.
+
+        :param path: string. Path of the prepared file.
+        '''
+        self.path = path
+        self.total = 0
+        self.invalid = 0
+        self.unique = 0
+        self.invalid_samples = []
+
+    @property
+    def duplicates(self):
+        '''
+        Valid keys dropped because they were repeated.
+
+        :rtype: int
+        '''
+        return self.total - self.invalid - self.unique
+
+    @property
+    def duplicate_rate(self):
+        '''
+        Share of the valid keys that were duplicates.
+
+        :rtype: float
+        '''
+        valid = self.total - self.invalid
+        return self.duplicates / valid if valid else 0.0
+
+    def __repr__(self):
+        return 'KeyFileReport(path=%s, total=%d, unique=%d, duplicates=%d, invalid=%d)' % (
+            self.path, self.total, self.unique, self.duplicates, self.invalid
+        )
+
+
+def _invalid_key_reason(key, max_key_length):
+    if len(key) > max_key_length:
+        return 'longer than %d characters' % max_key_length
+    if any(ord(c) < 32 for c in key):
+        return 'contains control characters'
+    if any(c in key for c in _KEY_FILE_RESERVED):
+        return 'contains csv delimiter or quote characters'
+    return None
+
+
+def prepare_key_file(source, destination, format=None, column=0, field='key',
+                     max_key_length=MAX_KEY_LENGTH,
+                     max_keys_in_memory=DEFAULT_DIFF_MEMORY_KEYS):
+    '''
+    Turns a csv, ndjson or txt key file into an upload ready file: keys are
+    stripped, validated and de-duplicated exactly (spilling to temporary
+    files for large inputs), then written raw, one per line. Keys holding
+    ',', '|' or '"' would be split or unquoted by the upload service, so
+    they are reported as invalid. The source file is read once.
+
+    :param source: string. Path of the key file to prepare.
+    :param destination: string. Path of the file to write.
+    :param format: string. Source format, inferred from its extension when
+        omitted.
+    :param column: int/string. CSV column holding the keys.
+    :param field: string. NDJSON object field holding the key.
+    :param max_key_length: int. Longer keys are reported as invalid and
+        left out.
+    :param max_keys_in_memory: int. Distinct keys held in memory.
+
+    :rtype: KeyFileReport
+    '''
+    report = KeyFileReport(destination)
+
+    def valid_keys():
+        for key in iter_keys_from_file(source, format, column=column, field=field):
+            report.total += 1
+            reason = _invalid_key_reason(key, max_key_length)
+            if reason is None:
+                yield key
+                continue
+            report.invalid += 1
+            if len(report.invalid_samples) < INVALID_KEY_SAMPLES:
+                report.invalid_samples.append((key, reason))
+
+    with io.open(destination, mode='w', encoding='utf-8', newline='') as output:
+        for key in unique_keys(valid_keys(), max_keys_in_memory):
+            output.write(key + '\n')
+            report.unique += 1
+    return report
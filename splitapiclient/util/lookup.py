@@ -0,0 +1,42 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+
+def build_name_index(items):
+    '''
+    Builds a name -> resource index, keeping the first resource listed for
+    each name.
+
+    :param items: iterable of resources with a `name` attribute.
+
+    :rtype: dict
+    '''
+    index = {}
+    for item in items:
+        index.setdefault(item.name, item)
+    return index
+
+
+def find_by_name(name, iter_items, cache=None, key=None):
+    '''
+    Resolves a name for collections the API can't fetch with a single GET.
+
+    Without a cache the listing is streamed and the scan stops at the first
+    match, so only the pages up to it are requested. With a cache, a name
+    index is built from one full listing and reused by every following
+    lookup under the same key until it expires or is invalidated.
+
+    :param name: string. Name to look for.
+    :param iter_items: callable. Returns an iterable of resources.
+    :param cache: TTLCache. Cache holding the indexes (optional).
+    :param key: hashable. Cache key of this collection's index.
+
+    :rtype: resource/None
+    '''
+    if cache is None:
+        for item in iter_items():
+            if item.name == name:
+                return item
+        return None
+    index = cache.get_or_load(key, lambda: build_name_index(iter_items()))
+    return index.get(name)
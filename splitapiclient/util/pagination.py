@@ -0,0 +1,195 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+from collections import deque
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_PAGE_WORKERS = 8
+
+
+def page_workers(parallel):
+    '''
+    Translates the `parallel` argument accepted by list methods into a
+    number of page fetching workers.
+
+    :param parallel: bool/int. False for sequential fetching, True for the
+        default number of workers or an explicit number of workers.
+
+    :rtype: int
+    '''
+    if parallel is True:
+        return DEFAULT_PAGE_WORKERS
+    if not parallel:
+        return 1
+    return max(1, int(parallel))
+
+
+def offset_pages(fetch_page, items_key='objects', total_key='totalCount',
+                 parallel=False, start=0):
+    '''
+    Generator yielding, in order, the list of items of every page of an
+    offset paginated endpoint.
+
+    The first page (at offset `start`) is always fetched alone. When `parallel` is set, the
+    remaining offsets are computed from its total count and fetched
+    concurrently on a bounded worker pool; at most twice the number of
+    workers pages are kept in flight, so memory stays bounded even for very
+    large collections. Workers run in a copy of the caller's context, so
+    `request_options` timeouts and deadlines apply to every page.
+
+    :param fetch_page: callable. Receives an offset and returns the decoded
+        response of that page.
+    :param items_key: string. Response key holding the page items.
+    :param total_key: string. Response key holding the total item count.
+    :param parallel: bool/int. See `page_workers`.
+    :param start: int. Offset of the first page, used to resume a listing.
+
+    :rtype: generator(list)
+    '''
+    response = fetch_page(start)
+    yield response[items_key]
+    offset = int(response['offset'])
+    total = int(response[total_key])
+    limit = int(response['limit'])
+    if limit <= 0:
+        return
+
+    workers = page_workers(parallel)
+    if workers == 1:
+        while total > (offset + limit):
+            response = fetch_page(offset + limit)
+            yield response[items_key]
+            offset = int(response['offset'])
+            total = int(response[total_key])
+            limit = int(response['limit'])
+            if limit <= 0:
+                return
+        return
+
+    for response in _ordered_pages(fetch_page, range(offset + limit, total, limit), workers):
+        yield response[items_key]
+
+
+def _ordered_pages(fetch_page, pages, workers):
+    '''
+    Fetches `pages` (offsets or page indexes) on a pool of `workers`
+    threads and yields the responses in order. At most twice the number of
+    workers pages are kept in flight, and each fetch runs in a copy of the
+    caller's context.
+    '''
+    pending = iter(pages)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    in_flight = deque()
+    try:
+        for page in pending:
+            in_flight.append(executor.submit(copy_context().run, fetch_page, page))
+            if len(in_flight) >= workers * 2:
+                break
+        while in_flight:
+            response = in_flight.popleft().result()
+            for page in pending:
+                in_flight.append(executor.submit(copy_context().run, fetch_page, page))
+                break
+            yield response
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _total_pages(page):
+    '''
+    Number of pages announced by a page index paginated response, or None
+    when it doesn't carry the metadata.
+    '''
+    total_pages = page.get('totalPages')
+    if total_pages is not None:
+        return int(total_pages)
+    total_items = page.get('totalItems')
+    page_size = page.get('pageSize')
+    if total_items is not None and page_size:
+        return -(-int(total_items) // int(page_size))
+    return None
+
+
+def index_pages(fetch_page, items_key='content', parallel=False, start=0):
+    '''
+    Generator yielding, in order, the list of items of every page of a page
+    index paginated endpoint, as used by the Harness APIs, whose pages hold
+    their items along with totalPages (or totalItems and pageSize).
+
+    The first page is fetched alone and its page count tells which pages
+    remain, so no trailing empty page is requested. When `parallel` is set
+    they are fetched concurrently, as offset_pages does. Responses without
+    the page count are paged sequentially until an empty page, or a page
+    repeating the previous one, comes back.
+
+    :param fetch_page: callable. Receives a page index and returns the page
+        object of that response (the 'data' of Harness responses).
+    :param items_key: string. Page key holding the items.
+    :param parallel: bool/int. See `page_workers`.
+    :param start: int. Index of the first page.
+
+    :rtype: generator(list)
+    '''
+    page = fetch_page(start) or {}
+    items = page.get(items_key) or []
+    total_pages = _total_pages(page)
+    if total_pages is None:
+        while items:
+            yield items
+            start += 1
+            previous, page = page, fetch_page(start) or {}
+            if page == previous:
+                return
+            items = page.get(items_key) or []
+        return
+
+    yield items
+    for page in _ordered_pages(fetch_page, range(start + 1, total_pages), page_workers(parallel)):
+        yield (page or {}).get(items_key) or []
+
+
+def marker_pages(fetch_page, items_key='data', marker_key='nextMarker'):
+    '''
+    Generator yielding, in order, the list of items of every page of a
+    marker (cursor) paginated endpoint. Pages depend on the previous
+    response, so they are always fetched sequentially.
+
+    :param fetch_page: callable. Receives the marker of the page to fetch
+        (None for the first one) and returns the decoded response.
+    :param items_key: string. Response key holding the page items.
+    :param marker_key: string. Response key holding the next page marker.
+
+    :rtype: generator(list)
+    '''
+    marker = None
+    while True:
+        response = fetch_page(marker)
+        yield response[items_key]
+        marker = response[marker_key]
+        if marker is None:
+            return
+
+
+def limit_pages(fetch_page, limit, offset=0):
+    '''
+    Generator yielding, in order, the list of items of every page of an
+    endpoint that returns a plain list and gives no total count. Paging
+    stops on the first page whose size differs from `limit`.
+
+    :param fetch_page: callable. Receives an offset and returns the decoded
+        response of that page.
+    :param limit: int. Page size requested to the endpoint.
+    :param offset: int. Offset of the first page.
+
+    :rtype: generator(list)
+    '''
+    while True:
+        response = fetch_page(offset)
+        page = response if isinstance(response, list) else []
+        yield page
+        if len(page) != limit:
+            return
+        offset += limit
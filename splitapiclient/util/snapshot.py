@@ -0,0 +1,297 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import json
+import sqlite3
+import time
+from splitapiclient.resources import Environment, Split, SplitDefinition, \
+    Segment, SegmentDefinition, RuleBasedSegment, FlagSet
+from splitapiclient.util.bulk import run_each, DEFAULT_BULK_WORKERS
+from splitapiclient.util.exceptions import InvalidArgumentException
+from splitapiclient.util.logger import LOGGER
+from splitapiclient.util.sync import content_digest
+
+
+WORKSPACE_SCOPE = ''
+
+# kind: (per environment, fetch(apiclient, workspace_id, environment_id),
+#        build(data, workspace_id, environment_id))
+SNAPSHOT_KINDS = {
+    'environments': (
+        False,
+        lambda c, ws, env: c.environments.iter_raw(ws),
+        lambda data, ws, env: Environment(data, ws),
+    ),
+    'splits': (
+        False,
+        lambda c, ws, env: c.splits.iter_raw(ws, parallel=True),
+        lambda data, ws, env: Split(data, ws),
+    ),
+    'segments': (
+        False,
+        lambda c, ws, env: c.segments.iter_raw(ws, parallel=True),
+        lambda data, ws, env: Segment(data),
+    ),
+    'rule_based_segments': (
+        False,
+        lambda c, ws, env: c.rule_based_segments.iter_raw(ws),
+        lambda data, ws, env: RuleBasedSegment(data),
+    ),
+    'flag_sets': (
+        False,
+        lambda c, ws, env: c.flag_sets.iter_raw(ws),
+        lambda data, ws, env: FlagSet(data, ws),
+    ),
+    'split_definitions': (
+        True,
+        lambda c, ws, env: c.split_definitions.iter_raw(env, ws, parallel=True),
+        lambda data, ws, env: SplitDefinition(data, env, ws),
+    ),
+    'segment_definitions': (
+        True,
+        lambda c, ws, env: c.segment_definitions.iter_raw(env, ws, parallel=True),
+        lambda data, ws, env: SegmentDefinition(
+            dict(data, environment={'id': env, 'name': ''})
+        ),
+    ),
+}
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS objects ('
+    ' kind TEXT NOT NULL, scope TEXT NOT NULL, name TEXT NOT NULL,'
+    ' updated INTEGER, digest TEXT NOT NULL, data TEXT NOT NULL,'
+    ' PRIMARY KEY (kind, scope, name))',
+    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)',
+)
+
+
+class WorkspaceSnapshot:
+    '''
+    Local SQLite mirror of a workspace: environments, splits, segments,
+    rule-based segments, flag sets, and the split and segment definitions
+    of every environment. Listings are pulled concurrently and stored as
+    returned by the API, so list() and find() can be answered offline with
+    the same resource objects the microclients return.
+    '''
+
+    def __init__(self, apiclient, workspace_id, path=':memory:',
+                 max_workers=DEFAULT_BULK_WORKERS):
+        '''
+        Class constructor. Opens (or creates) the store without fetching
+        anything; call refresh() to pull the workspace.
+
+        :param apiclient: api client used to fetch the listings.
+        :param workspace_id: string. Workspace id.
+        :param path: string. SQLite database file, in memory by default.
+        :param max_workers: int. Listings fetched concurrently.
+        '''
+        self._apiclient = apiclient
+        self._workspace_id = workspace_id
+        self._max_workers = max_workers
+        self._db = sqlite3.connect(path)
+        with self._db:
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    @property
+    def workspace_id(self):
+        return self._workspace_id
+
+    @property
+    def refreshed_at(self):
+        '''
+        Epoch seconds of the last completed refresh, or None.
+
+        :rtype: float/None
+        '''
+        row = self._db.execute(
+            'SELECT value FROM meta WHERE key = ?', ('refreshed_at',)
+        ).fetchone()
+        return float(row[0]) if row else None
+
+    def _fetch(self, task):
+        kind, environment_id = task
+        fetch = SNAPSHOT_KINDS[kind][1]
+        return [item for item in fetch(self._apiclient, self._workspace_id, environment_id)]
+
+    def _store(self, kind, scope, items):
+        '''
+        Replaces the stored items of a (kind, scope) with `items`, writing
+        only the rows that changed. Items with a lastUpdateTime are compared
+        by it, any other by a digest of their content.
+
+        :returns: added, changed and removed counts
+        :rtype: dict
+        '''
+        stored = {
+            name: (updated, digest) for name, updated, digest in self._db.execute(
+                'SELECT name, updated, digest FROM objects WHERE kind = ? AND scope = ?',
+                (kind, scope)
+            )
+        }
+        counts = {'added': 0, 'changed': 0, 'removed': 0}
+        seen = set()
+        for item in items:
+            name = item.get('name')
+            if name is None or name in seen:
+                continue
+            seen.add(name)
+            updated = item.get('lastUpdateTime')
+            previous = stored.get(name)
+            if previous is not None and updated is not None and previous[0] == updated:
+                continue
+            digest = content_digest(item)
+            if previous is not None and previous[1] == digest:
+                continue
+            counts['changed' if previous is not None else 'added'] += 1
+            self._db.execute(
+                'INSERT OR REPLACE INTO objects (kind, scope, name, updated, digest, data) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (kind, scope, name, updated, digest, json.dumps(item))
+            )
+        for name in set(stored) - seen:
+            counts['removed'] += 1
+            self._db.execute(
+                'DELETE FROM objects WHERE kind = ? AND scope = ? AND name = ?',
+                (kind, scope, name)
+            )
+        return counts
+
+    def _purge_environments(self):
+        '''
+        Deletes the per environment rows of environments that aren't stored
+        anymore, i.e. were deleted upstream.
+
+        :returns: removed rows per kind
+        :rtype: dict
+        '''
+        current = set(environment.id for environment in self.list('environments'))
+        removed = {}
+        for kind, (per_environment, _, _) in SNAPSHOT_KINDS.items():
+            if not per_environment:
+                continue
+            stale = [
+                scope for scope, in self._db.execute(
+                    'SELECT DISTINCT scope FROM objects WHERE kind = ?', (kind,)
+                ) if scope not in current
+            ]
+            for scope in stale:
+                removed[kind] = removed.get(kind, 0) + self._db.execute(
+                    'DELETE FROM objects WHERE kind = ? AND scope = ?', (kind, scope)
+                ).rowcount
+        return removed
+
+    def refresh(self, kinds=None):
+        '''
+        Pulls the workspace's listings concurrently and updates the store,
+        rewriting only the items whose lastUpdateTime (or content) changed
+        and dropping the ones that no longer exist, including every object
+        of deleted environments. Listings that fail keep their previously
+        stored items.
+
+        :param kinds: list of kinds to refresh (default: all of
+            SNAPSHOT_KINDS). Environments are always refreshed when a per
+            environment kind is requested.
+
+        :returns: {kind: {'added', 'changed', 'removed'}} counts, plus an
+            'errors' list of ((kind, environment id), exception) tuples
+        :rtype: dict
+        '''
+        kinds = list(kinds or SNAPSHOT_KINDS)
+        unknown = [kind for kind in kinds if kind not in SNAPSHOT_KINDS]
+        if unknown:
+            raise InvalidArgumentException('Unknown snapshot kinds: %s' % ', '.join(unknown))
+        per_environment = [kind for kind in kinds if SNAPSHOT_KINDS[kind][0]]
+        if per_environment and 'environments' not in kinds:
+            kinds.append('environments')
+
+        summary = {kind: {'added': 0, 'changed': 0, 'removed': 0} for kind in kinds}
+        summary['errors'] = []
+
+        def merge(result, purge_environments=False):
+            for item_result in result.failed:
+                summary['errors'].append((item_result.item, item_result.error))
+            with self._db:
+                for item_result in result.successful:
+                    kind, environment_id = item_result.item
+                    counts = self._store(kind, environment_id or WORKSPACE_SCOPE, item_result.value)
+                    for key, value in counts.items():
+                        summary[kind][key] += value
+                if purge_environments:
+                    for kind, removed in self._purge_environments().items():
+                        if kind in summary:
+                            summary[kind]['removed'] += removed
+
+        # Environments go first, the per environment listings depend on them.
+        # Objects of deleted environments are only purged when the listing
+        # succeeded, in the same transaction as the environments update.
+        environments = run_each([('environments', None)], self._fetch, max_workers=1)
+        merge(environments, purge_environments=environments.success)
+        tasks = [(kind, None) for kind in kinds
+                 if kind != 'environments' and not SNAPSHOT_KINDS[kind][0]]
+        for environment in self.list('environments'):
+            tasks.extend((kind, environment.id) for kind in per_environment)
+        merge(run_each(tasks, self._fetch, max_workers=self._max_workers))
+
+        with self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                ('refreshed_at', str(time.time()))
+            )
+        LOGGER.info('Workspace %s snapshot refreshed: %s' % (self._workspace_id, summary))
+        return summary
+
+    def _build(self, kind, scope, data):
+        environment_id = scope if scope != WORKSPACE_SCOPE else None
+        return SNAPSHOT_KINDS[kind][2](json.loads(data), self._workspace_id, environment_id)
+
+    def list(self, kind, environment_id=None):
+        '''
+        Returns the stored objects of a kind, as the matching microclient's
+        list() would.
+
+        :param kind: string. One of SNAPSHOT_KINDS.
+        :param environment_id: string. Required for per environment kinds.
+
+        :rtype: list
+        '''
+        scope = self._scope(kind, environment_id)
+        return [
+            self._build(kind, scope, data) for data, in self._db.execute(
+                'SELECT data FROM objects WHERE kind = ? AND scope = ? ORDER BY name',
+                (kind, scope)
+            )
+        ]
+
+    def find(self, kind, name, environment_id=None):
+        '''
+        Returns the stored object of a kind with the given name, or None.
+
+        :param kind: string. One of SNAPSHOT_KINDS.
+        :param name: string. Object name.
+        :param environment_id: string. Required for per environment kinds.
+        '''
+        scope = self._scope(kind, environment_id)
+        row = self._db.execute(
+            'SELECT data FROM objects WHERE kind = ? AND scope = ? AND name = ?',
+            (kind, scope, name)
+        ).fetchone()
+        return self._build(kind, scope, row[0]) if row else None
+
+    def _scope(self, kind, environment_id):
+        if kind not in SNAPSHOT_KINDS:
+            raise InvalidArgumentException('Unknown snapshot kind %s' % kind)
+        if not SNAPSHOT_KINDS[kind][0]:
+            return WORKSPACE_SCOPE
+        if environment_id is None:
+            raise InvalidArgumentException('%s are stored per environment, '
+                                           'an environment_id is required' % kind)
+        return environment_id
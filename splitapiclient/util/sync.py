@@ -0,0 +1,113 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import hashlib
+import json
+from splitapiclient.util.keys import ExportCheckpoint
+
+
+# Fields that change without the definition itself being edited
+VOLATILE_FIELDS = ('lastTrafficReceivedAt',)
+
+
+def content_digest(data, exclude=VOLATILE_FIELDS):
+    '''
+    Returns a stable digest of an API item, ignoring `exclude` fields.
+
+    :param data: dict. JSON serializable item.
+    :param exclude: iterable of top level keys left out of the digest.
+
+    :rtype: string
+    '''
+    if exclude:
+        data = {k: v for k, v in data.items() if k not in exclude}
+    return hashlib.sha1(
+        json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+
+
+class DefinitionChanges:
+    '''
+    Split definitions of an environment that were added, changed or removed
+    since the previous sync.
+    '''
+
+    def __init__(self, environment_id):
+        '''
+        :param environment_id: environment the changes belong to
+        '''
+        self.environment_id = environment_id
+        self.added = []
+        self.changed = []
+        self.removed = []
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return 'DefinitionChanges(environment=%s, added=%d, changed=%d, removed=%d)' % (
+            self.environment_id, len(self.added), len(self.changed), len(self.removed)
+        )
+
+
+class DefinitionSyncState:
+    '''
+    What a split definition sync knows about each environment: the
+    lastUpdateTime and content digest of every definition. It is JSON
+    serializable so it can be kept between runs with save() and load().
+    '''
+
+    def __init__(self, environments=None):
+        '''
+        :param environments: dict. {environment id:
+            {'definitions': {name: [lastUpdateTime, digest]}}}
+        '''
+        self.environments = environments or {}
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Reads a state saved with save(), or returns an empty state when the
+        file doesn't exist.
+
+        :rtype: DefinitionSyncState
+        '''
+        return cls(ExportCheckpoint(path).load())
+
+    def save(self, path):
+        '''
+        Writes the state to `path` atomically.
+        '''
+        ExportCheckpoint(path).save(self.environments)
+
+    def apply(self, environment_id, items):
+        '''
+        Compares the current definitions of an environment with the state,
+        records them and returns the differences. Definitions whose
+        lastUpdateTime didn't move aren't hashed again.
+
+        :param environment_id: string. Environment id.
+        :param items: iterable of (raw item, resource) tuples.
+
+        :rtype: DefinitionChanges
+        '''
+        previous = self.environments.get(environment_id, {}).get('definitions', {})
+        current = {}
+        changes = DefinitionChanges(environment_id)
+        for item, resource in items:
+            name = item.get('name')
+            updated = item.get('lastUpdateTime')
+            known = previous.get(name)
+            if known is not None and updated is not None and known[0] == updated:
+                current[name] = known
+                continue
+            digest = content_digest(item)
+            current[name] = [updated, digest]
+            if known is None:
+                changes.added.append(resource)
+            elif known[1] != digest:
+                changes.changed.append(resource)
+        changes.removed = sorted(set(previous) - set(current))
+        self.environments[environment_id] = {'definitions': current}
+        return changes
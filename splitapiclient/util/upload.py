@@ -0,0 +1,143 @@
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+import hashlib
+import os
+import requests
+from splitapiclient.http_clients.retry_policy import RetryPolicy
+from splitapiclient.http_clients.session import DEFAULT_CONNECT_TIMEOUT
+from splitapiclient.util.deadline import resolve_request_options
+from splitapiclient.util.exceptions import UploadIntegrityError
+from splitapiclient.util.logger import LOGGER
+
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_MAX_ATTEMPTS = 5
+# The server answers once the whole body is stored, which can take a while
+# for multi-GB files
+UPLOAD_TIMEOUT = (DEFAULT_CONNECT_TIMEOUT, 300)
+
+
+class ProgressReader:
+    '''
+    File wrapper used as a streamed request body. It reads the file in
+    `chunk_size` blocks, hashing every block as it is sent and reporting
+    the bytes sent so far to an optional progress callback.
+    '''
+
+    def __init__(self, file, total, progress=None, chunk_size=UPLOAD_CHUNK_SIZE):
+        '''
+        Class constructor.
+
+        :param file: binary file object, positioned at its start.
+        :param total: int. File size in bytes.
+        :param progress: callable. Receives (bytes sent, total bytes).
+        :param chunk_size: int. Bytes read per block.
+        '''
+        self._file = file
+        self._total = total
+        self._progress = progress
+        self._chunk_size = chunk_size
+        self._md5 = hashlib.md5()
+        self.sent = 0
+
+    def __len__(self):
+        # Lets requests send a Content-Length instead of a chunked body
+        return self._total
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self._chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        chunk = self._file.read(size)
+        if chunk:
+            self._md5.update(chunk)
+            self.sent += len(chunk)
+            if self._progress is not None:
+                self._progress(self.sent, self._total)
+        return chunk
+
+    @property
+    def md5(self):
+        '''
+        Hex MD5 digest of the bytes read so far.
+
+        :rtype: string
+        '''
+        return self._md5.hexdigest()
+
+
+def _etag_md5(response):
+    '''
+    Returns the MD5 digest carried by a single part upload ETag, or None if
+    the response doesn't have one (multipart ETags aren't plain digests).
+    '''
+    headers = getattr(response, 'headers', None)
+    etag = headers.get('ETag') if headers is not None else None
+    if not isinstance(etag, str):
+        return None
+    etag = etag.strip('"').lower()
+    if len(etag) != 32 or any(c not in '0123456789abcdef' for c in etag):
+        return None
+    return etag
+
+
+def upload_file(url, file_path, headers=None, progress=None, retry_policy=None,
+                verify_checksum=False, session=None):
+    '''
+    Streams a file to a presigned URL with a single PUT.
+
+    The body is read in blocks and hashed on the fly, so multi-GB files are
+    never held in memory or read twice. Connection failures, timeouts and
+    5xx/429 responses restart the upload from the beginning of the file
+    with backoff (presigned URLs accept whole objects only, so an upload
+    can't be continued half way). With `verify_checksum`, an ETag that looks
+    like an MD5 is checked against the digest of the bytes sent; only enable
+    it for buckets without SSE-KMS, whose ETags aren't MD5 digests.
+
+    :param url: string. Presigned upload URL.
+    :param file_path: string. Path of the file to upload.
+    :param headers: dict. Extra request headers.
+    :param progress: callable. Receives (bytes sent, total bytes) after each
+        block; it starts over from 0 when an attempt is retried.
+    :param retry_policy: RetryPolicy. Defaults to UPLOAD_MAX_ATTEMPTS
+        attempts with exponential backoff.
+    :param verify_checksum: bool. Compare the ETag with the sent bytes' MD5.
+    :param session: requests.Session. Pooled session to upload with, e.g.
+        the http client's one. Defaults to a one off connection.
+
+    :returns: response to the last attempt
+    :rtype: requests.Response
+    '''
+    if retry_policy is None:
+        retry_policy = RetryPolicy(max_attempts=UPLOAD_MAX_ATTEMPTS,
+                                   retry_statuses=(429,))
+    timeout, deadline = resolve_request_options(UPLOAD_TIMEOUT)
+    sent = {}
+
+    def send():
+        if deadline is not None:
+            deadline.check()
+        with open(file_path, 'rb') as file:
+            file.seek(0, os.SEEK_END)
+            total = file.tell()
+            file.seek(0)
+            sent['reader'] = ProgressReader(file, total, progress)
+            return (session if session is not None else requests).put(
+                url, headers=headers, data=sent['reader'],
+                timeout=deadline.cap(timeout) if deadline is not None else timeout
+            )
+
+    response = retry_policy.execute(send, 'PUT', deadline)
+    reader = sent['reader']
+    LOGGER.info('Uploaded %s (%d bytes, md5 %s)' % (file_path, reader.sent, reader.md5))
+    etag = _etag_md5(response)
+    if verify_checksum and etag is not None and etag != reader.md5:
+        raise UploadIntegrityError(
+            'Checksum mismatch uploading %s: sent md5 %s, server stored %s'
+            % (file_path, reader.md5, etag)
+        )
+    return response